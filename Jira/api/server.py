@@ -3,90 +3,398 @@
 """
 FastAPI Server for Jira Agent
 """
+import asyncio
+import logging
+import logging.handlers
+import os
+import queue
+import time
+import msgspec
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Any, List
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import Optional, Any, List, Dict, Callable
 import sys
 from pathlib import Path
 
 # core 패키지를 import 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.agent_v2 import jira_agent
+from core.agent_v2 import get_jira_agent
+from core.agent_utils import LatencyBudget, get_project_metadata
+from core.executors import invalidate_search_cache
 from core.jira import jira_client
-from core.milvus_client import milvus_client
-from core.config import WEBHOOK_URL, WEBHOOK_AUTO_REGISTER
+from core.milvus_client import get_milvus_client
+from core.utils import format_jira_issue
+from core.cache import TTLCache
+from core.metrics import CHAT_LATENCY, create_metrics_app
+from core.config import (
+    WEBHOOK_URL,
+    WEBHOOK_AUTO_REGISTER,
+    API_HOST,
+    API_PORT,
+    API_WORKERS,
+    STARTUP_LOCK_PATH,
+    LOG_LEVEL,
+    WEBHOOK_BATCH_SIZE,
+    WEBHOOK_FLUSH_INTERVAL_MS,
+    CHAT_LATENCY_BUDGET,
+    WEBHOOK_ISSUE_CACHE_SIZE,
+    WEBHOOK_ISSUE_CACHE_TTL,
+    CORS_ALLOW_ORIGINS,
+    CORS_MAX_AGE
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# ─────────────────────────────────────────────────────────
+# Logging: 요청 경로에서는 큐에 넣기만 하고, 출력은 백그라운드 스레드에서
+# ─────────────────────────────────────────────────────────
+
+def setup_logging(level: str = LOG_LEVEL) -> logging.handlers.QueueListener:
+    """
+    루트 로거를 QueueHandler로 설정하고 stderr 출력용 QueueListener 시작
+
+    print()처럼 요청 처리 중에 stdout write로 이벤트 루프를 막지 않도록
+    실제 I/O는 리스너 스레드가 담당합니다.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s")
+    )
+
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+_log_listener = setup_logging()
+logger = logging.getLogger("jira_agent.api")
 
 # FastAPI 앱 생성
 app = FastAPI(
     title="Jira Agent API",
     description="LangGraph 기반 Jira Agent REST API",
-    version="2.0.0"
+    version="2.0.0",
+    # 응답 직렬화를 stdlib json 대신 orjson으로 처리
+    default_response_class=ORJSONResponse
 )
 
+# 블로킹 작업(LangGraph/Jira/Milvus 호출)용 스레드 풀
+# Starlette 기본 AnyIO 스레드 풀(40개 제한)과 분리해서 이벤트 루프를 막지 않도록 함
+executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="jira-agent")
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """동기 함수를 스레드 풀에서 실행하고 결과를 기다림"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+# ─────────────────────────────────────────────────────────
+# Webhook Batcher: 웹훅 이벤트를 모아서 Milvus에 일괄 반영
+# ─────────────────────────────────────────────────────────
+
+# (action, issue_key, issue) 튜플 큐. action은 "upsert" 또는 "delete"
+webhook_queue: Optional[asyncio.Queue] = None
+_webhook_batcher_task: Optional[asyncio.Task] = None
+
+
+# 처리하는 웹훅 이벤트
+WEBHOOK_EVENTS = ("jira:issue_created", "jira:issue_updated", "jira:issue_deleted")
+
+# 웹훅 페이로드만으로 Milvus 데이터를 만들 때 반드시 있어야 하는 필드
+WEBHOOK_REQUIRED_FIELDS = ("summary", "description", "issuetype", "status")
+
+
+def issue_from_webhook(issue_data: Dict) -> Optional[Dict]:
+    """
+    웹훅 페이로드의 issue 객체를 Milvus 저장 형식으로 변환
+
+    웹훅 issue 객체는 REST API 응답과 같은 스키마이므로 format_jira_issue를 그대로 사용.
+    필수 필드가 빠져 있으면 None을 반환하고, 호출 측에서 Jira API로 다시 조회합니다.
+    (값이 null인 필드는 "없는 값"이므로 그대로 사용)
+    """
+    fields = issue_data.get("fields") or {}
+    if not issue_data.get("key") or any(f not in fields for f in WEBHOOK_REQUIRED_FIELDS):
+        return None
+    return format_jira_issue(issue_data)
+
+
+# (issue_key, updated) -> 이슈 데이터
+# 같은 시점의 이슈에 대한 연속 이벤트(created 직후 updated 등)에서 Jira 재조회를 생략
+webhook_issue_cache = TTLCache(maxsize=WEBHOOK_ISSUE_CACHE_SIZE, ttl=WEBHOOK_ISSUE_CACHE_TTL)
+
+
+async def resolve_webhook_issue(issue_data: Dict) -> Optional[Dict]:
+    """
+    웹훅 이벤트의 이슈 데이터를 Milvus 저장 형식으로 준비
+
+    1. (issue_key, updated) 캐시 조회
+    2. 페이로드에서 변환
+    3. 필드가 부족하면 Jira에서 조회
+    """
+    issue_key = issue_data.get("key")
+    updated = (issue_data.get("fields") or {}).get("updated")
+    cache_key = (issue_key, updated) if updated else None
+
+    if cache_key is not None:
+        cached = webhook_issue_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # 페이로드에 필요한 필드가 없을 때만 Jira에서 다시 조회
+    jira_issue = issue_from_webhook(issue_data)
+    if jira_issue is None:
+        logger.info("[WEBHOOK] 페이로드 필드 부족, Jira에서 조회: %s", issue_key)
+        jira_issue = await run_blocking(jira_client.get_issue, issue_key)
+
+    if jira_issue and cache_key is not None:
+        webhook_issue_cache.set(cache_key, jira_issue)
+
+    return jira_issue
+
+
+async def flush_webhook_batch(batch: List[tuple]) -> None:
+    """모인 웹훅 이벤트를 Milvus 삭제/UPSERT 요청 각각 한 번으로 반영"""
+    # 같은 이슈에 대한 이벤트가 여러 번 들어오면 마지막 이벤트만 반영
+    latest = {}
+    for action, issue_key, issue in batch:
+        latest.pop(issue_key, None)
+        latest[issue_key] = (action, issue)
+
+    delete_keys = [key for key, (action, _) in latest.items() if action == "delete"]
+    upsert_issues = [issue for action, issue in latest.values() if action == "upsert"]
+
+    async def apply_deletes() -> None:
+        success = await run_blocking(get_milvus_client().delete_by_issue_keys, delete_keys)
+        status = "✅ 삭제 완료" if success else "❌ 삭제 실패"
+        logger.info("[WEBHOOK] %s: %s", status, delete_keys)
+
+    async def apply_upserts() -> None:
+        success = await get_milvus_client().aupsert_issues(upsert_issues)
+        status = "✅ 동기화 완료" if success else "❌ 동기화 실패"
+        logger.info("[WEBHOOK] %s: %s", status, [issue.get("key") for issue in upsert_issues])
+
+    try:
+        # 이슈별로 마지막 이벤트만 남겼으므로 삭제/UPSERT 대상 키가 겹치지 않아 동시에 반영
+        tasks = []
+        if delete_keys:
+            tasks.append(apply_deletes())
+        if upsert_issues:
+            tasks.append(apply_upserts())
+        await asyncio.gather(*tasks)
+
+    except Exception as e:
+        logger.exception("[WEBHOOK] 배치 반영 오류: %s", e)
+
+    finally:
+        # 반영 결과와 관계없이 캐시된 검색 결과/응답은 더 이상 최신이 아님
+        # (Jira에서 직접 수정한 내용도 반영되도록 워커 공유 Milvus chat_cache까지 비움)
+        invalidate_search_cache()
+        try:
+            await run_blocking(get_jira_agent().clear_cache)
+        except Exception as e:
+            logger.warning("[WEBHOOK] 응답 캐시 무효화 실패: %s", e)
+
+
+async def webhook_batcher() -> None:
+    """
+    웹훅 큐를 비우는 백그라운드 작업
+
+    첫 이벤트가 들어오면 WEBHOOK_FLUSH_INTERVAL_MS 동안 또는
+    WEBHOOK_BATCH_SIZE개가 모일 때까지 기다렸다가 한 번에 반영합니다.
+    """
+    loop = asyncio.get_running_loop()
+
+    while True:
+        batch = [await webhook_queue.get()]
+        deadline = loop.time() + WEBHOOK_FLUSH_INTERVAL_MS / 1000
+
+        try:
+            while len(batch) < WEBHOOK_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(webhook_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # 종료 중이라도 이미 꺼낸 이벤트는 반영
+            await flush_webhook_batch(batch)
+            raise
+
+        await flush_webhook_batch(batch)
+
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # 실제 운영에서는 특정 도메인만 허용
+    allow_origins=CORS_ALLOW_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=CORS_MAX_AGE,  # 브라우저가 preflight 결과를 캐시하는 시간
 )
 
+# Prometheus 지표 (PROMETHEUS_MULTIPROC_DIR 설정 시 워커 전체 합산)
+app.mount("/metrics", create_metrics_app())
+
 
 # ─────────────────────────────────────────────────────────
 # Startup Event: 웹훅 자동 등록
 # ─────────────────────────────────────────────────────────
 
+# 락을 잡은 워커가 살아 있는 동안 파일 디스크립터를 유지
+_startup_lock_fd: Optional[int] = None
+
+
+def acquire_startup_lock() -> bool:
+    """
+    워커 간 1회성 시작 작업용 파일 락 획득
+
+    여러 워커 중 처음 락을 잡은 워커만 True를 반환합니다.
+    락은 해당 워커 프로세스가 종료될 때 자동으로 해제됩니다.
+    """
+    global _startup_lock_fd
+
+    if fcntl is None:
+        return True
+
+    fd = os.open(STARTUP_LOCK_PATH, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return False
+
+    _startup_lock_fd = fd
+    return True
+
+
+def warm_up() -> None:
+    """
+    첫 요청 전에 무거운 초기화를 미리 실행
+
+    - LangGraph 그래프 구성 + JiraAgent 생성
+    - Milvus 컬렉션/인덱스 메모리 로드 + 더미 검색 (임베딩 연결 포함)
+    - Jira 프로젝트 메타데이터 캐시
+    """
+    started = time.perf_counter()
+
+    for name, step in (
+        ("graph", get_jira_agent),
+        ("milvus", lambda: get_milvus_client().warm_up()),
+        ("metadata", get_project_metadata),
+    ):
+        step_started = time.perf_counter()
+        try:
+            step()
+            logger.info("[WARMUP] %s: %.0fms", name, (time.perf_counter() - step_started) * 1000)
+        except Exception as e:
+            logger.warning("[WARMUP] %s 실패 (첫 요청에서 다시 시도): %s", name, e)
+
+    logger.info("[WARMUP] 완료: %.0fms", (time.perf_counter() - started) * 1000)
+
+
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 실행되는 이벤트"""
-    print("=" * 60)
-    print("  Jira Agent 서버 시작 중...")
-    print("=" * 60)
+    global webhook_queue, _webhook_batcher_task
+
+    logger.info("Jira Agent 서버 시작 중...")
 
-    # 웹훅 자동 등록
-    if WEBHOOK_AUTO_REGISTER and WEBHOOK_URL:
-        print(f"\n[Webhook] 자동 등록 시작: {WEBHOOK_URL}")
-        success = jira_client.register_webhook(WEBHOOK_URL)
+    # 웹훅 배치 처리기 시작
+    webhook_queue = asyncio.Queue()
+    _webhook_batcher_task = asyncio.create_task(webhook_batcher())
+
+    # 그래프/Milvus/메타데이터 예열
+    await run_blocking(warm_up)
+
+    # 웹훅 자동 등록 (멀티 워커에서는 락을 잡은 워커 하나만)
+    if WEBHOOK_AUTO_REGISTER and WEBHOOK_URL and not acquire_startup_lock():
+        logger.info("[Webhook] 다른 워커가 등록을 담당합니다.")
+    elif WEBHOOK_AUTO_REGISTER and WEBHOOK_URL:
+        logger.info("[Webhook] 자동 등록 시작: %s", WEBHOOK_URL)
+        success = await run_blocking(jira_client.register_webhook, WEBHOOK_URL)
 
         if success:
-            print("[Webhook] ✅ 웹훅 등록 완료")
+            logger.info("[Webhook] ✅ 웹훅 등록 완료")
         else:
-            print("[Webhook] ⚠️  웹훅 등록 실패 (수동으로 등록 필요)")
+            logger.warning("[Webhook] ⚠️  웹훅 등록 실패 (수동으로 등록 필요)")
     else:
         if not WEBHOOK_AUTO_REGISTER:
-            print("[Webhook] 자동 등록이 비활성화되어 있습니다.")
+            logger.info("[Webhook] 자동 등록이 비활성화되어 있습니다.")
         if not WEBHOOK_URL:
-            print("[Webhook] WEBHOOK_URL이 설정되지 않았습니다.")
+            logger.info("[Webhook] WEBHOOK_URL이 설정되지 않았습니다.")
 
-    print("=" * 60)
-    print("  ✅ 서버 시작 완료")
-    print("=" * 60)
+    logger.info("✅ 서버 시작 완료")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """서버 종료 시 실행되는 이벤트"""
+    # 배치 처리기 중단 후 남은 웹훅 이벤트 반영
+    if _webhook_batcher_task is not None:
+        _webhook_batcher_task.cancel()
+        try:
+            await _webhook_batcher_task
+        except asyncio.CancelledError:
+            pass
+
+    if webhook_queue is not None and not webhook_queue.empty():
+        remaining = []
+        while not webhook_queue.empty():
+            remaining.append(webhook_queue.get_nowait())
+        await flush_webhook_batch(remaining)
+
+    executor.shutdown(wait=True)
+
+    # Jira 커넥션 풀 정리
+    jira_client.close()
+
+    # 큐에 남은 로그를 모두 출력하고 리스너 종료
+    _log_listener.stop()
 
 
 # ─────────────────────────────────────────────────────────
 # Request/Response Models
 # ─────────────────────────────────────────────────────────
 
-class ChatRequest(BaseModel):
-    """채팅 요청 모델"""
+class ChatRequest(msgspec.Struct):
+    """
+    채팅 요청 모델
+
+    예시: {"message": "KAN 프로젝트의 이슈를 검색해줘", "session_id": "user123"}
+    """
     message: str
     session_id: Optional[str] = "default"
+    # 벡터 검색 정확도/지연 시간 예산 (지정하지 않으면 대화형 기본값 "fast")
+    latency_budget: Optional[LatencyBudget] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "message": "KAN 프로젝트의 이슈를 검색해줘",
-                "session_id": "user123"
-            }
-        }
 
+class ChatResponse(msgspec.Struct):
+    """
+    채팅 응답 모델
 
-class ChatResponse(BaseModel):
-    """채팅 응답 모델"""
+    예시: {"stage": "done", "response": "검색 결과를 찾았습니다.", "message": "검색 결과를 찾았습니다.",
+          "session_id": "user123", "data": null, "missing_fields": []}
+    """
     stage: str
     response: str
     message: str
@@ -94,17 +402,18 @@ class ChatResponse(BaseModel):
     data: Optional[Any] = None
     missing_fields: Optional[List[str]] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "stage": "done",
-                "response": "검색 결과를 찾았습니다.",
-                "message": "검색 결과를 찾았습니다.",
-                "session_id": "user123",
-                "data": None,
-                "missing_fields": []
-            }
-        }
+
+# 요청마다 만들지 않도록 디코더/인코더 재사용
+chat_request_decoder = msgspec.json.Decoder(ChatRequest)
+json_encoder = msgspec.json.Encoder(enc_hook=str)
+
+
+async def decode_chat_request(request: Request) -> ChatRequest:
+    """요청 본문을 ChatRequest로 디코딩 (검증 실패 시 422)"""
+    try:
+        return chat_request_decoder.decode(await request.body())
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise HTTPException(status_code=422, detail={"error": "Invalid request", "message": str(e)})
 
 
 # ─────────────────────────────────────────────────────────
@@ -120,7 +429,9 @@ async def root():
         "status": "running",
         "endpoints": {
             "chat": "/chat",
+            "chat_stream": "/chat/stream",
             "health": "/health",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
@@ -135,18 +446,18 @@ async def health_check():
     }
 
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+@app.post("/chat")
+async def chat(http_request: Request) -> Response:
     """
     채팅 엔드포인트
 
     사용자 메시지를 받아 Jira Agent를 통해 처리하고 응답을 반환합니다.
 
     Args:
-        request: 채팅 요청 (message, session_id)
+        http_request: 채팅 요청 (본문은 msgspec으로 ChatRequest 디코딩)
 
     Returns:
-        ChatResponse: 에이전트 처리 결과
+        ChatResponse JSON: 에이전트 처리 결과
 
     Examples:
         >>> POST /chat
@@ -155,15 +466,19 @@ async def chat(request: ChatRequest) -> ChatResponse:
         >>>   "session_id": "user123"
         >>> }
     """
+    request = await decode_chat_request(http_request)
+
     try:
         # Jira Agent 처리
-        result = jira_agent.process(
-            user_input=request.message,
-            session_id=request.session_id
-        )
+        with CHAT_LATENCY.time():
+            result = await get_jira_agent().aprocess(
+                user_input=request.message,
+                session_id=request.session_id,
+                latency_budget=request.latency_budget or CHAT_LATENCY_BUDGET
+            )
 
         # 응답 생성
-        return ChatResponse(
+        response = ChatResponse(
             stage=result.get("stage", "done"),
             response=result.get("response", result.get("message", "")),
             message=result.get("message", result.get("response", "")),
@@ -171,9 +486,11 @@ async def chat(request: ChatRequest) -> ChatResponse:
             data=result.get("data"),
             missing_fields=result.get("missing_fields", [])
         )
+        return Response(content=json_encoder.encode(response), media_type="application/json")
 
     except Exception as e:
         # 에러 처리
+        logger.exception("[CHAT] 처리 오류: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -184,12 +501,72 @@ async def chat(request: ChatRequest) -> ChatResponse:
         )
 
 
+@app.post("/chat/stream")
+async def chat_stream(http_request: Request) -> StreamingResponse:
+    """
+    채팅 스트리밍 엔드포인트 (Server-Sent Events)
+
+    LangGraph 노드가 끝날 때마다 중간 결과를 `data: {...}` 이벤트로 전송하고,
+    설명 생성 중에는 LLM 토큰을 `"event": "token"` 이벤트로 바로 전송하며,
+    마지막에 /chat 응답과 같은 형식의 `"event": "done"` 이벤트를 전송합니다.
+
+    Args:
+        http_request: 채팅 요청 (본문은 msgspec으로 ChatRequest 디코딩)
+
+    Returns:
+        text/event-stream 응답
+    """
+    request = await decode_chat_request(http_request)
+
+    async def event_source():
+        chunks = get_jira_agent().astream(
+            user_input=request.message,
+            session_id=request.session_id,
+            latency_budget=request.latency_budget or CHAT_LATENCY_BUDGET
+        )
+        async for chunk in chunks:
+            yield b"data: " + orjson.dumps(chunk, default=str) + b"\n\n"
+
+    return StreamingResponse(event_source(), media_type="text/event-stream")
+
+
+async def _process_webhook(webhook_event: str, issue_data: Dict) -> None:
+    """
+    웹훅 이벤트 백그라운드 처리
+
+    응답을 보낸 뒤 실행되며, 이슈 데이터를 준비해 배치 처리기 큐에 넣습니다.
+    (필요하면 Jira 재조회도 여기서 하므로 웹훅 응답 시간에 포함되지 않음)
+    """
+    issue_key = issue_data.get("key")
+
+    try:
+        if webhook_event == "jira:issue_deleted":
+            # 삭제 이벤트: 배치 처리기에 넘겨서 Milvus에서도 삭제
+            logger.debug("[WEBHOOK] 이슈 삭제 예약: %s", issue_key)
+            await webhook_queue.put(("delete", issue_key, None))
+            return
+
+        # 생성/수정 이벤트: 페이로드의 이슈 데이터로 배치 처리기에 넘김
+        logger.debug("[WEBHOOK] 이슈 동기화 예약: %s", issue_key)
+        jira_issue = await resolve_webhook_issue(issue_data)
+
+        if jira_issue:
+            await webhook_queue.put(("upsert", issue_key, jira_issue))
+        else:
+            logger.error("[WEBHOOK] ❌ Jira 이슈 조회 실패: %s", issue_key)
+
+    except Exception as e:
+        logger.exception("[WEBHOOK] 오류 발생: %s", e)
+
+
 @app.post("/webhook/jira")
-async def jira_webhook(webhook_data: dict):
+async def jira_webhook(request: Request, background_tasks: BackgroundTasks):
     """
     Jira 웹훅 엔드포인트
 
     Jira에서 이슈 생성/수정/삭제 이벤트 발생 시 호출되어 Milvus를 자동으로 동기화합니다.
+    Jira의 웹훅 타임아웃/재시도를 피하도록 바로 202를 응답하고,
+    실제 처리는 백그라운드 작업(_process_webhook)에서 합니다.
 
     지원 이벤트:
     - jira:issue_created
@@ -197,68 +574,38 @@ async def jira_webhook(webhook_data: dict):
     - jira:issue_deleted
 
     Args:
-        webhook_data: Jira 웹훅 페이로드
+        request: Jira 웹훅 요청 (본문은 orjson으로 직접 파싱)
+        background_tasks: 응답 후 실행할 작업
 
     Returns:
-        성공/실패 상태
+        접수/무시 상태
     """
+    # 타입 없는 dict라 Pydantic 검증 없이 바로 파싱
     try:
-        webhook_event = webhook_data.get("webhookEvent")
-        issue_data = webhook_data.get("issue", {})
-        issue_key = issue_data.get("key")
+        webhook_data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail={"error": "Invalid JSON payload", "message": str(e)})
 
-        print(f"[WEBHOOK] 이벤트: {webhook_event}, 이슈: {issue_key}")
+    if not isinstance(webhook_data, dict):
+        raise HTTPException(status_code=400, detail={"error": "Invalid JSON payload", "message": "object expected"})
 
-        if webhook_event == "jira:issue_deleted":
-            # 삭제 이벤트: Milvus에서도 삭제
-            print(f"[WEBHOOK] 이슈 삭제 시작: {issue_key}")
-
-            success = milvus_client.delete_by_issue_key(issue_key)
-
-            if success:
-                print(f"[WEBHOOK] ✅ Milvus에서 이슈 삭제 완료: {issue_key}")
-                return {"status": "success", "message": f"Issue {issue_key} deleted from Milvus"}
-            else:
-                print(f"[WEBHOOK] ❌ Milvus 삭제 실패: {issue_key}")
-                return {"status": "error", "message": f"Failed to delete {issue_key} from Milvus"}
-
-        elif webhook_event in ["jira:issue_created", "jira:issue_updated"]:
-            # 생성/수정 이벤트: Jira에서 최신 데이터 가져와서 Milvus 업데이트
-            print(f"[WEBHOOK] 이슈 동기화 시작: {issue_key}")
-
-            # Jira에서 최신 이슈 데이터 가져오기
-            jira_issue = jira_client.get_issue(issue_key)
-
-            if jira_issue:
-                # Milvus에 UPSERT
-                success = milvus_client.upsert_issues([jira_issue])
-
-                if success:
-                    print(f"[WEBHOOK] ✅ Milvus 동기화 완료: {issue_key}")
-                    return {"status": "success", "message": f"Issue {issue_key} synced to Milvus"}
-                else:
-                    print(f"[WEBHOOK] ❌ Milvus 동기화 실패: {issue_key}")
-                    return {"status": "error", "message": f"Failed to sync {issue_key} to Milvus"}
-            else:
-                print(f"[WEBHOOK] ❌ Jira 이슈 조회 실패: {issue_key}")
-                return {"status": "error", "message": f"Failed to fetch issue {issue_key} from Jira"}
+    webhook_event = webhook_data.get("webhookEvent")
+    issue_data = webhook_data.get("issue") or {}
+    issue_key = issue_data.get("key")
 
-        else:
-            # 지원하지 않는 이벤트
-            print(f"[WEBHOOK] 지원하지 않는 이벤트: {webhook_event}")
-            return {"status": "ignored", "message": f"Event {webhook_event} not supported"}
+    logger.info("[WEBHOOK] 이벤트: %s, 이슈: %s", webhook_event, issue_key)
 
-    except Exception as e:
-        print(f"[WEBHOOK] 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(
-            status_code=500,
-            detail={
-                "error": "Webhook processing failed",
-                "message": str(e)
-            }
-        )
+    if webhook_event not in WEBHOOK_EVENTS:
+        # 지원하지 않는 이벤트
+        logger.info("[WEBHOOK] 지원하지 않는 이벤트: %s", webhook_event)
+        return {"status": "ignored", "message": f"Event {webhook_event} not supported"}
+
+    background_tasks.add_task(_process_webhook, webhook_event, issue_data)
+
+    return ORJSONResponse(
+        status_code=202,
+        content={"status": "accepted", "message": f"Issue {issue_key} queued ({webhook_event})"}
+    )
 
 
 # ─────────────────────────────────────────────────────────
@@ -272,14 +619,21 @@ if __name__ == "__main__":
     print("=" * 60)
     print("  Endpoints:")
     print("    - POST /chat         : 채팅 메시지 처리")
+    print("    - POST /chat/stream  : 채팅 메시지 처리 (SSE 스트리밍)")
     print("    - POST /webhook/jira : Jira 웹훅 (자동 동기화)")
     print("    - GET  /health       : 헬스 체크")
+    print("    - GET  /metrics      : Prometheus 지표")
     print("    - GET  /docs         : API 문서 (Swagger UI)")
+    print(f"  Workers: {API_WORKERS}")
     print("=" * 60)
 
+    # 워커가 여러 개면 앱을 import 문자열로 넘겨야 함 (Jira/ 디렉토리가 sys.path에 있음)
     uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-        log_level="info"
+        "api.server:app",
+        host=API_HOST,
+        port=API_PORT,
+        workers=API_WORKERS,
+        log_level=LOG_LEVEL.lower(),
+        loop="uvloop",
+        http="httptools"
     )
@@ -11,14 +11,25 @@ Jira Agent Core Module
 
 #from Jira.archive.agent import JiraAgent, jira_agent
 from core.jira import JiraClient, jira_client
-from core.agent_v2 import JiraAgent, jira_agent
-from core.milvus_client import MilvusClient, milvus_client
+from core.agent_v2 import JiraAgent, get_jira_agent
+from core.milvus_client import MilvusClient, get_milvus_client
 
 __all__ = [
     "JiraAgent",
+    "get_jira_agent",
     "jira_agent",
     "JiraClient",
     "jira_client",
     "MilvusClient",
+    "get_milvus_client",
     "milvus_client",
 ]
+
+
+def __getattr__(name: str):
+    """jira_agent/milvus_client는 import 시점이 아니라 첫 접근 시 생성"""
+    if name == "jira_agent":
+        return get_jira_agent()
+    if name == "milvus_client":
+        return get_milvus_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
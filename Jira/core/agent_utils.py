@@ -6,12 +6,19 @@ Jira Agent - Utilities
 공통 유틸리티, 타입 정의, OpenAI 클라이언트 등
 """
 
-from typing import TypedDict, Literal, Optional, List, Dict, Any
-from openai import OpenAI
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Callable, FrozenSet, NamedTuple, Tuple, TypedDict, Literal, Optional, List, Dict, Any, Type
+from openai import AsyncOpenAI, OpenAI
+from pydantic import BaseModel
 
-from core.config import OPENAI_API_KEY, CHAT_MODEL
+from core.config import OPENAI_API_KEY, CHAT_MODEL, PROJECT_METADATA_TTL
 from core.jira import jira_client
 
+logger = logging.getLogger(__name__)
+
 
 # ─────────────────────────────────────────────────────────
 # 타입 정의
@@ -19,15 +26,41 @@ from core.jira import jira_client
 
 Intent = Literal["search", "create", "update", "delete", "explain", "unknown"]
 Stage = Literal["idle", "parse", "clarify", "curd_check", "find_candidates", "approve", "execute", "done"]
+LatencyBudget = Literal["fast", "balanced", "accurate"]
+
+# 사용자 응답을 기다리며 중단된 stage (다음 입력에서 해당 노드로 복귀)
+PENDING_STAGES = frozenset({"int_candidate", "approve", "clarify", "check_slots"})
+# 슬롯 검증(check_slots)으로 보내는 CRUD 의도
+CRUD_INTENTS = frozenset({"search", "create", "update", "delete"})
+
+# 체크포인트에 남길 대화 이력 최대 개수 (JiraAgent가 턴마다 추가, 세션이 길어져도 상태 크기 고정)
+HISTORY_MAX_TURNS = 20
+# 의도 파싱 프롬프트에 넣는 최근 대화 이력 개수 (응답 캐시 키에도 같은 범위를 포함)
+HISTORY_PROMPT_TURNS = 4
+
+
+def keep_last_n(n: int) -> Callable[[Optional[List], Optional[List]], List]:
+    """
+    LangGraph 리듀서: 새 값으로 교체하되 마지막 n개만 유지
+
+    노드는 state 전체를 반환하므로 이어붙이지 않고 교체(기존 동작과 동일)만 하고,
+    길이만 잘라서 체크포인트마다 직렬화되는 이력 크기를 제한합니다.
+    """
+    def reducer(current: Optional[List], update: Optional[List]) -> List:
+        value = update if update is not None else current
+        return list(value[-n:]) if value else []
+    return reducer
+
 
 class AgentState(TypedDict):
     """에이전트 상태"""
     # 입력
     user_input: str
     session_id: str
+    latency_budget: LatencyBudget  # 벡터 검색 정확도/지연 시간 예산
 
     # 대화 이력
-    history: List[Dict[str, str]]
+    history: Annotated[List[Dict[str, str]], keep_last_n(HISTORY_MAX_TURNS)]
 
     # 파싱 결과
     intent: Intent
@@ -38,6 +71,9 @@ class AgentState(TypedDict):
     stage: Stage
     missing_fields: List[str]
 
+    # parse_intent에서 미리 확인한 이슈 존재 여부 (issue_key → bool, 이번 턴에만 유효)
+    issue_lookup: Dict[str, bool]
+
     # 후보 이슈 (수정/삭제 시 여러 후보가 있을 경우)
     candidate_issues: Optional[List[Dict[str, Any]]]
 
@@ -47,33 +83,196 @@ class AgentState(TypedDict):
     data: Optional[Dict[str, Any]]
 
 
+# ─────────────────────────────────────────────────────────
+# LLM 응답 스키마 (Structured Outputs)
+# ─────────────────────────────────────────────────────────
+
+class Slots(BaseModel):
+    """parse_intent가 추출하는 슬롯 (없는 값은 null)"""
+    project_key: Optional[str] = None
+    summary: Optional[str] = None
+    description: Optional[str] = None
+    assignee: Optional[str] = None
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    duedate: Optional[str] = None
+    issuetype: Optional[str] = None
+    keyword: Optional[str] = None
+    issue_key: Optional[str] = None
+    limit: Optional[int] = None
+    explain_topic: Optional[str] = None
+
+
+class IntentParse(BaseModel):
+    """parse_intent 응답"""
+    intent: Intent
+    slots: Slots
+    confidence: float
+    missing_fields: List[str]
+
+
+class PendingIntentParse(BaseModel):
+    """중단된 작업이 있을 때 parse_intent 응답 (계속 여부 + 새 작업으로 본 파싱 결과)"""
+    decision: Literal["continue", "new_task"]
+    reason: str
+    intent: Intent
+    slots: Slots
+    confidence: float
+    missing_fields: List[str]
+
+
+class ClarifyParse(BaseModel):
+    """clarify에서 사용자가 제공한 누락 필드 값 (입력되지 않은 필드는 null)"""
+    project_key: Optional[str] = None
+    issuetype: Optional[str] = None
+    issue_key: Optional[str] = None
+    summary: Optional[str] = None
+    description: Optional[str] = None
+    assignee: Optional[str] = None
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    duedate: Optional[str] = None
+
+
+def _strict_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """strict 모드 규칙 적용: 모든 속성 required, 추가 속성 금지, null 기본값 제거"""
+    if isinstance(schema, dict):
+        if schema.get("default", ...) is None:
+            schema.pop("default")
+        if schema.get("type") == "object" and "properties" in schema:
+            schema["required"] = list(schema["properties"])
+            schema["additionalProperties"] = False
+        for value in schema.values():
+            if isinstance(value, (dict, list)):
+                _strict_schema(value)
+    elif isinstance(schema, list):
+        for item in schema:
+            _strict_schema(item)
+    return schema
+
+
+def json_schema_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Pydantic 모델 → chat.completions response_format (json_schema, strict)"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "schema": _strict_schema(model.model_json_schema()),
+            "strict": True,
+        },
+    }
+
+
 # ─────────────────────────────────────────────────────────
 # OpenAI 클라이언트
 # ─────────────────────────────────────────────────────────
 
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
+# async 노드용 (그래프는 ainvoke로 실행, LLM 호출 중에 다른 I/O와 겹치도록)
+aopenai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+# ─────────────────────────────────────────────────────────
+# 프로젝트 메타데이터 (TTL 캐시)
+# ─────────────────────────────────────────────────────────
+
+class ProjectMeta(NamedTuple):
+    """프로젝트 메타데이터 + 노드에서 매번 만들던 파생 값 (캐시를 채울 때 한 번만 계산)"""
+    project_keys: List[str]
+    project_issue_types: Dict[str, List[str]]
+    project_list: str                      # "KAN, TEST" (프로젝트가 없으면 "")
+    key_set: FrozenSet[str]                # project_key 존재 확인용
+    keys_by_upper: Dict[str, str]          # 대문자 키 → 원래 키 (대소문자 무시 비교)
+    prompt_key: Tuple[Tuple[str, ...], Tuple[Tuple[str, Tuple[str, ...]], ...]]  # 프롬프트 캐시 키 (hashable)
+
 
-# 프로젝트 메타데이터 캐시 (한 번만 조회)
+def _build_project_meta(project_keys: List[str], project_issue_types: Dict[str, List[str]]) -> ProjectMeta:
+    """조회 결과로 ProjectMeta 생성"""
+    return ProjectMeta(
+        project_keys=project_keys,
+        project_issue_types=project_issue_types,
+        project_list=", ".join(project_keys),
+        key_set=frozenset(project_keys),
+        keys_by_upper={key.upper(): key for key in project_keys},
+        prompt_key=(
+            tuple(project_keys),
+            tuple((proj, tuple(types)) for proj, types in project_issue_types.items())
+        ),
+    )
+
+
+_EMPTY_PROJECT_META = _build_project_meta([], {})
+
+# 프로젝트 메타데이터 캐시: (ProjectMeta, 생성 시각)
 _project_metadata_cache = None
 
-def get_project_metadata():
+
+def _cached_project_meta() -> Optional[ProjectMeta]:
+    """아직 유효한 캐시된 ProjectMeta (없거나 만료됐으면 None)"""
+    cache = _project_metadata_cache
+    if cache is not None:
+        meta, cached_at = cache
+        if time.monotonic() - cached_at < PROJECT_METADATA_TTL:
+            return meta
+    return None
+
+
+def get_project_meta() -> ProjectMeta:
     """
-    프로젝트 목록과 이슈 타입을 캐싱하여 반환
+    프로젝트 목록과 이슈 타입(+ 파생 값)을 캐싱하여 반환
 
-    첫 호출 시에만 Jira API를 호출하고, 이후에는 캐시된 데이터 사용
+    PROJECT_METADATA_TTL초 동안은 캐시된 데이터를 사용하고, 만료되면 Jira API로 다시 조회
+    (조회 결과가 비어 있거나 실패하면 캐시하지 않고 빈 메타데이터 반환)
     """
     global _project_metadata_cache
 
-    if _project_metadata_cache is None:
-        try:
-            projects = jira_client.get_projects()
-            project_keys = [p['key'] for p in projects]
-            project_issue_types = jira_client.get_issue_types()
+    meta = _cached_project_meta()
+    if meta is not None:
+        return meta
 
-            _project_metadata_cache = (project_keys, project_issue_types)
-            print(f"[CACHE] 프로젝트 메타데이터 캐시 생성: {len(project_keys)}개 프로젝트")
-        except Exception as e:
-            print(f"[ERROR] 프로젝트 메타데이터 조회 실패: {e}")
-            return ([], {})
+    try:
+        # 두 조회는 서로 독립적이므로 동시에 실행 (대기 시간 = 느린 쪽 하나)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            projects_future = pool.submit(jira_client.get_projects)
+            issue_types_future = pool.submit(jira_client.get_issue_types)
+            projects = projects_future.result()
+            project_issue_types = issue_types_future.result()
+
+        project_keys = [p['key'] for p in projects]
+    except Exception as e:
+        logger.exception("[ERROR] 프로젝트 메타데이터 조회 실패: %s", e)
+        return _EMPTY_PROJECT_META
+
+    meta = _build_project_meta(project_keys, project_issue_types)
+    # 이슈 타입 조회가 실패한(빈) 메타데이터는 캐시하지 않음 (다음 요청에서 재조회)
+    if project_keys and project_issue_types:
+        _project_metadata_cache = (meta, time.monotonic())
+        logger.debug("[CACHE] 프로젝트 메타데이터 캐시 생성: %d개 프로젝트", len(project_keys))
+
+    return meta
+
+
+async def aget_project_meta() -> ProjectMeta:
+    """
+    get_project_meta()의 async 버전 (async 노드용)
+
+    캐시가 유효하면 바로 반환하고, 만료됐을 때만 Jira API 조회를 스레드에서 실행해서
+    이벤트 루프를 막지 않습니다.
+    """
+    meta = _cached_project_meta()
+    if meta is not None:
+        return meta
+    return await asyncio.to_thread(get_project_meta)
+
+
+def get_project_metadata():
+    """(project_keys, project_issue_types) 반환 (get_project_meta()의 호환용)"""
+    meta = get_project_meta()
+    return meta.project_keys, meta.project_issue_types
+
+
+def invalidate_project_metadata() -> None:
+    """프로젝트 메타데이터 캐시 무효화 (Jira 클라이언트 캐시 포함)"""
+    global _project_metadata_cache
 
-    return _project_metadata_cache
+    _project_metadata_cache = None
+    jira_client.invalidate()
@@ -13,15 +13,60 @@ LangGraph를 사용한 상태 머신 기반 Jira 에이전트
 4. Jira/Milvus 연동
 """
 
-from typing import Dict
-
-from langgraph.checkpoint.memory import MemorySaver
+import asyncio
+import hashlib
+import logging
+import re
+import weakref
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 # 패키지 내부에서 import할 때와 직접 실행할 때를 구분
 try:
     from core.routing import build_graph
+    from core.checkpoint import DeferredMemorySaver
+    from core.cache import TTLCache, SemanticCache
+    from core.milvus_client import get_milvus_client
+    from core.metrics import CACHE_HITS, CACHE_MISSES
+    from core.agent_utils import HISTORY_PROMPT_TURNS
+    from core.utils import dumps_json
+    from core.config import (
+        RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, SEMANTIC_CACHE_THRESHOLD,
+        CHAT_CACHE_ENABLED, CHAT_CACHE_THRESHOLD
+    )
 except ModuleNotFoundError:
     from routing import build_graph
+    from checkpoint import DeferredMemorySaver
+    from cache import TTLCache, SemanticCache
+    from milvus_client import get_milvus_client
+    from metrics import CACHE_HITS, CACHE_MISSES
+    from agent_utils import HISTORY_PROMPT_TURNS
+    from utils import dumps_json
+    from config import (
+        RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, SEMANTIC_CACHE_THRESHOLD,
+        CHAT_CACHE_ENABLED, CHAT_CACHE_THRESHOLD
+    )
+
+
+logger = logging.getLogger(__name__)
+
+# 응답 캐시 대상: 세션 상태를 바꾸지 않는 조회성 의도
+# ("unknown"은 파싱 실패(OpenAI 일시 오류 등)에서도 설정되므로 캐시하지 않음)
+CACHEABLE_INTENTS = ("search", "explain")
+# 데이터를 변경하는 의도 (실행되면 캐시 무효화)
+WRITE_INTENTS = ("create", "update", "delete")
+# 진행 중인 작업이 없는 stage
+IDLE_STAGES = (None, "idle", "done")
+# 캐시 적중 시 세션 상태에 다시 써야 하는 값 중 응답 딕셔너리에 없는 필드
+# (다음 턴의 "2번 수정해줘" 같은 후속 요청이 이번 턴의 파싱 결과/후보를 참조)
+CACHED_STATE_FIELDS = ("intent", "slots", "confidence", "candidate_issues")
+# 캐시 적중 턴을 기록할 때 사용할 마지막 노드 (둘 다 END로 이어짐)
+CACHED_TURN_NODES = {"search": "execute", "explain": "explain_method"}
+# 의미 캐시에서 반드시 같아야 하는 엔티티 토큰 (프로젝트 키, 이슈 키, 개수 등 영문/숫자 토큰)
+# 문장 임베딩은 "KAN 버그"와 "TEST 버그", "3개"와 "5개"를 거의 같게 보므로 따로 비교
+ENTITY_TOKEN = re.compile(r"[A-Za-z0-9]+(?:-\d+)?")
+# 대화 이력에 남기는 응답 최대 길이 (검색 결과 목록 전체가 프롬프트에 들어가지 않도록)
+HISTORY_RESPONSE_CHARS = 200
 
 
 # ─────────────────────────────────────────────────────────
@@ -34,24 +79,256 @@ class JiraAgent:
     def __init__(self):
         """초기화"""
         self.workflow = build_graph()
-        self.checkpointer = MemorySaver()
+        # 노드마다 저장하지 않고 턴이 끝날 때 한 번만 저장 (core/checkpoint.py 참고)
+        self.checkpointer = DeferredMemorySaver()
 
         # Checkpointer만 사용 (interrupt_before 제거)
         # 각 노드가 END로 종료되면서 자동으로 중단됨
         self.app = self.workflow.compile(checkpointer=self.checkpointer)
 
-        print("✅ JiraAgent (LangGraph) 초기화 완료")
-        print("   - Checkpointer를 통한 상태 저장/복원")
+        # 응답 캐시: 정확히 같은 입력(정규화 키) + 의미적으로 거의 같은 입력(임베딩)
+        # 프로세스 내 캐시를 놓치면 워커 간 공유되는 Milvus chat_cache(HNSW)를 조회
+        self._response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+        self._semantic_cache = SemanticCache(threshold=SEMANTIC_CACHE_THRESHOLD, ttl=RESPONSE_CACHE_TTL)
+
+        # 세션별 턴 직렬화용 Lock (사용 중인 세션의 Lock만 남도록 약한 참조로 보관)
+        self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+        logger.info("✅ JiraAgent (LangGraph) 초기화 완료 - Checkpointer를 통한 상태 저장/복원")
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        """
+        세션별 asyncio.Lock
+
+        DeferredMemorySaver는 thread_id(세션)별로 체크포인트를 버퍼링하므로,
+        같은 세션의 요청(중복 전송 등)이 동시에 실행되면 한 flush가 두 실행의 버퍼를 섞어 저장합니다.
+        한 세션의 턴은 순서대로 실행합니다 (다른 세션끼리는 동시 실행).
+        """
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+
+    @staticmethod
+    def _cache_key(user_input: str, context: str) -> str:
+        """응답 캐시 키 (공백/대소문자 정규화한 입력 + 대화 이력 digest)"""
+        text = f"{user_input.strip().lower()}\0{context}"
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _history_digest(history: List[Dict[str, str]]) -> str:
+        """
+        의도 파싱 프롬프트에 들어가는 최근 대화 이력의 digest (이력이 없으면 빈 문자열)
+
+        "그중 완료된 것만" 같은 후속 질문은 이력에 따라 결과가 달라지므로,
+        이력이 같을 때만 캐시가 적중하도록 키/의미 캐시 항목에 포함합니다.
+        """
+        recent = history[-HISTORY_PROMPT_TURNS:]
+        if not recent:
+            return ""
+        return hashlib.blake2b(dumps_json(recent).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _load_state(self, config: Dict) -> Dict:
+        """
+        세션의 마지막 상태 값 조회
+
+        app.get_state()는 StateSnapshot(다음 노드, 태스크 등)까지 만들기 때문에
+        값만 필요할 때는 checkpointer.get_tuple()로 바로 읽습니다.
+        """
+        checkpoint_tuple = self.checkpointer.get_tuple(config)
+        if checkpoint_tuple is None:
+            return {}
+        return checkpoint_tuple.checkpoint.get("channel_values", {})
+
+    @staticmethod
+    def _next_history(previous: Dict) -> List[Dict[str, str]]:
+        """
+        이전 턴(입력 + 응답)을 추가한 이번 턴의 대화 이력
+
+        이전 턴의 입력/응답은 체크포인트에 남아 있으므로 다음 턴 시작 시 이력으로 옮깁니다
+        (턴이 끝난 뒤 update_state로 쓰면 체크포인트를 한 번 더 저장해야 함).
+        길이 제한은 history 리듀서(keep_last_n)가 처리합니다.
+        """
+        history = list(previous.get("history") or [])
+        if previous.get("user_input"):
+            history.append({
+                "user": previous["user_input"],
+                "response": (previous.get("response") or "")[:HISTORY_RESPONSE_CHARS]
+            })
+        return history
+
+    def clear_cache(self) -> None:
+        """응답 캐시 전체 무효화"""
+        self._response_cache.clear()
+        self._semantic_cache.clear()
+        if CHAT_CACHE_ENABLED:
+            get_milvus_client().clear_chat_cache()
+
+    @staticmethod
+    def _entities(user_input: str) -> Tuple[str, ...]:
+        """입력의 엔티티 토큰 (대문자, 정렬) - 의미 캐시는 이 값이 같을 때만 적중"""
+        return tuple(sorted({token.upper() for token in ENTITY_TOKEN.findall(user_input)}))
+
+    def _lookup_cache(self, user_input: str, config: Dict) -> Tuple[Optional[Dict], Dict]:
+        """
+        응답 캐시 조회 + 이번 턴의 대화 이력 준비
+
+        캐시 대상은 조회성 응답(검색/설명)이라 세션 간에 공유하되,
+        키와 의미 캐시 항목에 최근 대화 이력 digest를 넣어 이력이 같을 때만 적중합니다.
+        의미 캐시(프로세스 내/Milvus chat_cache)는 엔티티 토큰까지 같아야 적중합니다.
+        임베딩 계산이 동기 호출이므로 aprocess/astream에서는 스레드에서 실행합니다.
+
+        Returns:
+            (캐시 항목({"result", "state"}) or None, 턴 컨텍스트)
+            턴 컨텍스트의 history는 그래프 입력으로 사용하고,
+            진행 중인 작업이 있으면 캐시를 쓰지 않으므로 key가 None
+        """
+        previous = self._load_state(config)
+        history = self._next_history(previous)
+        cache_ctx = {"history": history, "key": None}
+
+        # 진행 중인 작업이 없을 때만 캐시 사용 (clarify/approve 응답은 세션 상태에 의존)
+        if previous.get("stage") not in IDLE_STAGES:
+            return None, cache_ctx
+
+        entities = self._entities(user_input)
+        context = self._history_digest(history)
+        cache_ctx.update(
+            key=self._cache_key(user_input, context), embedding=None, entities=entities, context=context
+        )
+
+        hit_kind = "exact"
+        cached = self._response_cache.get(cache_ctx["key"])
+        if cached is None:
+            hit_kind = "semantic"
+            # 임베딩 실패(None)면 의미 캐시는 건너뜀
+            cache_ctx["embedding"] = get_milvus_client().get_query_embedding(user_input)
+            if cache_ctx["embedding"] is not None:
+                cached = self._match_entry(self._semantic_cache.get(cache_ctx["embedding"]), entities, context)
+            if cached is None and cache_ctx["embedding"] is not None and CHAT_CACHE_ENABLED:
+                hit_kind = "shared"
+                cached = self._match_entry(get_milvus_client().search_chat_cache(
+                    cache_ctx["embedding"], threshold=CHAT_CACHE_THRESHOLD, ttl=RESPONSE_CACHE_TTL
+                ), entities, context)
+                if cached is not None:
+                    self._semantic_cache.set(cache_ctx["embedding"], cached)
+            if cached is not None:
+                # 같은 입력이 다시 오면 임베딩 없이 바로 적중하도록
+                self._response_cache.set(cache_ctx["key"], cached)
+
+        if cached is not None:
+            CACHE_HITS.labels(kind=hit_kind).inc()
+            logger.info("[AGENT] 응답 캐시 적중(%s): user_input='%s'", hit_kind, user_input)
+        else:
+            CACHE_MISSES.inc()
+
+        return cached, cache_ctx
+
+    @staticmethod
+    def _cache_entry(cache_ctx: Dict, final_state: Dict, result: Dict) -> Dict:
+        """
+        캐시 저장 형식 (엔티티 토큰 + 대화 이력 digest + 응답 + 세션 상태)
+
+        적중 시 그래프를 실행하지 않고도 세션 상태에 이번 턴을 기록할 수 있도록
+        응답 딕셔너리에 없는 상태 필드(CACHED_STATE_FIELDS)를 함께 저장합니다.
+        """
+        return {
+            "entities": list(cache_ctx["entities"]),
+            "context": cache_ctx["context"],
+            "result": result,
+            "state": {field: final_state.get(field) for field in CACHED_STATE_FIELDS}
+        }
+
+    @staticmethod
+    def _match_entry(entry: Optional[Dict], entities: Tuple[str, ...], context: str) -> Optional[Dict]:
+        """캐시 항목의 엔티티 토큰/대화 이력이 현재 턴과 같으면 항목, 아니면 None (이전 형식 항목도 None)"""
+        if (
+            not isinstance(entry, dict)
+            or "state" not in entry
+            or entry.get("entities") != list(entities)
+            or entry.get("context") != context
+        ):
+            return None
+        return entry
+
+    def _store_cache(self, cache_ctx: Dict, final_state: Dict, result: Dict) -> None:
+        """실행 결과에 따라 응답 캐시 저장 또는 무효화"""
+        if result["stage"] != "done":
+            return
+
+        intent = final_state.get("intent")
+        if intent in WRITE_INTENTS:
+            # 데이터가 바뀌었으므로 이전 검색 응답은 더 이상 유효하지 않음
+            self.clear_cache()
+        elif cache_ctx["key"] is not None and intent in CACHEABLE_INTENTS:
+            entry = self._cache_entry(cache_ctx, final_state, result)
+            self._response_cache.set(cache_ctx["key"], entry)
+            if cache_ctx["embedding"] is not None:
+                self._semantic_cache.set(cache_ctx["embedding"], entry)
+                if CHAT_CACHE_ENABLED:
+                    get_milvus_client().insert_chat_cache(cache_ctx["embedding"], entry)
 
-    def process(self, user_input: str, session_id: str = "default") -> Dict:
+    async def _record_cached_turn(self, config: Dict, inputs: Dict, cache_ctx: Dict, cached: Dict) -> None:
+        """
+        캐시 적중 턴을 세션 상태에 기록
+
+        그래프를 실행하지 않아도 다음 턴의 대화 이력에는 사용자가 실제로 받은 응답이 들어가고,
+        후속 요청(후보 선택, 수정 등)이 참조하는 파싱 결과/검색 결과도 남도록
+        캐시된 상태를 이번 턴의 마지막 노드가 쓴 것처럼 저장합니다.
+        """
+        result, state = cached["result"], cached["state"]
+        values = {
+            **inputs,
+            **state,
+            "history": cache_ctx["history"],
+            "issue_lookup": {},
+            "stage": result.get("stage", "done"),
+            "message": result.get("message", ""),
+            "response": result.get("response", ""),
+            "data": result.get("data"),
+            "missing_fields": result.get("missing_fields", []),
+        }
+        as_node = CACHED_TURN_NODES.get(state.get("intent"), "execute")
+        try:
+            await self.app.aupdate_state(config, values, as_node=as_node)
+        finally:
+            self.checkpointer.flush(config["configurable"]["thread_id"])
+
+    @staticmethod
+    def _build_result(final_state: Dict, session_id: str) -> Dict:
+        """최종 상태를 응답 딕셔너리로 변환"""
+        return {
+            "stage": final_state.get("stage", "done"),
+            "message": final_state.get("message", ""),
+            "response": final_state.get("response", ""),
+            "data": final_state.get("data"),
+            "missing_fields": final_state.get("missing_fields", []),
+            "session_id": session_id
+        }
+
+    @staticmethod
+    def _build_error(error: Exception, session_id: str) -> Dict:
+        """오류 응답 딕셔너리"""
+        return {
+            "stage": "done",
+            "message": f"오류가 발생했습니다: {str(error)}",
+            "response": f"오류가 발생했습니다: {str(error)}",
+            "session_id": session_id
+        }
+
+    async def aprocess(self, user_input: str, session_id: str = "default", latency_budget: str = "balanced") -> Dict:
         """
         메시지 처리 (모든 라우팅은 LangGraph에 위임)
 
         Root Router가 설치된 그래프에 단순히 입력을 전달하고 결과를 받습니다.
+        LLM 호출 노드는 async라 그래프는 ainvoke로 실행하고,
+        동기 I/O(캐시 임베딩, Milvus chat_cache)는 스레드에서 실행합니다.
 
         Args:
             user_input: 사용자 입력
             session_id: 세션 ID
+            latency_budget: 벡터 검색 예산 ("fast" | "balanced" | "accurate")
 
         Returns:
             응답 딕셔너리
@@ -59,34 +336,111 @@ class JiraAgent:
         config = {"configurable": {"thread_id": session_id}}
 
         # 새 입력만 준비
-        inputs = {"user_input": user_input}
+        inputs = {"user_input": user_input, "latency_budget": latency_budget}
+
+        async with self._session_lock(session_id):
+            try:
+                cached, cache_ctx = await asyncio.to_thread(self._lookup_cache, user_input, config)
+                if cached is not None:
+                    await self._record_cached_turn(config, inputs, cache_ctx, cached)
+                    return {**cached["result"], "session_id": session_id}
+
+                logger.info("[AGENT] 그래프 실행: user_input='%s', session_id=%s", user_input, session_id)
+
+                try:
+                    final_state = await self.app.ainvoke({**inputs, "history": cache_ctx["history"]}, config=config)
+                finally:
+                    self.checkpointer.flush(session_id)
+
+                # 최종 결과 반환
+                result = self._build_result(final_state, session_id)
+                await asyncio.to_thread(self._store_cache, cache_ctx, final_state, result)
+                return result
+
+            except Exception as e:
+                logger.exception("[ERROR] 그래프 실행 오류: %s", e)
+                return self._build_error(e, session_id)
+
+    def process(self, user_input: str, session_id: str = "default", latency_budget: str = "balanced") -> Dict:
+        """aprocess()의 동기 버전 (이벤트 루프가 없는 스크립트/테스트용)"""
+        return asyncio.run(self.aprocess(user_input, session_id=session_id, latency_budget=latency_budget))
+
+    async def astream(
+        self,
+        user_input: str,
+        session_id: str = "default",
+        latency_budget: str = "balanced"
+    ) -> AsyncIterator[Dict]:
+        """
+        메시지 처리 (노드 단위 스트리밍)
+
+        노드 실행이 끝날 때마다 {"event": "node", ...}를 yield하고,
+        LLM 설명 생성 중에는 토큰마다 {"event": "token", "token": ...}을,
+        마지막에 aprocess()와 같은 형식의 결과를 {"event": "done", ...}로 yield합니다.
+
+        Args:
+            user_input: 사용자 입력
+            session_id: 세션 ID
+            latency_budget: 벡터 검색 예산 ("fast" | "balanced" | "accurate")
+
+        Yields:
+            이벤트 딕셔너리
+        """
+        config = {"configurable": {"thread_id": session_id}}
+        inputs = {"user_input": user_input, "latency_budget": latency_budget}
+
+        async with self._session_lock(session_id):
+            try:
+                cached, cache_ctx = await asyncio.to_thread(self._lookup_cache, user_input, config)
+                if cached is not None:
+                    await self._record_cached_turn(config, inputs, cache_ctx, cached)
+                    yield {"event": "done", **cached["result"], "session_id": session_id}
+                    return
+
+                logger.info("[AGENT] 그래프 스트리밍 실행: user_input='%s', session_id=%s", user_input, session_id)
+
+                try:
+                    async for mode, update in self.app.astream(
+                        {**inputs, "history": cache_ctx["history"]}, config=config, stream_mode=["updates", "custom"]
+                    ):
+                        if mode == "custom":
+                            # 노드가 get_stream_writer()로 보낸 LLM 토큰 (explain_method)
+                            yield {"event": "token", "token": update.get("token", "")}
+                            continue
+
+                        for node, node_state in update.items():
+                            node_state = node_state or {}
+                            yield {
+                                "event": "node",
+                                "node": node,
+                                "stage": node_state.get("stage"),
+                                "response": node_state.get("response", "")
+                            }
+                finally:
+                    self.checkpointer.flush(session_id)
+
+                final_state = self._load_state(config)
+                result = self._build_result(final_state, session_id)
+                await asyncio.to_thread(self._store_cache, cache_ctx, final_state, result)
+                yield {"event": "done", **result}
+
+            except Exception as e:
+                logger.exception("[ERROR] 그래프 스트리밍 오류: %s", e)
+                yield {"event": "error", **self._build_error(e, session_id)}
+
+
+@lru_cache(maxsize=1)
+def get_jira_agent() -> JiraAgent:
+    """
+    전역 JiraAgent 인스턴스 반환
+
+    import 시점이 아니라 첫 호출 시 한 번만 생성 (그래프 컴파일 + Checkpointer 생성)
+    """
+    return JiraAgent()
 
-        try:
-            print(f"[AGENT] 그래프 실행: user_input='{user_input}', session_id={session_id}")
-
-            final_state = self.app.invoke(inputs, config=config)
-
-            # 최종 결과 반환
-            return {
-                "stage": final_state.get("stage", "done"),
-                "message": final_state.get("message", ""),
-                "response": final_state.get("response", ""),
-                "data": final_state.get("data"),
-                "missing_fields": final_state.get("missing_fields", []),
-                "session_id": session_id
-            }
-
-        except Exception as e:
-            print(f"[ERROR] 그래프 실행 오류: {e}")
-            import traceback
-            traceback.print_exc()
-            return {
-                "stage": "done",
-                "message": f"오류가 발생했습니다: {str(e)}",
-                "response": f"오류가 발생했습니다: {str(e)}",
-                "session_id": session_id
-            }
-
-# 전역 인스턴스
-jira_agent = JiraAgent()
 
+def __getattr__(name: str):
+    """`from core.agent_v2 import jira_agent` 호환: 첫 접근 시 get_jira_agent()로 생성"""
+    if name == "jira_agent":
+        return get_jira_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Jira Agent - Cache Utilities
+
+프로세스 내 캐시 구현
+- TTLCache: 만료 시간이 있는 LRU 캐시
+- ttl_cache: TTLCache 기반 함수 결과 캐시 데코레이터
+- SemanticCache: 임베딩 코사인 유사도 기반 근사 캐시
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+
+
+class TTLCache:
+    """만료 시간(ttl)이 있는 LRU 캐시 (thread-safe)"""
+
+    __slots__ = ("maxsize", "ttl", "_data", "_lock")
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            ttl: 항목 유효 시간(초), None이면 만료 없음
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시 조회 (만료된 항목은 제거 후 default 반환)"""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """캐시 저장"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """항목 제거"""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[0] if item is not None else default
+
+    def clear(self) -> None:
+        """전체 삭제"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
+
+
+def ttl_cache(ttl: float, maxsize: int = 128, cache_falsy: bool = True) -> Callable:
+    """
+    함수 결과를 ttl초 동안 캐시하는 데코레이터
+
+    인자(args, kwargs)를 키로 사용하므로 모든 인자는 hashable이어야 합니다.
+    메서드에 쓰면 self도 키에 포함됩니다.
+
+    Args:
+        ttl: 결과 유효 시간(초)
+        maxsize: 최대 항목 수
+        cache_falsy: False면 빈 리스트/None 같은 결과(조회 실패 등)는 캐시하지 않음
+
+    사용 예시:
+        @ttl_cache(ttl=60)
+        def get_projects(self): ...
+
+        get_projects.cache_clear()  # 전체 무효화
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                if value or cache_falsy:
+                    cache.set(key, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+class SemanticCache:
+    """
+    임베딩 코사인 유사도 기반 근사 캐시 (thread-safe)
+
+    정규화된 임베딩을 고정 크기 행렬에 링 버퍼로 저장하고,
+    조회 시 행렬-벡터 곱 한 번으로 가장 유사한 항목을 찾습니다.
+    """
+
+    __slots__ = ("maxsize", "threshold", "ttl", "_vectors", "_values", "_expires", "_size", "_next", "_lock")
+
+    def __init__(self, maxsize: int = 256, threshold: float = 0.95, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: 최대 항목 수 (초과 시 가장 오래된 항목부터 덮어씀)
+            threshold: 적중으로 판단할 최소 코사인 유사도
+            ttl: 항목 유효 시간(초), None이면 만료 없음
+        """
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        self._vectors: Optional[np.ndarray] = None
+        self._values: list = [None] * maxsize
+        self._expires = np.full(maxsize, np.inf)
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if not norm:
+            # 임베딩 실패(영벡터)는 캐시하지 않음
+            return None
+        return vector / norm
+
+    def get(self, embedding, default: Any = None) -> Any:
+        """가장 유사한 항목의 값 반환 (threshold 미만이면 default)"""
+        query = self._normalize(embedding)
+        if query is None:
+            return default
+
+        with self._lock:
+            if not self._size or self._vectors is None or self._vectors.shape[1] != query.shape[0]:
+                return default
+
+            sims = self._vectors[:self._size] @ query
+            sims[self._expires[:self._size] < time.monotonic()] = -1.0
+
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return default
+            return self._values[best]
+
+    def set(self, embedding, value: Any) -> None:
+        """항목 저장"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                self._vectors = np.zeros((self.maxsize, vector.shape[0]), dtype=np.float32)
+                self._size = 0
+                self._next = 0
+
+            idx = self._next
+            self._vectors[idx] = vector
+            self._values[idx] = value
+            self._expires[idx] = time.monotonic() + self.ttl if self.ttl is not None else np.inf
+
+            self._next = (idx + 1) % self.maxsize
+            self._size = min(self._size + 1, self.maxsize)
+
+    def clear(self) -> None:
+        """전체 삭제"""
+        with self._lock:
+            self._values = [None] * self.maxsize
+            self._expires.fill(np.inf)
+            self._size = 0
+            self._next = 0
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Jira Agent - Deferred Checkpointer
+
+MemorySaver는 노드가 끝날 때마다 AgentState 전체를 직렬화해서 저장합니다.
+이 에이전트는 세션 연속성(다음 턴에서 상태 복원)만 필요하므로,
+그래프 실행 중의 체크포인트는 메모리에 모아 두었다가 실행이 끝난 뒤
+마지막 체크포인트 하나만 저장합니다.
+
+트레이드오프: 실행 도중 프로세스가 죽으면 그 턴의 중간 상태는 복구되지 않습니다.
+(다음 요청은 직전 턴이 끝났을 때의 상태에서 시작)
+
+버퍼는 thread_id별이므로 같은 thread_id의 실행이 동시에 돌면 안 됩니다.
+(JiraAgent가 세션별 Lock으로 턴을 직렬화)
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Tuple
+
+from langgraph.checkpoint.memory import MemorySaver
+
+
+class DeferredMemorySaver(MemorySaver):
+    """put/put_writes를 thread_id별로 버퍼링하고 flush() 때 한 번만 저장하는 MemorySaver"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # thread_id → [(config, checkpoint, metadata, new_versions), ...]
+        self._pending: Dict[str, List[Tuple]] = defaultdict(list)
+        # thread_id → [(config, writes, task_id, task_path), ...]
+        self._pending_writes: Dict[str, List[Tuple]] = defaultdict(list)
+        self._pending_lock = threading.Lock()
+
+    def put(self, config: Dict, checkpoint: Dict, metadata: Dict, new_versions: Dict) -> Dict:
+        """체크포인트를 저장하지 않고 버퍼에 추가 (그래프에는 저장된 것처럼 config 반환)"""
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+
+        with self._pending_lock:
+            self._pending[thread_id].append((config, checkpoint, metadata, new_versions))
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(self, config: Dict, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        """중간 쓰기(pending writes)도 버퍼에 추가"""
+        thread_id = config["configurable"]["thread_id"]
+        with self._pending_lock:
+            self._pending_writes[thread_id].append((config, writes, task_id, task_path))
+
+    def flush(self, thread_id: str) -> None:
+        """
+        버퍼에 쌓인 마지막 체크포인트만 실제로 저장
+
+        - 부모 체크포인트는 이번 실행 직전의 체크포인트 (첫 번째 버퍼 config)
+        - 채널 버전은 실행 중 갱신된 채널을 모두 합쳐서 저장
+          (마지막 스텝에서 바뀌지 않은 채널 값도 복원되도록)
+        """
+        with self._pending_lock:
+            pending = self._pending.pop(thread_id, None)
+            pending_writes = self._pending_writes.pop(thread_id, None)
+
+        if not pending:
+            return
+
+        first_config = pending[0][0]
+        _, checkpoint, metadata, _ = pending[-1]
+
+        channel_versions = checkpoint.get("channel_versions", {})
+        new_versions = {}
+        for *_, versions in pending:
+            new_versions.update(versions)
+        new_versions = {k: channel_versions.get(k, v) for k, v in new_versions.items()}
+
+        saved_config = super().put(first_config, checkpoint, metadata, new_versions)
+
+        # 마지막 체크포인트에 속한 pending writes만 저장 (이전 스텝의 것은 이미 반영됨)
+        for config, writes, task_id, task_path in pending_writes or ():
+            if config["configurable"].get("checkpoint_id") == checkpoint["id"]:
+                super().put_writes(saved_config, writes, task_id, task_path)
@@ -14,17 +14,22 @@ config.py - 환경설정
     print(MILVUS_HOST)  # 3.36.185.140
 """
 
+import logging
 import os
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 import requests
 
 # .env 로드 (Jira 디렉토리의 .env 파일)
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
+logger = logging.getLogger(__name__)
+
 # ─────────────────────────────────────────────────────────
 # 유틸
 # ─────────────────────────────────────────────────────────
@@ -50,6 +55,13 @@ OPENAI_API_KEY: str = (os.getenv("OPENAI_API_KEY") or "").strip()
 EMBED_MODEL: str = (os.getenv("EMBED_MODEL") or "text-embedding-3-small").strip()
 EMBED_DIM: int = int(os.getenv("EMBED_DIM", "1536"))
 EMBED_BATCH_SIZE: int = int(os.getenv("EMBED_BATCH_SIZE", "50"))
+# 배치가 여러 개일 때 동시에 보낼 임베딩 요청 수 (OpenAI rate limit 고려)
+EMBED_CONCURRENCY: int = int(os.getenv("EMBED_CONCURRENCY", "5"))
+# 검색 쿼리 임베딩 프로세스 내 LRU 크기
+QUERY_EMBED_CACHE_SIZE: int = int(os.getenv("QUERY_EMBED_CACHE_SIZE", "2048"))
+# 임베딩 영구 캐시 (SQLite, 텍스트가 같으면 API 호출 생략)
+EMBED_CACHE_ENABLED: bool = os.getenv("EMBED_CACHE_ENABLED", "true").lower() == "true"
+EMBED_CACHE_PATH: str = (os.getenv("EMBED_CACHE_PATH") or str(Path(__file__).parent.parent / ".embedding_cache.sqlite3")).strip()
 
 # Chat
 CHAT_MODEL: str = (os.getenv("CHAT_MODEL") or "gpt-4o-mini").strip()
@@ -62,18 +74,117 @@ CHAT_MAX_TOKENS: int = int(os.getenv("CHAT_MAX_TOKENS", "2048"))
 MILVUS_HOST: str = (os.getenv("MILVUS_HOST") or "3.36.185.140").strip()
 MILVUS_PORT: int = int(os.getenv("MILVUS_PORT", "19530"))
 MILVUS_COLLECTION: str = (os.getenv("MILVUS_COLLECTION") or "jira_issues").strip()
+# 이슈 컬렉션 벡터 인덱스: auto | IVF_SQ8 | IVF_FLAT | HNSW
+# auto는 예상(또는 현재) 이슈 수가 100만 건을 넘으면 HNSW, 아니면 IVF_SQ8(nlist=√N, INT8 양자화)
+MILVUS_INDEX_TYPE: str = (os.getenv("MILVUS_INDEX_TYPE") or "auto").strip().upper()
+MILVUS_EXPECTED_ENTITIES: int = int(os.getenv("MILVUS_EXPECTED_ENTITIES", "0"))
+# 새 컬렉션의 거리 척도 (임베딩을 L2 정규화해서 저장하므로 IP = 코사인 유사도)
+# 기존 컬렉션은 인덱스에 저장된 척도를 그대로 사용
+MILVUS_METRIC_TYPE: str = (os.getenv("MILVUS_METRIC_TYPE") or "IP").strip().upper()
+MILVUS_IVF_NLIST: int = int(os.getenv("MILVUS_IVF_NLIST", "0"))  # 0이면 max(128, √N)
+MILVUS_HNSW_M: int = int(os.getenv("MILVUS_HNSW_M", "16"))
+MILVUS_HNSW_EF_CONSTRUCTION: int = int(os.getenv("MILVUS_HNSW_EF_CONSTRUCTION", "200"))
 
 # ─────────────────────────────────────────────────────────
 # Webhook 설정
 # ─────────────────────────────────────────────────────────
 WEBHOOK_URL: str = (os.getenv("WEBHOOK_URL") or "").strip()
 WEBHOOK_AUTO_REGISTER: bool = os.getenv("WEBHOOK_AUTO_REGISTER", "false").lower() == "true"
+# 웹훅 이벤트를 모아서 Milvus에 반영하는 배치 크기 / 최대 대기 시간
+WEBHOOK_BATCH_SIZE: int = int(os.getenv("WEBHOOK_BATCH_SIZE", "100"))
+WEBHOOK_FLUSH_INTERVAL_MS: int = int(os.getenv("WEBHOOK_FLUSH_INTERVAL_MS", "200"))
+# (issue_key, updated) 기준 이슈 캐시 (연속 이벤트의 Jira 재조회 방지)
+WEBHOOK_ISSUE_CACHE_SIZE: int = int(os.getenv("WEBHOOK_ISSUE_CACHE_SIZE", "10000"))
+WEBHOOK_ISSUE_CACHE_TTL: int = int(os.getenv("WEBHOOK_ISSUE_CACHE_TTL", "60"))
+
+# ─────────────────────────────────────────────────────────
+# API 서버 설정
+# ─────────────────────────────────────────────────────────
+API_HOST: str = (os.getenv("API_HOST") or "0.0.0.0").strip()
+API_PORT: int = int(os.getenv("API_PORT", "8000"))
+# 기본 1개: 대화 상태(Checkpointer)와 응답/검색/메타데이터 캐시가 프로세스 메모리에 있어서
+# 워커가 여러 개면 clarify/approve/int_candidate 다음 턴이 다른 워커로 가서 진행 중인 작업이 사라짐
+# (공유 Checkpointer(Redis/Postgres) 또는 sticky session을 쓸 때만 늘릴 것)
+API_WORKERS: int = int(os.getenv("API_WORKERS", "1"))
+# 여러 워커 중 하나만 웹훅을 등록하도록 잡는 파일 락
+STARTUP_LOCK_PATH: str = (os.getenv("STARTUP_LOCK_PATH") or "/tmp/jira_webhook.lock").strip()
+# /chat 요청에 latency_budget이 없을 때 쓰는 벡터 검색 예산 (fast | balanced | accurate)
+CHAT_LATENCY_BUDGET: str = (os.getenv("CHAT_LATENCY_BUDGET") or "fast").strip()
+# 허용할 CORS origin 목록 (쉼표 구분, 예: "https://app.example.com,http://localhost:3000")
+CORS_ALLOW_ORIGINS: List[str] = [
+    o.strip() for o in (os.getenv("CORS_ALLOW_ORIGINS") or "http://localhost:3000").split(",") if o.strip()
+]
+CORS_MAX_AGE: int = int(os.getenv("CORS_MAX_AGE", "86400"))
+
+# ─────────────────────────────────────────────────────────
+# 로깅 설정
+# ─────────────────────────────────────────────────────────
+# 전체 로그 레벨 (DEBUG | INFO | WARNING | ERROR), DEBUG가 아니면 상세 로그 문자열은 만들지 않음
+LOG_LEVEL: str = (os.getenv("LOG_LEVEL") or "INFO").strip().upper()
+
+# ─────────────────────────────────────────────────────────
+# 응답 캐시 설정
+# ─────────────────────────────────────────────────────────
+RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+# parse_intent LLM 응답 캐시 (같은 프롬프트 + 같은 입력이면 API 호출 없이 재사용)
+PARSE_CACHE_SIZE: int = int(os.getenv("PARSE_CACHE_SIZE", "2048"))
+# 같은 (키워드, 필터, 개수) Milvus 검색 결과 캐시
+SEARCH_CACHE_SIZE: int = int(os.getenv("SEARCH_CACHE_SIZE", "128"))
+SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL", "30"))
+# 의미가 거의 같은 검색어의 검색 결과 재사용 (코사인 유사도 기준, 유효 시간은 SEARCH_CACHE_TTL)
+# 0.9 안팎에서는 "로그인 버그"/"로그아웃 버그"처럼 다른 검색어도 적중하므로 표현 차이 정도만 허용
+SEARCH_SEMANTIC_CACHE_SIZE: int = int(os.getenv("SEARCH_SEMANTIC_CACHE_SIZE", "256"))
+SEARCH_SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEARCH_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+# Jira 프로젝트/이슈 타입 메타데이터 캐시 유효 시간(초)
+PROJECT_METADATA_TTL: int = int(os.getenv("PROJECT_METADATA_TTL", "600"))
+# 워커 간 공유 시맨틱 캐시 (Milvus HNSW 컬렉션)
+CHAT_CACHE_ENABLED: bool = os.getenv("CHAT_CACHE_ENABLED", "true").lower() == "true"
+CHAT_CACHE_COLLECTION: str = (os.getenv("CHAT_CACHE_COLLECTION") or "chat_cache").strip()
+CHAT_CACHE_THRESHOLD: float = float(os.getenv("CHAT_CACHE_THRESHOLD", "0.97"))
+CHAT_CACHE_HNSW_M: int = int(os.getenv("CHAT_CACHE_HNSW_M", "16"))
+CHAT_CACHE_HNSW_EF_CONSTRUCTION: int = int(os.getenv("CHAT_CACHE_HNSW_EF_CONSTRUCTION", "200"))
+CHAT_CACHE_HNSW_EF: int = int(os.getenv("CHAT_CACHE_HNSW_EF", "64"))
+
+# ─────────────────────────────────────────────────────────
+# HTTP 커넥션 풀 설정
+# ─────────────────────────────────────────────────────────
+# 호스트 수 / 호스트당 keep-alive 커넥션 수 (API 서버 스레드 풀 크기 이상으로 잡아 풀 대기가 없도록)
+HTTP_POOL_CONNECTIONS: int = int(os.getenv("HTTP_POOL_CONNECTIONS", "20"))
+HTTP_POOL_MAXSIZE: int = int(os.getenv("HTTP_POOL_MAXSIZE", "50"))
+
+# 일시적 오류(429/5xx) 재시도 정책
+# POST(이슈 생성, 웹훅 등록)는 재시도하면 중복 생성될 수 있어 제외
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(["GET", "PUT", "DELETE"]),
+    raise_on_status=False  # 재시도 후에도 실패하면 마지막 응답을 그대로 반환
+)
+
+
+def create_session() -> requests.Session:
+    """keep-alive 커넥션 풀 + 재시도 정책을 가진 세션 생성"""
+    session = requests.Session()
+    session.trust_env = False
+
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=HTTP_RETRY
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
 
 # ─────────────────────────────────────────────────────────
 # 공용 객체
 # ─────────────────────────────────────────────────────────
-SESSION = requests.Session()
-SESSION.trust_env = False
+# 프로세스 전체에서 공유하는 HTTP 세션 (JiraClient도 이 세션을 사용)
+SESSION = create_session()
 
 AUTH = HTTPBasicAuth(JIRA_EMAIL, JIRA_API_TOKEN)
 
@@ -106,11 +217,11 @@ def assert_env(strict: bool = False) -> None:
     
     # OpenAI (경고만)
     if not OPENAI_API_KEY:
-        print("[경고] OPENAI_API_KEY가 없습니다. LLM 기능 비활성화됩니다.")
+        logger.warning("[경고] OPENAI_API_KEY가 없습니다. LLM 기능 비활성화됩니다.")
     
     # Milvus (경고만)
     if MILVUS_HOST == "3.36.185.140":
-        print(f"[정보] Milvus 연결: {MILVUS_HOST}:{MILVUS_PORT}")
+        logger.info("[정보] Milvus 연결: %s:%s", MILVUS_HOST, MILVUS_PORT)
     
     if problems:
         raise SystemExit("환경변수 오류:\n- " + "\n- ".join(problems))
@@ -130,7 +241,7 @@ def assert_env(strict: bool = False) -> None:
             )
         
         user = r.json()
-        print(f"[Jira 인증 성공] {user.get('displayName')} ({user.get('emailAddress')})")
+        logger.info("[Jira 인증 성공] %s (%s)", user.get('displayName'), user.get('emailAddress'))
 
 # ─────────────────────────────────────────────────────────
 # 디버그
@@ -151,4 +262,4 @@ if __name__ != "__main__":
     try:
         assert_env(strict=False)
     except SystemExit as e:
-        print(f"[설정 오류] {e}")
\ No newline at end of file
+        logger.error("[설정 오류] %s", e)
\ No newline at end of file
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Jira Agent - Embedding Cache
+
+SQLite 기반 임베딩 영구 캐시
+- 키: sha256(EMBED_MODEL + "|" + text) → 모델이 바뀌면 자동으로 다른 키
+- 값: float16 벡터 바이트 (np.ndarray.tobytes(), 정규화된 1536차원 임베딩이라 정밀도 손실 무시 가능)
+
+내용이 바뀌지 않은 이슈를 다시 동기화할 때 OpenAI 임베딩 호출을 건너뜁니다.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+# 벡터 저장 형식 (float32 대비 크기 절반)
+_VECTOR_DTYPE = np.float16
+
+# SQLite 바인딩 변수 개수 제한(기본 999)보다 작게 IN 절을 나눔
+_SELECT_CHUNK = 500
+
+
+class EmbeddingCache:
+    """텍스트 해시 → 임베딩 벡터 영구 캐시 (thread-safe)"""
+
+    def __init__(self, path: str, model: str):
+        """
+        Args:
+            path: SQLite 파일 경로
+            model: 임베딩 모델 이름 (키에 포함)
+        """
+        self.model = model
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings_f16 (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+
+    def key(self, text: str) -> str:
+        """캐시 키 (모델 이름 + 텍스트의 sha256)"""
+        return hashlib.sha256(f"{self.model}|{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """여러 키를 한 번에 조회 (없는 키는 결과에 없음)"""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[float]] = {}
+
+        with self._lock:
+            for start in range(0, len(keys), _SELECT_CHUNK):
+                chunk = keys[start:start + _SELECT_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM embeddings_f16 WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=_VECTOR_DTYPE).astype(np.float32).tolist()
+
+        return found
+
+    def set_many(self, items: Iterable[Tuple[str, List[float]]]) -> None:
+        """여러 항목 저장 (영벡터 = 임베딩 실패는 저장하지 않음)"""
+        rows = [
+            (key, np.asarray(vector, dtype=_VECTOR_DTYPE).tobytes())
+            for key, vector in items
+            if np.any(vector)
+        ]
+        if not rows:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings_f16 (key, vec) VALUES (?, ?)", rows)
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
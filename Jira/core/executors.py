@@ -6,10 +6,33 @@ Jira Agent - Execution Functions
 실제 Jira/Milvus 작업 실행 함수들
 """
 
-from typing import Dict, Optional
+import atexit
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 from core.jira import jira_client
-from core.milvus_client import milvus_client
+from core.milvus_client import get_milvus_client
+from core.cache import ttl_cache
+from core.utils import DEFAULT_SEARCH_LIMIT
+from core.config import SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+# 검색 필터로 쓰는 (슬롯 이름, Milvus 컬럼) 쌍
+# LLM 파싱 결과의 이슈 유형 슬롯은 "issuetype"이고 Milvus 컬럼은 "issue_type"
+_FILTER_FIELDS = (
+    ("project_key", "project_key"),
+    ("priority", "priority"),
+    ("issuetype", "issue_type"),
+    ("assignee", "assignee"),
+)
+
+# Milvus 동기화는 사용자 응답과 무관한 후속 작업이므로 백그라운드에서 실행
+_BG = ThreadPoolExecutor(max_workers=2, thread_name_prefix="milvus-sync")
+# 프로세스 종료 시 남은 동기화 작업을 마저 처리
+atexit.register(_BG.shutdown, wait=True)
 
 
 # ─────────────────────────────────────────────────────────
@@ -17,59 +40,94 @@ from core.milvus_client import milvus_client
 # ─────────────────────────────────────────────────────────
 
 def build_milvus_filter(slots: Dict) -> Optional[str]:
-    """슬롯에서 Milvus 필터 표현식 생성"""
+    """슬롯에서 Milvus 필터 표현식 생성 (값의 작은따옴표는 이스케이프)"""
+    # 필터에 쓰는 슬롯 값만 튜플로 뽑아서 캐시 키로 사용 (summary 등 나머지 슬롯은 무관)
+    return _filter_expr(tuple(
+        str(slots[slot]) if slots.get(slot) else None
+        for slot, _ in _FILTER_FIELDS
+    ))
+
+
+@lru_cache(maxsize=512)
+def _filter_expr(values: Tuple[Optional[str], ...]) -> Optional[str]:
+    """_FILTER_FIELDS 순서의 슬롯 값 → 필터 표현식 (같은 조건이면 문자열 조립/이스케이프 생략)"""
     filters = []
 
-    if slots.get("project_key"):
-        filters.append(f"project_key == '{slots['project_key']}'")
+    for (_, column), value in zip(_FILTER_FIELDS, values):
+        if value:
+            value = value.replace("\\", "\\\\").replace("'", "\\'")
+            filters.append(f"{column} == '{value}'")
+
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return " && ".join(filters)
+
+
+@ttl_cache(ttl=SEARCH_CACHE_TTL, maxsize=SEARCH_CACHE_SIZE, cache_falsy=False)
+def _milvus_search(query_text: str, filter_expr: Optional[str], limit: int, latency_budget: Optional[str]) -> List[Dict]:
+    """
+    Milvus 검색 (같은 조건의 반복 검색은 SEARCH_CACHE_TTL 동안 캐시, 빈 결과는 캐시하지 않음)
+
+    검색어가 없으면 벡터 검색 대신 필터 조회 (더미 검색어 임베딩 + 의미 없는 유사도 정렬 생략)
+    """
+    if not query_text:
+        return get_milvus_client().query(filter_expr, limit=limit)
+    return get_milvus_client().search(
+        query_text=query_text,
+        filter_expr=filter_expr,
+        limit=limit,
+        latency_budget=latency_budget
+    )
 
-    if slots.get("priority"):
-        filters.append(f"priority == '{slots['priority']}'")
 
-    if slots.get("issue_type"):
-        filters.append(f"issue_type == '{slots['issue_type']}'")
+def invalidate_search_cache() -> None:
+    """검색 결과 캐시 무효화 (이슈 생성/수정/삭제, 웹훅 반영 후 호출)"""
+    _milvus_search.cache_clear()
+    get_milvus_client().clear_search_cache()
 
-    if slots.get("assignee"):
-        filters.append(f"assignee == '{slots['assignee']}'")
 
-    return " && ".join(filters) if filters else None
+def _sync_issue(issue: Dict) -> None:
+    """Milvus에 이슈 반영 후 검색 캐시 무효화 (백그라운드 실행)"""
+    get_milvus_client().upsert_issues([issue])
+    invalidate_search_cache()
 
 
-def execute_search(slots: Dict) -> Dict:
+def execute_search(slots: Dict, latency_budget: Optional[str] = None) -> Dict:
     """검색 실행"""
     keyword = slots.get("keyword", "")
-    limit = slots.get("limit", 10)
-
-    # 숫자 추출 (예: "3개" -> 3)
-    if isinstance(limit, str):
-        import re
-        match = re.search(r'\d+', limit)
-        limit = int(match.group()) if match else 10
+    # limit은 파싱 단계(parse_intent/clarify)에서 int로 변환됨
+    limit = slots.get("limit") or DEFAULT_SEARCH_LIMIT
+    assert isinstance(limit, int), f"limit must be int, got {limit!r}"
 
     # Milvus 하이브리드 검색
     filter_expr = build_milvus_filter(slots)
 
-    print(f"[SEARCH] keyword: '{keyword}', filter: {filter_expr}, limit: {limit}")
+    logger.debug("[SEARCH] keyword: '%s', filter: %s, limit: %s", keyword, filter_expr, limit)
 
-    results = milvus_client.search(
-        query_text=keyword if keyword else "이슈",
-        filter_expr=filter_expr,
-        limit=max(limit, 50)
-    )
+    # 요청 개수 + 1개만 가져와서 더 있는지만 확인 (불필요한 벡터 전송 방지)
+    results = _milvus_search(keyword, filter_expr, limit + 1, latency_budget)
+    has_more = len(results) > limit
+    results = results[:limit]
 
     if results:
-        display_results = results[:limit]
-        response = f"🔍 {len(results)}개의 이슈를 찾았습니다 (상위 {len(display_results)}개 표시):\n\n"
-        for i, result in enumerate(display_results, 1):
-            response += f"[{i}] {result['key']}: {result['summary']}\n"
-            response += f"    - 프로젝트: {result['project']}, 상태: {result['status']}\n"
+        found = f"{limit}개 이상" if has_more else f"{len(results)}개"
+        parts = [f"🔍 {found}의 이슈를 찾았습니다 (상위 {len(results)}개 표시):", ""]
+
+        for i, result in enumerate(results, 1):
+            parts.append(f"[{i}] {result['key']}: {result['summary']}")
+            parts.append(f"    - 프로젝트: {result['project']}, 상태: {result['status']}")
 
             priority = result.get('priority', 'NaN')
             duedate = result.get('duedate', 'NaN')
-            response += f"    - 우선순위: {priority}, 마감일: {duedate}\n"
+            parts.append(f"    - 우선순위: {priority}, 마감일: {duedate}")
 
             if result.get('assignee'):
-                response += f"    - 담당자: {result['assignee']}\n"
+                parts.append(f"    - 담당자: {result['assignee']}")
+
+        # 기존 형식과 같이 마지막 줄도 줄바꿈으로 끝냄
+        response = "\n".join(parts) + "\n"
     else:
         response = "검색 결과가 없습니다."
 
@@ -96,14 +154,14 @@ def execute_create(slots: Dict) -> Dict:
         issue_key = result.get("key")
         response = f"✅ 이슈 생성 완료: {issue_key}"
 
-        # Milvus 동기화
-        jql = f"key = {issue_key}"
-        issues = jira_client.search_issues(jql, max_results=1)
-        if issues:
-            milvus_client.upsert_issues(issues)
-            response += "\n(Milvus 동기화 완료)"
+        # Milvus 동기화 (JQL 검색 대신 단건 조회 API 사용, 저장은 백그라운드)
+        invalidate_search_cache()
+        issue = jira_client.get_issue(issue_key)
+        if issue:
+            _BG.submit(_sync_issue, issue)
+            response += "\n(Milvus 동기화 진행 중)"
 
-        data = {"key": issue_key, "issue": issues[0] if issues else None}
+        data = {"key": issue_key, "issue": issue}
     else:
         response = f"❌ 이슈 생성 실패: {result.get('detail')}"
         data = None
@@ -130,14 +188,14 @@ def execute_update(slots: Dict) -> Dict:
     if result.get("ok"):
         response = f"✅ {issue_key} 수정 완료"
 
-        # Milvus 동기화
-        jql = f"key = {issue_key}"
-        issues = jira_client.search_issues(jql, max_results=1)
-        if issues:
-            milvus_client.upsert_issues(issues)
-            response += "\n(Milvus 동기화 완료)"
+        # Milvus 동기화 (JQL 검색 대신 단건 조회 API 사용, 저장은 백그라운드)
+        invalidate_search_cache()
+        issue = jira_client.get_issue(issue_key)
+        if issue:
+            _BG.submit(_sync_issue, issue)
+            response += "\n(Milvus 동기화 진행 중)"
 
-        data = {"key": issue_key, "issue": issues[0] if issues else None}
+        data = {"key": issue_key, "issue": issue}
     else:
         response = f"❌ 수정 실패: {result.get('detail')}"
         data = None
@@ -157,6 +215,7 @@ def execute_delete(slots: Dict) -> Dict:
 
     if result.get("ok"):
         response = f"✅ {issue_key} 삭제 완료"
+        invalidate_search_cache()
         data = {"key": issue_key}
     else:
         response = f"❌ 삭제 실패: {result.get('detail')}"
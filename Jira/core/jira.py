@@ -1,43 +1,136 @@
 """
 Jira REST API 래퍼
 """
+import logging
 import requests
+from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
-from core.config import JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN
-from core.utils import format_jira_issue
+from core.config import JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN, PROJECT_METADATA_TTL, SESSION
+from core.utils import format_jira_issue, dumps_json_bytes, loads_json
+from core.cache import TTLCache, ttl_cache
+
+logger = logging.getLogger(__name__)
+
+
+# 이슈 조회 필드
+# - FULL: Milvus 동기화용 (description은 ADF JSON이라 응답이 큼)
+# - SLIM: 검색 결과 표시용 (format_jira_issue가 쓰는 요약 필드 + 포맷 캐시 키용 updated)
+ISSUE_FIELDS_FULL = "summary,status,assignee,created,updated,issuetype,priority,duedate,description"
+ISSUE_FIELDS_SLIM = "summary,status,assignee,updated,issuetype,priority,duedate"
+
+# 프로젝트 페이지(/project/search) 동시 조회 수
+ISSUE_TYPE_PAGE_WORKERS = 8
+# 전체 이슈 타입 조회 실패 시 기본값 (캐시하지 않고 매번 반환, 다음 호출에서 재조회)
+DEFAULT_ISSUE_TYPES = ("Task", "Bug", "Story")
+
+# format_jira_issue 결과 캐시 크기 ((이슈 id, updated, 조회 필드) 기준)
+FORMATTED_ISSUE_CACHE_SIZE = 4096
+
+_formatted_issue_cache = TTLCache(maxsize=FORMATTED_ISSUE_CACHE_SIZE)
+
+
+def format_issue_cached(issue: Dict, fields: str) -> Dict:
+    """
+    format_jira_issue 결과를 (id, updated, fields) 기준으로 재사용
+
+    updated가 같으면 내용도 같으므로 중첩 JSON을 다시 풀지 않습니다.
+    조회 필드가 다르면 결과(description 유무 등)가 달라서 키에 포함합니다.
+    updated가 없는 응답은 캐시하지 않습니다.
+    """
+    updated = (issue.get("fields") or {}).get("updated")
+    if updated is None:
+        return format_jira_issue(issue)
+
+    key = (issue.get("id"), updated, fields)
+    formatted = _formatted_issue_cache.get(key)
+    if formatted is None:
+        formatted = format_jira_issue(issue)
+        _formatted_issue_cache.set(key, formatted)
+    return formatted
 
 
 class JiraClient:
     """Jira REST API 클라이언트"""
 
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
+        """
+        Args:
+            session: 사용할 HTTP 세션 (없으면 config.SESSION 공유 커넥션 풀 사용)
+        """
         # base_url이 /로 끝나지 않으면 추가
         self.base_url = JIRA_BASE_URL if JIRA_BASE_URL.endswith('/') else f"{JIRA_BASE_URL}/"
+
+        # 엔드포인트 URL은 한 번만 만들어 둠 (urljoin으로 슬래시 중복 방지)
+        self._search_url = urljoin(self.base_url, "rest/api/3/search/jql")
+        self._issue_url = urljoin(self.base_url, "rest/api/3/issue")
+        self._project_url = urljoin(self.base_url, "rest/api/3/project")
+        self._project_search_url = urljoin(self.base_url, "rest/api/3/project/search")
+        self._issuetype_url = urljoin(self.base_url, "rest/api/3/issuetype")
+        self._webhook_url = urljoin(self.base_url, "rest/webhooks/1.0/webhook")
         self.auth = (JIRA_EMAIL, JIRA_API_TOKEN)
         self.headers = {"Content-Type": "application/json"}
 
-    def search_issues(self, jql: str, max_results: int = 50) -> List[Dict]:
-        """이슈 검색"""
-        url = f"{self.base_url}rest/api/3/search/jql"
+        # 모든 요청이 같은 세션을 써서 TCP/TLS 연결을 재사용
+        self.session = session or SESSION
+        self.session.auth = self.auth
+        self.session.headers.update(self.headers)
+
+    def close(self) -> None:
+        """세션의 커넥션 풀 정리"""
+        self.session.close()
+
+    def invalidate(self) -> None:
+        """프로젝트/이슈 타입 조회 캐시 무효화"""
+        JiraClient.get_projects.cache_clear()
+        JiraClient.get_issue_types.cache_clear()
+        JiraClient._fetch_all_issue_types.cache_clear()
+
+    def search_issues(self, jql: str, max_results: int = 50, fields: Optional[str] = None) -> List[Dict]:
+        """
+        이슈 검색
+
+        Args:
+            jql: JQL 쿼리
+            max_results: 최대 결과 수
+            fields: 조회할 필드 (쉼표 구분, None이면 ISSUE_FIELDS_SLIM)
+        """
+        url = self._search_url
+        fields = fields or ISSUE_FIELDS_SLIM
         params = {
             "jql": jql,
             "maxResults": max_results,
-            "fields": "summary,status,assignee,created,updated,issuetype,priority,duedate,description"
+            "fields": fields
         }
 
         try:
-            response = requests.get(url, auth=self.auth, params=params, timeout=10)
+            response = self.session.get(url, auth=self.auth, params=params, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
+            data = loads_json(response.content)
             issues = data.get("issues", [])
 
-            return [format_jira_issue(issue) for issue in issues]
+            return [format_issue_cached(issue, fields) for issue in issues]
 
-        except requests.RequestException as e:
-            print(f"[Jira] 검색 오류: {e}")
+        except (requests.RequestException, ValueError) as e:
+            logger.error("[Jira] 검색 오류: %s", e)
             return []
 
+    def get_issue(self, issue_key: str) -> Optional[Dict]:
+        """단일 이슈 조회"""
+        url = f"{self._issue_url}/{issue_key}"
+        params = {"fields": ISSUE_FIELDS_FULL}
+
+        try:
+            response = self.session.get(url, auth=self.auth, params=params, timeout=10)
+            response.raise_for_status()
+
+            return format_issue_cached(loads_json(response.content), ISSUE_FIELDS_FULL)
+
+        except (requests.RequestException, ValueError) as e:
+            logger.error("[Jira] 이슈 조회 오류: %s", e)
+            return None
+
     def create_issue(
         self,
         project_key: str,
@@ -60,7 +153,7 @@ class JiraClient:
             priority: 중요도 (예: High, Medium, Low) (선택)
             duedate: 마감 날짜 YYYY-MM-DD 형식 (선택)
         """
-        url = f"{self.base_url}/rest/api/3/issue"
+        url = self._issue_url
 
         payload = {
             "fields": {
@@ -94,26 +187,26 @@ class JiraClient:
             payload["fields"]["duedate"] = duedate
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
                 auth=self.auth,
                 headers=self.headers,
-                json=payload,
+                data=dumps_json_bytes(payload),
                 timeout=10
             )
 
             if response.status_code == 201:
-                data = response.json()
+                data = loads_json(response.content)
                 return {"ok": True, "key": data.get("key")}
             else:
                 return {"ok": False, "detail": response.text}
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             return {"ok": False, "detail": str(e)}
 
     def update_issue(self, issue_key: str, fields: Dict) -> Dict:
         """이슈 수정"""
-        url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
+        url = f"{self._issue_url}/{issue_key}"
 
         payload = {"fields": {}}
 
@@ -133,11 +226,11 @@ class JiraClient:
             }
 
         try:
-            response = requests.put(
+            response = self.session.put(
                 url,
                 auth=self.auth,
                 headers=self.headers,
-                json=payload,
+                data=dumps_json_bytes(payload),
                 timeout=10
             )
 
@@ -151,10 +244,10 @@ class JiraClient:
 
     def delete_issue(self, issue_key: str) -> Dict:
         """이슈 삭제"""
-        url = f"{self.base_url}/rest/api/3/issue/{issue_key}"
+        url = f"{self._issue_url}/{issue_key}"
 
         try:
-            response = requests.delete(url, auth=self.auth, timeout=10)
+            response = self.session.delete(url, auth=self.auth, timeout=10)
 
             if response.status_code == 204:
                 return {"ok": True, "key": issue_key}
@@ -164,75 +257,103 @@ class JiraClient:
         except requests.RequestException as e:
             return {"ok": False, "detail": str(e)}
 
+    @ttl_cache(ttl=PROJECT_METADATA_TTL, cache_falsy=False)
     def get_projects(self) -> List[Dict]:
-        """프로젝트 목록"""
-        url = f"{self.base_url}/rest/api/3/project"
+        """프로젝트 목록 (캐시, 조회 실패는 캐시하지 않음)"""
+        url = self._project_url
 
         try:
-            response = requests.get(url, auth=self.auth, timeout=10)
+            response = self.session.get(url, auth=self.auth, timeout=10)
             response.raise_for_status()
 
-            projects = response.json()
+            projects = loads_json(response.content)
             return [{"key": p.get("key"), "name": p.get("name")} for p in projects]
 
-        except requests.RequestException as e:
-            print(f"[Jira] 프로젝트 조회 오류: {e}")
+        except (requests.RequestException, ValueError) as e:
+            logger.error("[Jira] 프로젝트 조회 오류: %s", e)
             return []
 
+    def _get_project_page(self, start_at: int, max_results: int) -> Dict:
+        """/project/search 한 페이지 조회 (issueTypes 포함)"""
+        url = self._project_search_url
+        params = {"startAt": start_at, "maxResults": max_results, "expand": "issueTypes"}
+
+        response = self.session.get(url, auth=self.auth, params=params, timeout=10)
+        response.raise_for_status()
+        return loads_json(response.content)
+
+    @ttl_cache(ttl=PROJECT_METADATA_TTL, cache_falsy=False)
     def get_issue_types(self):
+        """
+        프로젝트별 이슈 타입 목록 {project_key: [issue_types]} (캐시)
 
+        일부 페이지만 받은 결과는 캐시에 남지 않도록 조회 중 오류가 나면 빈 dict를 반환합니다
+        (빈 결과는 캐시되지 않아 다음 호출에서 재조회).
+        """
         project_issue_map = {}
-        start_at = 0
         max_results = 50  # 한 페이지에 50개씩 가져오기
 
+        def collect(page: Dict) -> None:
+            # API 응답에 이미 포함된 'issueTypes'를 바로 사용 (추가 API 호출 없음)
+            for project in page.get("values", []):
+                project_issue_map[project.get('key')] = [
+                    it.get('name') for it in project.get("issueTypes", []) if it.get('name')
+                ]
 
-        while True:
-            # 1. /search 엔드포인트를 사용해 '페이지' 단위로 프로젝트를 가져옵니다.
-            url = f"{JIRA_BASE_URL}/rest/api/3/project/search?startAt={start_at}&maxResults={max_results}&expand=issueTypes"    
-            try:
-                response = requests.get(url, auth=self.auth, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-
-                # 2. 현재 페이지의 프로젝트 목록(values)을 순회합니다.
-                projects_on_page = data.get("values", [])
-                if not projects_on_page:
-                    break  # 더 이상 가져올 프로젝트가 없으면 중지
-
-                for project in projects_on_page:
-                    project_key = project.get('key')
-                    
-                    # 3. API 응답에 이미 포함된 'issueTypes'를 바로 사용합니다. (추가 API 호출 없음)
-                    issue_types = [it.get('name') for it in project.get("issueTypes", []) if it.get('name')]
-                    
-                    project_issue_map[project_key] = issue_types
-
-                # 4. 마지막 페이지인지 확인합니다.
-                if data.get("isLast", True):
-                    break  # 마지막 페이지면 루프 종료
-                else:
-                    # 5. 다음 페이지를 가져오기 위해 startAt을 업데이트합니다.
-                    start_at += len(projects_on_page)
-
-            except requests.RequestException as e:
-                break  # 오류 발생 시 중지
+        try:
+            # 1. 첫 페이지로 전체 개수(total)와 실제 페이지 크기 확인
+            first = self._get_project_page(0, max_results)
+            collect(first)
+
+            page_size = len(first.get("values", []))
+            if first.get("isLast", True) or not page_size:
+                return project_issue_map
+
+            total = first.get("total")
+            if total is not None:
+                # 2. 나머지 페이지를 동시에 조회
+                offsets = range(page_size, total, page_size)
+                with ThreadPoolExecutor(max_workers=ISSUE_TYPE_PAGE_WORKERS) as pool:
+                    for page in pool.map(lambda start: self._get_project_page(start, page_size), offsets):
+                        collect(page)
+            else:
+                # total이 없으면 isLast가 나올 때까지 순차 조회
+                start_at = page_size
+                while True:
+                    page = self._get_project_page(start_at, max_results)
+                    values = page.get("values", [])
+                    if not values:
+                        break
+                    collect(page)
+                    if page.get("isLast", True):
+                        break
+                    start_at += len(values)
+
+        except (requests.RequestException, ValueError) as e:
+            logger.error("[Jira] 이슈 타입 조회 오류: %s", e)
+            return {}
 
         return project_issue_map
 
     def get_all_issue_types(self) -> List[str]:
-        """모든 이슈 타입 목록"""
-        url = f"{self.base_url}/rest/api/3/issuetype"
+        """모든 이슈 타입 목록 (조회 실패 시 기본값, 기본값은 캐시하지 않음)"""
+        return self._fetch_all_issue_types() or list(DEFAULT_ISSUE_TYPES)
+
+    @ttl_cache(ttl=PROJECT_METADATA_TTL, cache_falsy=False)
+    def _fetch_all_issue_types(self) -> List[str]:
+        """모든 이슈 타입 목록 (캐시, 실패 시 캐시되지 않는 빈 목록)"""
+        url = self._issuetype_url
 
         try:
-            response = requests.get(url, auth=self.auth, timeout=10)
+            response = self.session.get(url, auth=self.auth, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
+            data = loads_json(response.content)
             return [it["name"] for it in data if not it.get("subtask", False)]
 
-        except requests.RequestException as e:
-            print(f"[Jira] 전체 이슈 타입 조회 오류: {e}")
-            return ["Task", "Bug", "Story"]
+        except (requests.RequestException, ValueError) as e:
+            logger.error("[Jira] 전체 이슈 타입 조회 오류: %s", e)
+            return []
 
     def register_webhook(self, webhook_url: str, webhook_name: str = "Jira Agent Webhook") -> bool:
         """
@@ -245,22 +366,22 @@ class JiraClient:
         Returns:
             성공 여부
         """
-        url = f"{self.base_url}rest/webhooks/1.0/webhook"
+        url = self._webhook_url
 
         # 기존 웹훅 확인
         try:
-            response = requests.get(url, auth=self.auth, timeout=10)
+            response = self.session.get(url, auth=self.auth, timeout=10)
             response.raise_for_status()
-            existing_webhooks = response.json()
+            existing_webhooks = loads_json(response.content)
 
             # 동일한 URL의 웹훅이 이미 있는지 확인
             for webhook in existing_webhooks:
                 if webhook.get("url") == webhook_url:
-                    print(f"[Jira Webhook] 이미 등록되어 있음: {webhook_url}")
+                    logger.info("[Jira Webhook] 이미 등록되어 있음: %s", webhook_url)
                     return True
 
-        except requests.RequestException as e:
-            print(f"[Jira Webhook] 기존 웹훅 조회 실패: {e}")
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("[Jira Webhook] 기존 웹훅 조회 실패: %s", e)
 
         # 웹훅 등록
         payload = {
@@ -275,22 +396,22 @@ class JiraClient:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
                 auth=self.auth,
-                json=payload,
+                data=dumps_json_bytes(payload),
                 headers=self.headers,
                 timeout=10
             )
             response.raise_for_status()
 
-            print(f"✅ [Jira Webhook] 웹훅 등록 성공: {webhook_url}")
+            logger.info("✅ [Jira Webhook] 웹훅 등록 성공: %s", webhook_url)
             return True
 
         except requests.RequestException as e:
-            print(f"❌ [Jira Webhook] 웹훅 등록 실패: {e}")
+            logger.error("❌ [Jira Webhook] 웹훅 등록 실패: %s", e)
             if hasattr(e, 'response') and e.response is not None:
-                print(f"   응답: {e.response.text}")
+                logger.error("   응답: %s", e.response.text)
             return False
 
 
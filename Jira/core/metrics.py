@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Jira Agent - Prometheus Metrics
+
+성능 튜닝에 필요한 지표 정의
+- chat_seconds: /chat 처리 시간
+- semantic_cache_hits_total / response_cache_misses_total: 응답 캐시 적중률
+- milvus_search_seconds: 벡터 검색 지연 시간 (latency_budget별)
+- milvus_upsert_batch_size: Milvus UPSERT 배치 크기
+
+uvicorn 멀티 워커로 실행할 때는 PROMETHEUS_MULTIPROC_DIR 환경변수를 설정하면
+모든 워커의 지표를 합쳐서 노출합니다.
+"""
+
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, make_asgi_app, multiprocess
+
+
+# ─────────────────────────────────────────────────────────
+# 지표 정의
+# ─────────────────────────────────────────────────────────
+
+CHAT_LATENCY = Histogram(
+    "chat_seconds",
+    "Time spent handling a /chat request",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2, 5)
+)
+
+# kind: exact (정규화 키) | semantic (프로세스 내 임베딩) | shared (Milvus chat_cache)
+CACHE_HITS = Counter(
+    "semantic_cache_hits_total",
+    "Chat response cache hits",
+    ["kind"]
+)
+
+CACHE_MISSES = Counter(
+    "response_cache_misses_total",
+    "Chat response cache misses (graph invoked)"
+)
+
+SEARCH_LATENCY = Histogram(
+    "milvus_search_seconds",
+    "Milvus vector search latency",
+    ["budget"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+)
+
+UPSERT_BATCH = Histogram(
+    "milvus_upsert_batch_size",
+    "Number of issues per Milvus upsert",
+    buckets=(1, 10, 50, 100, 500, 1000)
+)
+
+
+# ─────────────────────────────────────────────────────────
+# ASGI 앱
+# ─────────────────────────────────────────────────────────
+
+def create_metrics_app():
+    """/metrics에 마운트할 ASGI 앱 생성 (멀티 프로세스 모드 지원)"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return make_asgi_app(registry=registry)
+    return make_asgi_app()
@@ -15,19 +15,165 @@ from pymilvus import (
     CollectionSchema,
     FieldSchema,
     DataType,
+    MilvusException,
     utility
 )
-from openai import OpenAI
-from typing import List, Dict, Optional
+from pymilvus.client.types import LoadState
+from openai import AsyncOpenAI, OpenAI
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from functools import lru_cache
+import asyncio
+import math
+import random
+import threading
+import time
+import numpy as np
+from core.metrics import SEARCH_LATENCY, UPSERT_BATCH
+from core.utils import dumps_json, loads_json
+from core.embedding_cache import EmbeddingCache
+from core.cache import TTLCache, SemanticCache
 from core.config import (
     MILVUS_HOST,
     MILVUS_PORT,
     MILVUS_COLLECTION,
+    MILVUS_INDEX_TYPE,
+    MILVUS_METRIC_TYPE,
+    MILVUS_EXPECTED_ENTITIES,
+    MILVUS_IVF_NLIST,
+    MILVUS_HNSW_M,
+    MILVUS_HNSW_EF_CONSTRUCTION,
     OPENAI_API_KEY,
     EMBED_MODEL,
-    EMBED_DIM
+    EMBED_DIM,
+    EMBED_BATCH_SIZE,
+    EMBED_CONCURRENCY,
+    EMBED_CACHE_ENABLED,
+    EMBED_CACHE_PATH,
+    QUERY_EMBED_CACHE_SIZE,
+    PROJECT_METADATA_TTL,
+    SEARCH_CACHE_TTL,
+    SEARCH_SEMANTIC_CACHE_SIZE,
+    SEARCH_SEMANTIC_CACHE_THRESHOLD,
+    CHAT_CACHE_ENABLED,
+    CHAT_CACHE_COLLECTION,
+    CHAT_CACHE_HNSW_M,
+    CHAT_CACHE_HNSW_EF_CONSTRUCTION,
+    CHAT_CACHE_HNSW_EF
 )
 
+# chat_cache 컬렉션의 response_json 최대 길이 (VARCHAR 한도)
+CHAT_CACHE_MAX_RESPONSE_LEN = 65535
+
+# 이슈 컬렉션 스칼라 컬럼 (스키마 순서, embedding 제외): (컬럼, 이슈 필드, 기본값, 최대 바이트)
+# VARCHAR max_length는 UTF-8 바이트 기준 (한글 1자 = 3바이트)
+# description은 임베딩 텍스트(전체 설명 기준)와 별개로 표시용 앞부분만 저장
+# issue_key가 기본 키 (auto_id 없음) → upsert()로 같은 이슈를 한 번에 교체
+_ISSUE_COLUMNS = (
+    ("issue_key", "key", "", 50),
+    ("project_key", "project", "", 20),
+    ("issue_type", "issuetype", "", 50),
+    ("summary", "summary", "", 500),
+    ("description", "description", "", 512),
+    ("assignee", "assignee", "", 100),
+    ("priority", "priority", "NaN", 20),
+    ("status", "status", "", 50),
+    ("duedate", "duedate", "NaN", 50),
+    ("created", "created", "", 50),
+    ("updated", "updated", "", 50),
+)
+
+# 검색 결과로 받을 컬럼 (pymilvus는 output_fields로 list만 허용) / (컬럼, 결과 키) 쌍
+_OUTPUT_FIELDS = [column for column, *_ in _ISSUE_COLUMNS]
+_RESULT_KEYS = tuple((column, field) for column, field, *_ in _ISSUE_COLUMNS)
+
+# 한 번에 보내는 upsert 행 수 / delete 표현식의 issue_key 수 (프록시 메시지 크기 제한 대비)
+INSERT_BATCH_SIZE = 2000
+DELETE_BATCH_SIZE = 500
+
+# 검색 조건(필터, 개수, 예산)별 시맨틱 검색 결과 캐시를 몇 개까지 유지할지
+SEARCH_SEMANTIC_CACHE_CONTEXTS = 64
+
+# IVF nlist 최소값 / auto 모드에서 HNSW로 바꾸는 이슈 수 기준
+MIN_IVF_NLIST = 128
+HNSW_ENTITY_THRESHOLD = 1_000_000
+
+# 지연 시간 예산별 검색 파라미터 (값이 클수록 recall ↑, 지연 ↑)
+# - IVF 계열: nprobe (nlist=128 기준, nlist가 더 크면 비율대로 늘림)
+# - HNSW: ef (탐색 후보 리스트 크기)
+DEFAULT_LATENCY_BUDGET = "balanced"
+SEARCH_PARAMS_BY_BUDGET = {
+    "fast": {"nprobe": 5, "ef": 32},
+    "balanced": {"nprobe": 10, "ef": 64},
+    "accurate": {"nprobe": 32, "ef": 128},
+}
+
+# query_iterator 한 번에 가져오는 행 수 (전체 스캔 시 메모리 상한)
+QUERY_ITERATOR_BATCH_SIZE = 1000
+
+# 속도 제한/큐 포화 오류 재시도 (지수 백오프: 0.5s, 1s, 2s, ...)
+MILVUS_RETRY_ATTEMPTS = 4
+MILVUS_RETRY_BACKOFF = 0.5
+_RETRYABLE_ERRORS = ("rate limit", "ratelimit", "task queue is full", "quota")
+
+
+def _truncate_utf8(value: str, max_bytes: int) -> str:
+    """UTF-8 바이트 기준으로 자르기 (글자 중간에서 잘리면 그 글자는 버림)"""
+    encoded = value.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return value
+    return encoded[:max_bytes].decode("utf-8", "ignore")
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    """임베딩 L2 정규화 (IP 척도 = 코사인 유사도가 되도록, 영벡터는 그대로)"""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return (array / norm).tolist() if norm else list(vector)
+
+
+def build_index_params(num_entities: int = 0) -> Dict:
+    """
+    이슈 컬렉션 벡터 인덱스 파라미터 생성
+
+    - MILVUS_INDEX_TYPE=auto: num_entities > 100만이면 HNSW, 아니면 IVF_SQ8
+    - IVF 계열: nlist = MILVUS_IVF_NLIST 또는 max(128, √N)
+    - 척도: MILVUS_METRIC_TYPE (기본 IP, 정규화된 임베딩 기준 코사인)
+
+    Args:
+        num_entities: 현재(또는 예상) 이슈 수
+    """
+    index_type = MILVUS_INDEX_TYPE
+    if index_type == "AUTO":
+        index_type = "HNSW" if num_entities > HNSW_ENTITY_THRESHOLD else "IVF_SQ8"
+
+    if index_type == "HNSW":
+        params = {"M": MILVUS_HNSW_M, "efConstruction": MILVUS_HNSW_EF_CONSTRUCTION}
+    else:
+        params = {"nlist": MILVUS_IVF_NLIST or max(MIN_IVF_NLIST, int(math.sqrt(num_entities)))}
+
+    return {"metric_type": MILVUS_METRIC_TYPE, "index_type": index_type, "params": params}
+
+
+def _with_retry(func, *args, **kwargs):
+    """속도 제한류 MilvusException이면 지수 백오프로 재시도, 그 외 오류는 그대로 전파"""
+    for attempt in range(MILVUS_RETRY_ATTEMPTS):
+        try:
+            return func(*args, **kwargs)
+        except MilvusException as e:
+            message = str(e).lower()
+            if attempt == MILVUS_RETRY_ATTEMPTS - 1 or not any(m in message for m in _RETRYABLE_ERRORS):
+                raise
+            time.sleep(MILVUS_RETRY_BACKOFF * (2 ** attempt))
+
+
+def _event_loop_running() -> bool:
+    """현재 스레드에서 이벤트 루프가 실행 중인지 (asyncio.run 사용 가능 여부)"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
 
 class MilvusClient:
     """Milvus 벡터 DB 클라이언트"""
@@ -36,6 +182,29 @@ class MilvusClient:
         """초기화 및 연결"""
         self.collection_name = MILVUS_COLLECTION
         self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        # 채팅 응답 시맨틱 캐시 컬렉션 (첫 사용 시 생성/로드)
+        self._chat_cache: Optional[Collection] = None
+        # 로드된 이슈 컬렉션 핸들 (_ensure_loaded에서 한 번만 생성/로드)
+        self._collection: Optional[Collection] = None
+        self._loaded = False
+        # 이슈 컬렉션의 벡터 인덱스 종류 / IVF nlist (첫 검색 시 조회)
+        self._index_type: Optional[str] = None
+        self._nlist = MIN_IVF_NLIST
+        self._metric_type = "L2"
+        # 기본 키가 issue_key인지 (False면 이전 스키마 → delete 후 insert)
+        self._upsert_native: Optional[bool] = None
+        # 임베딩 영구 캐시 (sha256(모델|텍스트) → 벡터)
+        self._embedding_cache: Optional[EmbeddingCache] = (
+            EmbeddingCache(EMBED_CACHE_PATH, EMBED_MODEL) if EMBED_CACHE_ENABLED else None
+        )
+        # 검색 쿼리 임베딩 LRU (자주 쓰는 검색어는 SQLite 조회도 없이 재사용)
+        self._query_embedding_cache = TTLCache(maxsize=QUERY_EMBED_CACHE_SIZE)
+        # 의미가 거의 같은 검색어의 결과 재사용: (filter_expr, limit, budget) → SemanticCache
+        self._search_result_caches = TTLCache(maxsize=SEARCH_SEMANTIC_CACHE_CONTEXTS)
+        # 프로젝트별 이슈 타입 (전체 스캔 1회로 만들고 upsert 때마다 갱신, 삭제 시 다시 스캔)
+        self._project_types: Optional[Dict[str, Set[str]]] = None
+        self._project_types_at = 0.0
+        self._project_types_lock = threading.Lock()
         self.connect()
 
         # 컬렉션이 없으면 자동 생성
@@ -45,6 +214,23 @@ class MilvusClient:
         else:
             print(f"ℹ️  기존 컬렉션 사용: {self.collection_name}")
 
+    def _ensure_loaded(self) -> Collection:
+        """
+        로드된 이슈 컬렉션 핸들 반환
+
+        load()는 이미 로드된 컬렉션에도 RPC를 보내므로, load_state를 한 번만 확인하고
+        이후 호출에서는 캐시된 핸들을 그대로 씁니다.
+        """
+        if self._collection is None:
+            self._collection = Collection(self.collection_name)
+
+        if not self._loaded:
+            if utility.load_state(self.collection_name) != LoadState.Loaded:
+                self._collection.load()
+            self._loaded = True
+
+        return self._collection
+
     def connect(self):
         """Milvus 서버 연결"""
         try:
@@ -68,6 +254,12 @@ class MilvusClient:
         # 기존 컬렉션 삭제
         if drop_existing and utility.has_collection(self.collection_name):
             utility.drop_collection(self.collection_name)
+            # 캐시된 핸들/인덱스 정보는 삭제된 컬렉션 기준이므로 초기화
+            self._collection = None
+            self._loaded = False
+            self._index_type = None
+            self._upsert_native = None
+            self._project_types = None
             print(f"🗑️  기존 컬렉션 삭제: {self.collection_name}")
 
         # 이미 존재하는 경우
@@ -77,12 +269,11 @@ class MilvusClient:
 
         # 필드 정의
         fields = [
-            FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
-            FieldSchema(name="issue_key", dtype=DataType.VARCHAR, max_length=50),
+            FieldSchema(name="issue_key", dtype=DataType.VARCHAR, max_length=50, is_primary=True, auto_id=False),
             FieldSchema(name="project_key", dtype=DataType.VARCHAR, max_length=20),
             FieldSchema(name="issue_type", dtype=DataType.VARCHAR, max_length=50),
             FieldSchema(name="summary", dtype=DataType.VARCHAR, max_length=500),
-            FieldSchema(name="description", dtype=DataType.VARCHAR, max_length=2000),
+            FieldSchema(name="description", dtype=DataType.VARCHAR, max_length=512),
             FieldSchema(name="assignee", dtype=DataType.VARCHAR, max_length=100),
             FieldSchema(name="priority", dtype=DataType.VARCHAR, max_length=20),
             FieldSchema(name="status", dtype=DataType.VARCHAR, max_length=50),
@@ -105,12 +296,8 @@ class MilvusClient:
             schema=schema
         )
 
-        # 인덱스 생성 (벡터 검색 최적화)
-        index_params = {
-            "metric_type": "L2",
-            "index_type": "IVF_FLAT",
-            "params": {"nlist": 128}
-        }
+        # 인덱스 생성 (벡터 검색 최적화, 종류/nlist는 예상 이슈 수 기준)
+        index_params = build_index_params(MILVUS_EXPECTED_ENTITIES)
         collection.create_index(
             field_name="embedding",
             index_params=index_params
@@ -119,28 +306,336 @@ class MilvusClient:
         print(f"✅ 컬렉션 생성 완료: {self.collection_name}")
         print(f"   - 필드 수: {len(fields)}")
         print(f"   - 임베딩 차원: {EMBED_DIM}")
+        print(f"   - 인덱스: {index_params['index_type']} {index_params['params']}")
+
+        return collection
 
+    def rebuild_index(self) -> Dict:
+        """
+        현재 이슈 수에 맞게 벡터 인덱스 재생성 (대량 동기화 후 호출)
+
+        Returns:
+            새 인덱스 파라미터
+        """
+        collection = self._ensure_loaded()
+        index_params = build_index_params(collection.num_entities)
+
+        collection.release()
+        collection.drop_index()
+        collection.create_index(field_name="embedding", index_params=index_params)
+        collection.load()
+
+        self._index_type = None
+        print(f"✅ 인덱스 재생성: {index_params['index_type']} {index_params['params']}")
+        return index_params
+
+    def create_chat_cache_collection(self) -> Collection:
+        """
+        채팅 응답 시맨틱 캐시 컬렉션 생성 (없을 때만)
+
+        (embedding, response_json, ts)를 저장하며,
+        HNSW + COSINE 인덱스로 top-1 조회를 빠르게 합니다.
+        """
+        if utility.has_collection(CHAT_CACHE_COLLECTION):
+            return Collection(CHAT_CACHE_COLLECTION)
+
+        fields = [
+            FieldSchema(name="id", dtype=DataType.INT64, is_primary=True, auto_id=True),
+            FieldSchema(name="response_json", dtype=DataType.VARCHAR, max_length=CHAT_CACHE_MAX_RESPONSE_LEN),
+            FieldSchema(name="ts", dtype=DataType.DOUBLE),
+            FieldSchema(name="embedding", dtype=DataType.FLOAT_VECTOR, dim=EMBED_DIM)
+        ]
+
+        schema = CollectionSchema(
+            fields=fields,
+            description="Chat Response Semantic Cache",
+            enable_dynamic_field=False
+        )
+
+        collection = Collection(name=CHAT_CACHE_COLLECTION, schema=schema)
+
+        index_params = {
+            "metric_type": "COSINE",
+            "index_type": "HNSW",
+            "params": {"M": CHAT_CACHE_HNSW_M, "efConstruction": CHAT_CACHE_HNSW_EF_CONSTRUCTION}
+        }
+        collection.create_index(
+            field_name="embedding",
+            index_params=index_params
+        )
+
+        print(f"✅ 캐시 컬렉션 생성 완료: {CHAT_CACHE_COLLECTION}")
         return collection
 
-    def get_embedding(self, text: str) -> List[float]:
+    def search_chat_cache(
+        self,
+        embedding: List[float],
+        threshold: float,
+        ttl: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        시맨틱 캐시 top-1 조회
+
+        Args:
+            embedding: 질의 임베딩
+            threshold: 적중으로 판단할 최소 코사인 유사도
+            ttl: 유효 시간(초), None이면 만료 없음
+
+        Returns:
+            캐시된 응답 or None
+        """
+        try:
+            if self._chat_cache is None:
+                self._chat_cache = self.create_chat_cache_collection()
+                self._chat_cache.load()
+
+            expr = f"ts >= {time.time() - ttl}" if ttl is not None else None
+
+            results = self._chat_cache.search(
+                data=[embedding],
+                anns_field="embedding",
+                param={"metric_type": "COSINE", "params": {"ef": CHAT_CACHE_HNSW_EF}},
+                limit=1,
+                expr=expr,
+                output_fields=["response_json"]
+            )
+
+            hits = results[0] if results else []
+            if not hits or hits[0].distance < threshold:
+                return None
+
+            return loads_json(hits[0].entity.get("response_json"))
+
+        except Exception as e:
+            print(f"❌ 캐시 조회 실패: {e}")
+            return None
+
+    def insert_chat_cache(self, embedding: List[float], response: Dict[str, Any]) -> bool:
+        """
+        시맨틱 캐시에 (embedding, response) 저장
+
+        Args:
+            embedding: 질의 임베딩
+            response: 캐시할 응답 (JSON 직렬화 가능해야 함)
+
+        Returns:
+            성공 여부
+        """
+        try:
+            response_json = dumps_json(response)
+            if len(response_json.encode("utf-8")) > CHAT_CACHE_MAX_RESPONSE_LEN:
+                # VARCHAR 한도를 넘는 응답은 캐시하지 않음
+                return False
+
+            if self._chat_cache is None:
+                self._chat_cache = self.create_chat_cache_collection()
+                self._chat_cache.load()
+
+            # flush 없이 삽입 (growing segment도 검색 대상이라 바로 조회됨)
+            self._chat_cache.insert([{
+                "response_json": response_json,
+                "ts": time.time(),
+                "embedding": embedding
+            }])
+            return True
+
+        except Exception as e:
+            print(f"❌ 캐시 저장 실패: {e}")
+            return False
+
+    def clear_chat_cache(self) -> bool:
+        """시맨틱 캐시 전체 삭제 (데이터 변경 시 호출)"""
+        try:
+            if self._chat_cache is None:
+                if not utility.has_collection(CHAT_CACHE_COLLECTION):
+                    return True
+                self._chat_cache = Collection(CHAT_CACHE_COLLECTION)
+                self._chat_cache.load()
+
+            self._chat_cache.delete("id >= 0")
+            return True
+
+        except Exception as e:
+            print(f"❌ 캐시 삭제 실패: {e}")
+            return False
+
+    def warm_up(self) -> None:
+        """
+        컬렉션/인덱스를 메모리에 로드하고 검색 경로를 한 번 실행
+
+        첫 요청이 컬렉션 로드, 인덱스 페이지 로딩, OpenAI 연결 비용을 떠안지 않도록
+        서버 시작 시 호출합니다.
+        """
+        self._ensure_loaded()
+
+        if CHAT_CACHE_ENABLED and self._chat_cache is None:
+            self._chat_cache = self.create_chat_cache_collection()
+            self._chat_cache.load()
+
+        # 임베딩 + 벡터 검색 한 번 (결과는 사용하지 않음)
+        self.search("warmup", limit=1)
+
+    def get_embedding(self, text: str) -> Optional[List[float]]:
         """
-        텍스트를 임베딩으로 변환
+        텍스트를 임베딩으로 변환 (임베딩 캐시 적중 시 API 호출 없음)
 
         Args:
             text: 임베딩할 텍스트
 
         Returns:
-            임베딩 벡터 (1536 차원)
+            임베딩 벡터 (1536 차원), 실패 시 None (캐시하지 않음)
+        """
+        if self._embedding_cache is None:
+            return self._request_embedding(text)
+
+        key = self._embedding_cache.key(text)
+        cached = self._embedding_cache.get_many([key]).get(key)
+        if cached is not None:
+            return cached
+
+        embedding = self._request_embedding(text)
+        if embedding is not None:
+            self._embedding_cache.set_many([(key, embedding)])
+        return embedding
+
+    def get_query_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        검색 쿼리 임베딩 (프로세스 내 LRU 캐시)
+
+        같은 검색어/사용자 입력이 반복되면 API 호출 없이 벡터를 재사용합니다.
+        키에 EMBED_MODEL을 포함하고, 임베딩 실패(None)는 캐시하지 않습니다.
+        """
+        key = (EMBED_MODEL, text)
+        cached = self._query_embedding_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        embedding = self.get_embedding(text)
+        if embedding is not None:
+            self._query_embedding_cache.set(key, tuple(embedding))
+        return embedding
+
+    def _request_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        OpenAI 임베딩 API 호출
+
+        실패하면 None을 반환합니다. 영벡터로 대신하면 캐시/chat_cache/이슈 컬렉션에
+        의미 없는 벡터가 저장되므로, 호출한 쪽에서 건너뛰도록 실패를 명시합니다.
         """
         try:
             response = self.openai_client.embeddings.create(
                 model=EMBED_MODEL,
                 input=text
             )
-            return response.data[0].embedding
+            return _normalize(response.data[0].embedding)
         except Exception as e:
             print(f"❌ 임베딩 생성 실패: {e}")
-            return [0.0] * EMBED_DIM
+            return None
+
+    def _embed_chunk(self, chunk: List[str]) -> List[Optional[List[float]]]:
+        """텍스트 묶음 하나를 한 번의 요청으로 임베딩 (실패하면 텍스트별로 재시도)"""
+        try:
+            response = self.openai_client.embeddings.create(
+                model=EMBED_MODEL,
+                input=chunk
+            )
+            # 응답 순서가 입력 순서와 다를 수 있어 index 기준으로 정렬
+            return [_normalize(d.embedding) for d in sorted(response.data, key=lambda d: d.index)]
+        except Exception as e:
+            print(f"⚠️  배치 임베딩 실패, 개별 요청으로 재시도: {e}")
+            return [self._request_embedding(text) for text in chunk]
+
+    async def _aget_embeddings_batch(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> List[Optional[List[float]]]:
+        """
+        배치 여러 개를 AsyncOpenAI로 동시에 임베딩 (EMBED_CONCURRENCY개까지)
+
+        AsyncOpenAI 클라이언트는 이벤트 루프에 묶이므로 호출마다 새로 만들고 닫습니다.
+        """
+        chunks = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+
+        async with AsyncOpenAI(api_key=OPENAI_API_KEY) as client:
+            async def embed(chunk: List[str]) -> List[Optional[List[float]]]:
+                async with semaphore:
+                    # 동시에 몰리는 요청(429) 방지용 지터
+                    await asyncio.sleep(random.random() * 0.05)
+                    try:
+                        response = await client.embeddings.create(model=EMBED_MODEL, input=chunk)
+                        return [_normalize(d.embedding) for d in sorted(response.data, key=lambda d: d.index)]
+                    except Exception as e:
+                        print(f"⚠️  배치 임베딩 실패, 개별 요청으로 재시도: {e}")
+                        return await asyncio.to_thread(lambda: [self._request_embedding(text) for text in chunk])
+
+            # gather는 입력 순서대로 결과를 돌려주므로 chunk 순서가 유지됨
+            results = await asyncio.gather(*(embed(chunk) for chunk in chunks))
+
+        return [embedding for chunk_embeddings in results for embedding in chunk_embeddings]
+
+    def get_embeddings_batch(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> List[Optional[List[float]]]:
+        """
+        여러 텍스트를 batch_size개씩 묶어 임베딩 (요청 한 번에 여러 개)
+
+        배치가 여러 개면 동시에 요청하고, 배치 요청이 실패하면 그 배치만 텍스트별로 다시 시도합니다.
+        이벤트 루프가 돌고 있는 스레드에서 호출되면 배치를 순서대로 요청합니다.
+
+        Args:
+            texts: 임베딩할 텍스트 리스트
+            batch_size: 요청 한 번에 보낼 텍스트 수
+
+        Returns:
+            texts와 같은 순서의 임베딩 벡터 리스트 (실패한 텍스트는 None)
+        """
+        found, misses = self._lookup_embeddings(texts)
+        if misses:
+            self._store_embeddings(found, misses, self._embed_texts(misses, batch_size))
+        return [found[text] for text in texts]
+
+    async def aget_embeddings_batch(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE) -> List[Optional[List[float]]]:
+        """get_embeddings_batch()의 async 버전 (이벤트 루프 안에서도 배치를 동시에 요청)"""
+        found, misses = await asyncio.to_thread(self._lookup_embeddings, texts)
+        if misses:
+            embeddings = await self._aget_embeddings_batch(misses, batch_size)
+            await asyncio.to_thread(self._store_embeddings, found, misses, embeddings)
+        return [found[text] for text in texts]
+
+    def _lookup_embeddings(self, texts: List[str]) -> Tuple[Dict[str, List[float]], List[str]]:
+        """
+        임베딩 캐시 조회
+
+        같은 텍스트(템플릿으로 만든 이슈 등)는 한 번만 임베딩하도록 중복을 제거합니다.
+
+        Returns:
+            ({텍스트: 캐시된 벡터}, 임베딩이 필요한 텍스트 리스트)
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        if self._embedding_cache is None:
+            return {}, unique_texts
+
+        keys = {text: self._embedding_cache.key(text) for text in unique_texts}
+        cached = self._embedding_cache.get_many(keys.values())
+        found = {text: cached[key] for text, key in keys.items() if key in cached}
+        return found, [text for text in unique_texts if text not in found]
+
+    def _store_embeddings(self, found: Dict[str, Optional[List[float]]], texts: List[str],
+                          embeddings: List[Optional[List[float]]]) -> None:
+        """새로 만든 임베딩을 found에 합치고 임베딩 캐시에 저장 (실패한 None은 캐시하지 않음)"""
+        fresh = dict(zip(texts, embeddings))
+        found.update(fresh)
+        if self._embedding_cache is not None:
+            self._embedding_cache.set_many(
+                (self._embedding_cache.key(text), embedding)
+                for text, embedding in fresh.items() if embedding is not None
+            )
+
+    def _embed_texts(self, texts: List[str], batch_size: int) -> List[Optional[List[float]]]:
+        """캐시 없이 임베딩 (배치가 여러 개면 동시에 요청)"""
+        if len(texts) > batch_size and not _event_loop_running():
+            return asyncio.run(self._aget_embeddings_batch(texts, batch_size))
+
+        embeddings: List[List[float]] = []
+        for start in range(0, len(texts), batch_size):
+            embeddings.extend(self._embed_chunk(texts[start:start + batch_size]))
+        return embeddings
 
     def prepare_embedding_text(self, issue: Dict) -> str:
         """
@@ -154,16 +649,44 @@ class MilvusClient:
         Returns:
             임베딩용 텍스트
         """
-        project_key = issue.get("project", "") or ""
-        summary = issue.get("summary", "") or ""
-        description = issue.get("description", "") or ""
+        return " | ".join((
+            issue.get("project") or "",
+            issue.get("summary") or "",
+            issue.get("description") or ""
+        ))
 
-        return f"{project_key} | {summary} | {description}"
+    def _delete_issue_keys(self, collection: Collection, issue_keys: List[str]) -> None:
+        """
+        issue_key 목록을 DELETE_BATCH_SIZE개씩 나눠 삭제 (flush는 호출한 쪽에서)
+
+        키는 JSON 문자열 리터럴로 넣어 따옴표/역슬래시가 있어도 표현식이 깨지지 않게 합니다.
+        (Python list의 repr()은 작은따옴표를 섞어 쓰므로 사용하지 않음)
+        """
+        issue_keys = [key for key in issue_keys if key]
+        for start in range(0, len(issue_keys), DELETE_BATCH_SIZE):
+            chunk = issue_keys[start:start + DELETE_BATCH_SIZE]
+            _with_retry(collection.delete, f"issue_key in {dumps_json(chunk)}")
+
+    def _supports_upsert(self, collection: Collection) -> bool:
+        """
+        기본 키가 issue_key인지 확인 (결과는 캐시)
+
+        id(auto_id) 기본 키로 만든 이전 컬렉션은 upsert()로 교체할 수 없으므로
+        delete 후 insert로 처리합니다. (sync_jira_to_milvus.py --recreate로 새 스키마 적용)
+        """
+        if self._upsert_native is None:
+            self._upsert_native = collection.schema.primary_field.name == "issue_key"
+            if not self._upsert_native:
+                print("⚠️  이전 스키마(id 기본 키) 컬렉션입니다. delete+insert로 저장합니다.")
+        return self._upsert_native
 
     def upsert_issues(self, issues: List[Dict]) -> bool:
         """
         이슈 데이터를 Milvus에 저장 (UPSERT)
 
+        issue_key 기본 키 컬렉션은 collection.upsert() 한 번으로 교체합니다.
+        (delete + insert 두 번의 RPC와 그 사이 이슈가 비어 보이는 구간이 없음)
+
         Args:
             issues: 이슈 데이터 리스트
 
@@ -174,45 +697,54 @@ class MilvusClient:
             print("⚠️  저장할 이슈가 없습니다.")
             return False
 
+        # 같은 배치에 같은 이슈가 여러 번 있으면 마지막 것만 (기본 키 중복 방지)
+        issues = list({issue.get("key"): issue for issue in issues}.values())
+
         try:
-            collection = Collection(self.collection_name)
-            collection.load()  # 컬렉션을 메모리에 로드
-
-            # 기존 데이터 삭제 (issue_key 기반)
-            issue_keys = [issue.get("key") for issue in issues]
-            expr = f"issue_key in {issue_keys}"
-
-            try:
-                collection.delete(expr)
-            except Exception as e:
-                print(f"[WARN] 기존 데이터 삭제 실패 (무시): {e}")
-                pass  # 데이터가 없으면 무시
-
-            # 데이터 준비
-            data = []
-            for issue in issues:
-                # 임베딩 텍스트 생성
-                embed_text = self.prepare_embedding_text(issue)
-                embedding = self.get_embedding(embed_text)
-
-                data.append({
-                    "issue_key": issue.get("key", "")[:50],
-                    "project_key": (issue.get("project") or "")[:20],
-                    "issue_type": (issue.get("issuetype") or "")[:50],
-                    "summary": (issue.get("summary") or "")[:500],
-                    "description": (issue.get("description") or "")[:2000],
-                    "assignee": (issue.get("assignee") or "")[:100],
-                    "priority": (issue.get("priority") or "NaN")[:20],
-                    "status": (issue.get("status") or "")[:50],
-                    "duedate": (issue.get("duedate") or "NaN")[:50],
-                    "created": (issue.get("created") or "")[:50],
-                    "updated": (issue.get("updated") or "")[:50],
-                    "embedding": embedding
-                })
-
-            # 삽입
-            collection.insert(data)
-            collection.flush()
+            collection = self._ensure_loaded()
+            native = self._supports_upsert(collection)
+
+            if not native:
+                self._delete_before_insert(collection, issues)
+
+            # 임베딩은 이슈별로 요청하지 않고 배치로 한 번에 생성
+            embed_texts = [self.prepare_embedding_text(issue) for issue in issues]
+            embeddings = self.get_embeddings_batch(embed_texts)
+
+            self._write_issues(collection, issues, embeddings, native)
+
+            print(f"✅ {len(issues)}개 이슈 저장 완료")
+            return True
+
+        except Exception as e:
+            print(f"❌ 이슈 저장 실패: {e}")
+            return False
+
+    async def aupsert_issues(self, issues: List[Dict]) -> bool:
+        """
+        upsert_issues()의 async 버전 (웹훅 배치 등 이벤트 루프에서 호출)
+
+        임베딩 생성(AsyncOpenAI)과 이전 스키마의 기존 데이터 삭제를 동시에 진행하므로
+        소요 시간이 max(임베딩, 삭제) + 저장 정도가 됩니다.
+        pymilvus 호출은 blocking이라 asyncio.to_thread로 실행합니다.
+        """
+        if not issues:
+            print("⚠️  저장할 이슈가 없습니다.")
+            return False
+
+        issues = list({issue.get("key"): issue for issue in issues}.values())
+
+        try:
+            collection = await asyncio.to_thread(self._ensure_loaded)
+            native = self._supports_upsert(collection)
+
+            embed_texts = [self.prepare_embedding_text(issue) for issue in issues]
+            embeddings_task = asyncio.create_task(self.aget_embeddings_batch(embed_texts))
+            if not native:
+                await asyncio.to_thread(self._delete_before_insert, collection, issues)
+            embeddings = await embeddings_task
+
+            await asyncio.to_thread(self._write_issues, collection, issues, embeddings, native)
 
             print(f"✅ {len(issues)}개 이슈 저장 완료")
             return True
@@ -221,6 +753,45 @@ class MilvusClient:
             print(f"❌ 이슈 저장 실패: {e}")
             return False
 
+    def _delete_before_insert(self, collection: Collection, issues: List[Dict]) -> None:
+        """이전 스키마: 기존 데이터 삭제 (issue_key 기반, 실패는 무시)"""
+        try:
+            self._delete_issue_keys(collection, [issue.get("key") for issue in issues])
+        except Exception as e:
+            print(f"[WARN] 기존 데이터 삭제 실패 (무시): {e}")
+
+    def _write_issues(self, collection: Collection, issues: List[Dict],
+                      embeddings: List[Optional[List[float]]], native: bool) -> None:
+        """
+        이슈 + 임베딩을 컬럼 단위로 저장하고 flush
+
+        임베딩이 실패한(None) 이슈는 저장하지 않습니다 (다음 동기화/웹훅에서 다시 저장).
+        """
+        failed = [issue.get("key") for issue, embedding in zip(issues, embeddings) if embedding is None]
+        if failed:
+            print(f"⚠️  임베딩 실패로 {len(failed)}개 이슈 저장 건너뜀: {failed[:10]}")
+            kept = [(issue, embedding) for issue, embedding in zip(issues, embeddings) if embedding is not None]
+            if not kept:
+                return
+            issues, embeddings = map(list, zip(*kept))
+
+        # 컬럼 단위 데이터 준비 (행별 dict 대신 스키마 순서의 컬럼 리스트)
+        data = [
+            [_truncate_utf8(issue.get(field) or default, max_len) for issue in issues]
+            for _, field, default, max_len in _ISSUE_COLUMNS
+        ]
+        # 임베딩은 (N, EMBED_DIM) float32 배열 하나로 전달
+        data.append(np.asarray(embeddings, dtype=np.float32))
+
+        # INSERT_BATCH_SIZE행씩 나눠 저장, flush는 마지막에 한 번
+        write = collection.upsert if native else collection.insert
+        for start in range(0, len(issues), INSERT_BATCH_SIZE):
+            end = start + INSERT_BATCH_SIZE
+            _with_retry(write, [column[start:end] for column in data])
+        collection.flush()
+        UPSERT_BATCH.observe(len(issues))
+        self._on_data_changed(issues)
+
     def delete_by_issue_key(self, issue_key: str) -> bool:
         """
         issue_key로 이슈 삭제
@@ -232,15 +803,15 @@ class MilvusClient:
             성공 여부
         """
         try:
-            collection = Collection(self.collection_name)
-            collection.load()
+            collection = self._ensure_loaded()
 
             # 삭제 표현식
-            expr = f'issue_key == "{issue_key}"'
+            expr = f"issue_key == {dumps_json(issue_key)}"
 
             # 삭제 실행
             collection.delete(expr)
             collection.flush()
+            self._on_data_changed()
 
             print(f"✅ 이슈 삭제 완료: {issue_key}")
             return True
@@ -249,11 +820,193 @@ class MilvusClient:
             print(f"❌ 이슈 삭제 실패: {e}")
             return False
 
+    def delete_by_issue_keys(self, issue_keys: List[str]) -> bool:
+        """
+        여러 issue_key를 한 번의 삭제 요청으로 삭제
+
+        Args:
+            issue_keys: 삭제할 이슈 키 리스트
+
+        Returns:
+            성공 여부
+        """
+        if not issue_keys:
+            return True
+
+        try:
+            collection = self._ensure_loaded()
+
+            self._delete_issue_keys(collection, list(issue_keys))
+            collection.flush()
+            self._on_data_changed()
+
+            print(f"✅ {len(issue_keys)}개 이슈 삭제 완료")
+            return True
+
+        except Exception as e:
+            print(f"❌ 이슈 삭제 실패: {e}")
+            return False
+
+    def _search_result_cache(self, context: tuple) -> SemanticCache:
+        """검색 조건별 시맨틱 결과 캐시 (없으면 생성)"""
+        cache = self._search_result_caches.get(context)
+        if cache is None:
+            cache = SemanticCache(
+                maxsize=SEARCH_SEMANTIC_CACHE_SIZE,
+                threshold=SEARCH_SEMANTIC_CACHE_THRESHOLD,
+                ttl=SEARCH_CACHE_TTL
+            )
+            self._search_result_caches.set(context, cache)
+        return cache
+
+    def clear_search_cache(self) -> None:
+        """시맨틱 검색 결과 캐시 전체 삭제 (이슈 저장/삭제 후)"""
+        self._search_result_caches.clear()
+
+    def _on_data_changed(self, upserted: Optional[List[Dict]] = None) -> None:
+        """
+        이슈 저장/삭제 후 캐시 갱신
+
+        - 검색 결과 캐시: 무효화
+        - 프로젝트/이슈 타입 목록: 저장한 이슈는 바로 반영 (추가 RPC 없음)
+          삭제는 남은 이슈에 같은 타입이 있는지 알 수 없으므로 다음 조회 때 다시 스캔
+        """
+        self.clear_search_cache()
+        with self._project_types_lock:
+            if upserted is None:
+                self._project_types = None
+            elif self._project_types is not None:
+                for issue in upserted:
+                    project = issue.get("project")
+                    issue_type = issue.get("issuetype")
+                    if project and issue_type:
+                        self._project_types.setdefault(project, set()).add(issue_type)
+
+    def get_search_params(self, collection: Collection, latency_budget: Optional[str] = None) -> Dict:
+        """
+        지연 시간 예산에 맞는 검색 파라미터 생성
+
+        컬렉션의 인덱스 종류(IVF/HNSW)에 맞는 파라미터만 골라 사용합니다.
+
+        Args:
+            collection: 검색할 컬렉션
+            latency_budget: "fast" | "balanced" | "accurate" (None이면 balanced)
+
+        Returns:
+            collection.search()의 param 딕셔너리
+        """
+        if self._index_type is None:
+            self._load_index_info(collection)
+
+        budget = SEARCH_PARAMS_BY_BUDGET.get(
+            latency_budget, SEARCH_PARAMS_BY_BUDGET[DEFAULT_LATENCY_BUDGET]
+        )
+
+        if self._index_type == "HNSW":
+            params = {"ef": budget["ef"]}
+        else:
+            # 예산의 nprobe는 nlist=128 기준이므로 실제 nlist 비율대로 늘림
+            nprobe = budget["nprobe"] * max(1, self._nlist // MIN_IVF_NLIST)
+            params = {"nprobe": min(nprobe, self._nlist)}
+
+        return {"metric_type": self._metric_type, "params": params}
+
+    def _load_index_info(self, collection: Collection) -> None:
+        """컬렉션 인덱스 종류와 nlist 조회 (검색 파라미터 계산용)"""
+        try:
+            index_params = collection.indexes[0].params
+            self._index_type = index_params.get("index_type", "IVF_FLAT")
+            # 척도는 인덱스에 저장된 값을 따름 (예전 L2 컬렉션도 그대로 검색 가능)
+            self._metric_type = index_params.get("metric_type", "L2")
+            params = index_params.get("params", {})
+            if isinstance(params, str):
+                params = loads_json(params)
+            self._nlist = int(params.get("nlist", MIN_IVF_NLIST))
+        except Exception:
+            self._index_type = "IVF_FLAT"
+            self._metric_type = "L2"
+            self._nlist = MIN_IVF_NLIST
+
+    def tune_search_params(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        candidates: Optional[List[int]] = None,
+        target_recall: float = 0.95
+    ) -> Dict:
+        """
+        검증용 쿼리로 nprobe(IVF) / ef(HNSW) 후보별 recall@limit과 지연 시간 측정
+
+        IVF는 nprobe=nlist(전체 클러스터 탐색) 결과를, HNSW는 가장 큰 후보의 4배 ef 결과를
+        정답으로 보고 비교합니다. 설정은 바꾸지 않고 측정 결과만 반환하므로
+        SEARCH_PARAMS_BY_BUDGET 조정에 참고합니다.
+
+        Args:
+            queries: 검증용 검색어 리스트
+            limit: 비교할 상위 결과 수
+            candidates: 측정할 값 (None이면 IVF [8, 16, 32, 64], HNSW [32, 64, 128, 256])
+            target_recall: 이 recall 이상인 가장 작은 값을 추천
+
+        Returns:
+            {"param": "nprobe" | "ef", "results": [{value, recall, latency_ms}], "recommended": 값}
+        """
+        collection = self._ensure_loaded()
+        self._load_index_info(collection)
+
+        if self._index_type == "HNSW":
+            param = "ef"
+            candidates = candidates or [32, 64, 128, 256]
+            reference = {"ef": max(candidates) * 4}
+        else:
+            param = "nprobe"
+            candidates = candidates or [8, 16, 32, 64]
+            reference = {"nprobe": self._nlist}
+
+        # 임베딩이 실패한 쿼리는 제외
+        embeddings = [embedding for embedding in self.get_embeddings_batch(queries) if embedding is not None]
+        if not embeddings:
+            raise ValueError("임베딩 생성에 실패해 튜닝할 쿼리가 없습니다.")
+
+        def run(params: Dict) -> List[set]:
+            results = collection.search(
+                data=embeddings,
+                anns_field="embedding",
+                param={"metric_type": self._metric_type, "params": params},
+                limit=limit,
+                output_fields=["issue_key"]
+            )
+            return [{hit.entity.get("issue_key") for hit in hits} for hits in results]
+
+        truth = run(reference)
+
+        measurements = []
+        for value in candidates:
+            started = time.perf_counter()
+            found = run({param: value})
+            latency_ms = (time.perf_counter() - started) * 1000 / len(embeddings)
+
+            recall = sum(
+                len(got & expected) / len(expected) for got, expected in zip(found, truth) if expected
+            ) / max(sum(1 for expected in truth if expected), 1)
+            measurements.append({"value": value, "recall": round(recall, 4), "latency_ms": round(latency_ms, 2)})
+
+        recommended = next(
+            (m["value"] for m in measurements if m["recall"] >= target_recall),
+            candidates[-1]
+        )
+
+        for m in measurements:
+            print(f"[TUNE] {param}={m['value']}: recall={m['recall']}, {m['latency_ms']}ms/query")
+        print(f"[TUNE] 추천 {param}: {recommended}")
+
+        return {"param": param, "results": measurements, "recommended": recommended}
+
     def search(
         self,
         query_text: str,
         filter_expr: Optional[str] = None,
-        limit: int = 10
+        limit: int = 10,
+        latency_budget: Optional[str] = None
     ) -> List[Dict]:
         """
         하이브리드 검색 (벡터 + 메타데이터 필터)
@@ -262,67 +1015,84 @@ class MilvusClient:
             query_text: 검색 쿼리
             filter_expr: 메타데이터 필터 표현식
             limit: 결과 개수
+            latency_budget: 검색 정확도/지연 시간 예산 ("fast" | "balanced" | "accurate")
 
         Returns:
             검색 결과 리스트
         """
         try:
-            collection = Collection(self.collection_name)
-            collection.load()
-
             # 쿼리 임베딩
-            query_embedding = self.get_embedding(query_text)
+            query_embedding = self.get_query_embedding(query_text)
+            if query_embedding is None:
+                return []
 
-            # 검색 파라미터
-            search_params = {
-                "metric_type": "L2",
-                "params": {"nprobe": 10}
-            }
+            # 같은 조건에서 의미가 거의 같은 검색어를 최근에 검색했으면 그 결과 재사용
+            result_cache = self._search_result_cache((filter_expr, limit, latency_budget))
+            # 호출한 쪽이 결과 dict를 수정해도 캐시가 바뀌지 않도록 복사본 반환
+            cached_results = result_cache.get(query_embedding)
+            if cached_results is not None:
+                return [dict(result) for result in cached_results]
 
-            # 검색 실행
-            results = collection.search(
-                data=[query_embedding],
-                anns_field="embedding",
-                param=search_params,
-                limit=limit,
-                expr=filter_expr,
-                output_fields=[
-                    "issue_key", "project_key", "issue_type",
-                    "summary", "description", "assignee",
-                    "priority", "status", "duedate", "created", "updated"
-                ]
-            )
+            collection = self._ensure_loaded()
 
-            # 결과 포맷팅
-            formatted_results = []
-            for hits in results:
-                for hit in hits:
-                    formatted_results.append({
-                        "key": hit.entity.get("issue_key"),
-                        "project": hit.entity.get("project_key"),
-                        "issuetype": hit.entity.get("issue_type"),
-                        "summary": hit.entity.get("summary"),
-                        "description": hit.entity.get("description"),
-                        "assignee": hit.entity.get("assignee"),
-                        "priority": hit.entity.get("priority"),
-                        "status": hit.entity.get("status"),
-                        "duedate": hit.entity.get("duedate"),
-                        "created": hit.entity.get("created"),
-                        "updated": hit.entity.get("updated"),
-                        "score": hit.distance
-                    })
+            # 검색 파라미터 (요청의 지연 시간 예산에 따라 nprobe/ef 조정)
+            search_params = self.get_search_params(collection, latency_budget)
 
+            # 검색 실행
+            with SEARCH_LATENCY.labels(budget=latency_budget or DEFAULT_LATENCY_BUDGET).time():
+                results = collection.search(
+                    data=[query_embedding],
+                    anns_field="embedding",
+                    param=search_params,
+                    limit=limit,
+                    expr=filter_expr,
+                    output_fields=_OUTPUT_FIELDS
+                )
+
+            # 결과 포맷팅 (Milvus 컬럼명 → 이슈 필드명, 마지막에 score)
+            formatted_results = [
+                {**{field: hit.entity.get(column) for column, field in _RESULT_KEYS}, "score": hit.distance}
+                for hits in results
+                for hit in hits
+            ]
+
+            if formatted_results:
+                result_cache.set(query_embedding, [dict(result) for result in formatted_results])
             return formatted_results
 
         except Exception as e:
             print(f"❌ 검색 실패: {e}")
             return []
 
+    def query(self, filter_expr: Optional[str], limit: int = 10) -> List[Dict]:
+        """
+        메타데이터 필터만으로 조회 (임베딩/벡터 검색 없음, score 없음)
+
+        Args:
+            filter_expr: 메타데이터 필터 표현식 (None이면 전체)
+            limit: 결과 개수
+
+        Returns:
+            조회 결과 리스트 (search()와 같은 필드, 순서는 Milvus 기본 순서)
+        """
+        try:
+            collection = self._ensure_loaded()
+            rows = collection.query(expr=filter_expr or 'issue_key != ""', output_fields=_OUTPUT_FIELDS, limit=limit)
+            return [{field: row.get(column) for column, field in _RESULT_KEYS} for row in rows]
+
+        except Exception as e:
+            print(f"❌ 조회 실패: {e}")
+            return []
+
+    def search_by_key(self, issue_key: str) -> Optional[Dict]:
+        """issue_key(기본 키)로 이슈 하나 조회 (없으면 None)"""
+        results = self.query(f"issue_key == {dumps_json(issue_key)}", limit=1)
+        return results[0] if results else None
+
     def get_stats(self) -> Dict:
         """컬렉션 통계 조회"""
         try:
-            collection = Collection(self.collection_name)
-            collection.load()
+            collection = self._ensure_loaded()
 
             stats = {
                 "name": self.collection_name,
@@ -336,6 +1106,56 @@ class MilvusClient:
             print(f"❌ 통계 조회 실패: {e}")
             return {}
 
+    def _iter_rows(self, output_fields: List[str]) -> Iterator[Dict]:
+        """
+        컬렉션 전체 행을 QUERY_ITERATOR_BATCH_SIZE개씩 나눠 순회
+
+        query(limit=10000) 한 번과 달리 행 수 제한(잘림)이 없고, 메모리에는 한 배치만 올라갑니다.
+        """
+        collection = self._ensure_loaded()
+        iterator = collection.query_iterator(
+            batch_size=QUERY_ITERATOR_BATCH_SIZE,
+            expr='issue_key != ""',  # 모든 데이터
+            output_fields=output_fields
+        )
+        try:
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    break
+                yield from batch
+        finally:
+            iterator.close()
+
+    def _get_project_types(self) -> Dict[str, List[str]]:
+        """
+        프로젝트별 이슈 타입 정렬 목록 (get_unique_projects/get_issue_types_by_project 공용)
+
+        비어 있거나 PROJECT_METADATA_TTL이 지나면(다른 워커의 변경 반영) 전체를 한 번 스캔하고,
+        그 사이에는 _on_data_changed()가 upsert된 이슈를 바로 반영합니다.
+        """
+        with self._project_types_lock:
+            expired = time.monotonic() - self._project_types_at >= PROJECT_METADATA_TTL
+            if self._project_types is None or expired:
+                # 프로젝트별로 이슈 타입 그룹화 (배치 단위로 스트리밍하며 한 번 순회)
+                project_types: Dict[str, Set[str]] = {}
+                for r in self._iter_rows(["project_key", "issue_type"]):
+                    project = r.get("project_key")
+                    issue_type = r.get("issue_type")
+
+                    if project and issue_type:
+                        project_types.setdefault(project, set()).add(issue_type)
+
+                print(f"[Milvus] 프로젝트별 이슈 타입 스캔: {len(project_types)}개 프로젝트")
+                # 빈 결과는 저장하지 않음 (다음 조회 때 다시 스캔)
+                if not project_types:
+                    return {}
+                self._project_types = project_types
+                self._project_types_at = time.monotonic()
+
+            # 정렬된 list로 변환 (sorted가 바로 list를 반환, upsert 반영과 겹치지 않게 락 안에서)
+            return {k: sorted(v) for k, v in self._project_types.items()}
+
     def get_unique_projects(self) -> List[str]:
         """
         Milvus에서 유니크한 프로젝트 키 목록 반환
@@ -344,22 +1164,7 @@ class MilvusClient:
             프로젝트 키 리스트 (예: ["KAN", "TEST", "SKN"])
         """
         try:
-            collection = Collection(self.collection_name)
-            collection.load()
-
-            # 모든 project_key 조회
-            results = collection.query(
-                expr="id > 0",  # 모든 데이터
-                output_fields=["project_key"],
-                limit=10000  # 충분히 큰 값
-            )
-
-            # 유니크한 project_key 추출
-            unique_projects = list(set([r["project_key"] for r in results if r.get("project_key")]))
-            unique_projects.sort()  # 정렬
-
-            print(f"[Milvus] 프로젝트 키 목록: {unique_projects}")
-            return unique_projects
+            return sorted(self._get_project_types())
 
         except Exception as e:
             print(f"❌ 프로젝트 목록 조회 실패: {e}")
@@ -374,37 +1179,26 @@ class MilvusClient:
             예: {"KAN": ["작업", "버그", "스토리"], "TEST": ["작업", "버그"]}
         """
         try:
-            collection = Collection(self.collection_name)
-            collection.load()
-
-            # 모든 project_key와 issue_type 조회
-            results = collection.query(
-                expr="id > 0",
-                output_fields=["project_key", "issue_type"],
-                limit=10000
-            )
-
-            # 프로젝트별로 이슈 타입 그룹화
-            project_types = {}
-            for r in results:
-                project = r.get("project_key")
-                issue_type = r.get("issue_type")
-
-                if project and issue_type:
-                    if project not in project_types:
-                        project_types[project] = set()
-                    project_types[project].add(issue_type)
-
-            # set을 list로 변환하고 정렬
-            result = {k: sorted(list(v)) for k, v in project_types.items()}
-
-            print(f"[Milvus] 프로젝트별 이슈 타입: {result}")
-            return result
+            return self._get_project_types()
 
         except Exception as e:
             print(f"❌ 이슈 타입 조회 실패: {e}")
             return {}
 
 
-# 전역 인스턴스
-milvus_client = MilvusClient()
+@lru_cache(maxsize=1)
+def get_milvus_client() -> MilvusClient:
+    """
+    전역 MilvusClient 인스턴스 반환
+
+    import 시점이 아니라 첫 호출 시 한 번만 생성 (Milvus 연결 + OpenAI 클라이언트)
+    워커 프로세스/CLI는 실제로 Milvus를 쓸 때만 연결합니다.
+    """
+    return MilvusClient()
+
+
+def __getattr__(name: str):
+    """`from core.milvus_client import milvus_client` 호환: 첫 접근 시 get_milvus_client()로 생성"""
+    if name == "milvus_client":
+        return get_milvus_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,144 +6,203 @@ Jira Agent - Node Functions
 LangGraph 워크플로의 노드 함수들
 """
 
-import json
-from typing import Dict, Any
-
-from core.agent_utils import AgentState, openai_client, get_project_metadata
-from core.config import CHAT_MODEL
+import asyncio
+import re
+import traceback
+from datetime import date
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from langgraph.config import get_stream_writer
+
+from core.agent_utils import (
+    AgentState, PENDING_STAGES, HISTORY_PROMPT_TURNS, ProjectMeta, aopenai_client, aget_project_meta,
+    Slots, IntentParse, PendingIntentParse, ClarifyParse, json_schema_format
+)
+from core.cache import TTLCache
+from core.config import CHAT_MODEL, PARSE_CACHE_SIZE
 from core.jira import jira_client
-from core.milvus_client import milvus_client
+from core.milvus_client import get_milvus_client
 from core.executors import build_milvus_filter
 from core.executors import execute_search, execute_create, execute_update, execute_delete
+from core.utils import dumps_json, loads_json, parse_limit
 
 
-# ─────────────────────────────────────────────────────────
-# 노드 함수들
-# ─────────────────────────────────────────────────────────
+# 중단된 작업이 있을 때 LLM 없이 "continue"로 판단하는 stage별 입력 패턴 (None이면 LLM 판단)
+# - approve: approve_node의 APPROVE_WORDS/REJECT_WORDS와 같은 단어 ("취소"도 여기서는 거부 응답)
+# - check_slots: clarify 직후 자동 재검증 단계라 항상 continue
+STAGE_PATTERNS = {
+    "int_candidate": re.compile(r"^\s*(\d+|[A-Za-z][A-Za-z0-9]*-\d+)\s*$"),
+    "approve": re.compile(r"^\s*(y|yes|예|네|승인|n|no|아니오|취소)\s*$", re.IGNORECASE),
+    "clarify": None,
+}
+ALWAYS_CONTINUE_STAGES = frozenset({"check_slots"})
 
-def parse_intent_node(state: AgentState) -> AgentState:
-    """
-    사용자 입력 파싱 노드
+# Structured Outputs response_format (스키마는 한 번만 생성)
+INTENT_PARSE_FORMAT = json_schema_format(IntentParse)
+PENDING_INTENT_PARSE_FORMAT = json_schema_format(PendingIntentParse)
+CLARIFY_PARSE_FORMAT = json_schema_format(ClarifyParse)
 
-    LLM을 사용해 사용자 의도와 슬롯 추출
-    중단된 작업이 있으면 계속할지 새 작업인지 판단
-    """
-    user_input = state["user_input"]
-    history = state.get("history", [])
-    current_stage = state.get("stage")
+# 사용자 입력에 들어 있는 이슈 키 (parse_intent에서 LLM 호출과 동시에 존재 확인)
+ISSUE_KEY_IN_TEXT = re.compile(r"\b[A-Za-z][A-Za-z0-9]*-\d+\b")
+# 올바른 이슈 키 형식 (대문자로 정규화한 뒤 fullmatch, Milvus 필터/JQL에 넣기 전에 검증)
+ISSUE_KEY_RE = re.compile(r"[A-Z][A-Z0-9]*-\d+")
+# 이슈 키 존재 확인 JQL (ISSUE_KEY_RE로 검증된 키만 넣음)
+ISSUE_KEY_JQL = "key = {}"
 
-    print(f"\n[NODE: parse_intent] 입력: {user_input}, 현재 stage: {current_stage}")
+# 수정할 수 있는 필드 (update에 최소 1개 필요)
+UPDATE_FIELDS = frozenset({"summary", "description", "assignee", "priority", "status", "duedate"})
+# issue_key 없이 수정/삭제할 때 후보 검색에 쓰는 필드 (이슈 유형 슬롯은 "issuetype")
+SEARCH_CRITERIA = frozenset({"project_key", "keyword", "assignee", "priority", "issuetype"})
 
-    # ─────────────────────────────────────────────────────────
-    # 1. 중단된 작업이 있는 경우 - 계속할지 새 작업인지 판단
-    # ─────────────────────────────────────────────────────────
-    if current_stage in ["int_candidate", "approve", "clarify", "check_slots"]:
-        candidate_issues = state.get("candidate_issues", [])
-        slots = state.get("slots", {})
-        missing_fields = state.get("missing_fields", [])
 
-        # 컨텍스트 정보 구성
-        context_info = ""
-        if current_stage == "int_candidate":
-            context_info = f"후보 이슈 {len(candidate_issues)}개 중 선택 대기"
-        elif current_stage == "approve":
-            context_info = f"{state.get('intent', '')} 작업 승인 대기"
-        elif current_stage == "clarify":
-            context_info = f"누락된 정보 입력 대기: {', '.join(missing_fields)}"
-        elif current_stage == "check_slots":
-            context_info = f"{state.get('intent', '')} 작업의 슬롯 검증 진행 중"
+def _has_any_slot(slots: Dict[str, Any], fields: frozenset) -> bool:
+    """fields 중 값이 채워진 슬롯이 하나라도 있는지"""
+    return not fields.isdisjoint(key for key, value in slots.items() if value)
 
-        decision_prompt = f"""현재 상황:
-- 대기 중인 작업: {current_stage}
-- 작업 컨텍스트: {context_info}
-- 현재 슬롯: {json.dumps(slots, ensure_ascii=False)}
-- 사용자 입력: "{user_input}"
 
-판단:
-1. 사용자가 이전 작업을 계속하려는 것인가?
-   - int_candidate 단계: 숫자 입력(예: "1", "2") 또는 이슈 키(예: "KAN-1")
-   - approve 단계: 승인 의사(예: "yes", "확인", "승인", "ok") 또는 거부(예: "no", "취소")
-   - clarify 단계: 요청된 정보 제공(예: 프로젝트 키, 이슈 타입 등)
-   - check_slots 단계: clarify에서 정보를 업데이트한 직후, 자동으로 슬롯 재검증 진행 중 (항상 continue)
-   → "continue"
+# 입력 전체가 명시적 취소/재시작 명령일 때만 → "new_task"
+# ("결제 취소 버그", "처음부터 다시 만든 화면" 같은 문장 속 단어는 LLM이 판단)
+NEW_TASK_PATTERNS = re.compile(
+    r"^\s*(취소|다시\s*시작|새로\s*시작|처음부터(\s*다시)?|다른\s*프로젝트)"
+    r"\s*(해\s*줘|할래|하자|해)?\s*[.!~]*\s*$"
+)
+# 자유 입력을 받는 stage (새 작업 규칙을 적용하지 않고 LLM이 판단)
+FREE_TEXT_STAGES = frozenset({"clarify"})
 
-2. 아니면 완전히 새로운 Jira 작업을 시작하려는 것인가?
-   - 명시적 취소/재시작 요청(예: "취소", "다시 처음부터", "새로 시작")
-   - 전혀 다른 프로젝트/작업 언급(예: "다른 프로젝트에서 검색해줘")
-   → "new_task"
 
-답변을 JSON 형식으로:
-{{
-    "decision": "continue" or "new_task",
-    "reason": "판단 근거"
-}}
-"""
+def _classify_pending_input(stage: str, user_input: str) -> Optional[str]:
+    """
+    중단된 작업에 대한 입력을 규칙으로 판단 ("continue" | "new_task" | None=LLM 판단 필요)
 
-        try:
-            response = openai_client.chat.completions.create(
-                model=CHAT_MODEL,
-                messages=[{"role": "user", "content": decision_prompt}],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
+    stage 패턴을 먼저 확인하므로 approve 단계의 "취소"는 새 작업이 아니라 거부 응답입니다.
+    clarify 단계의 답변(제목/설명 등)은 어떤 문장이든 될 수 있어 규칙으로 새 작업 판단하지 않습니다.
+    """
+    if stage in ALWAYS_CONTINUE_STAGES:
+        return "continue"
 
-            decision_result = json.loads(response.choices[0].message.content)
-            decision = decision_result.get("decision", "continue")
+    pattern = STAGE_PATTERNS.get(stage)
+    if pattern is not None and pattern.match(user_input):
+        return "continue"
 
-            print(f"[NODE: parse_intent] 판단: {decision} - {decision_result.get('reason', '')}")
+    if stage not in FREE_TEXT_STAGES and NEW_TASK_PATTERNS.match(user_input):
+        return "new_task"
 
-            if decision == "new_task":
-                # 상태 초기화하고 새 작업으로 파싱
-                print("[NODE: parse_intent] 상태 초기화 후 새 작업 시작")
-                state["stage"] = None
-                state["candidate_issues"] = []
-                state["slots"] = {}
-                state["missing_fields"] = []
-                # 아래로 계속해서 새 의도 파싱
-            else:
-                # 기존 작업 계속 - stage 유지하고 리턴
-                print(f"[NODE: parse_intent] 기존 작업 계속: {current_stage}")
-                return state
+    return None
 
-        except Exception as e:
-            print(f"[NODE: parse_intent] 판단 오류: {e}, 기본적으로 계속으로 처리")
-            # 오류 시 안전하게 계속으로 처리
-            return state
 
-    # ─────────────────────────────────────────────────────────
-    # 2. 새 작업 의도 파싱 (기존 코드)
-    # ─────────────────────────────────────────────────────────
-    print(f"[NODE: parse_intent] 새 작업 파싱 시작")
+# ─────────────────────────────────────────────────────────
+# LLM 호출 (프롬프트 단위 LRU 캐시)
+# 시스템 프롬프트 + user 메시지에 stage/슬롯/입력/메타데이터/이력이 모두 들어가므로 메시지가 같으면 결과도 같음
+# 상태(dict)는 바뀔 수 있어 캐시하지 않고, 불변인 응답 JSON 문자열만 캐시
+# 예외는 캐시되지 않음 (다음 호출에서 재시도)
+# ─────────────────────────────────────────────────────────
+
+# (prefix, user_message, pending) → 응답 JSON (async 함수라 lru_cache 대신 TTLCache를 만료 없이 사용)
+_INTENT_PARSE_CACHE = TTLCache(maxsize=PARSE_CACHE_SIZE)
+
+# (role, content) 튜플 목록: 시스템 프롬프트 + few-shot (hashable이라 캐시 키로 그대로 사용)
+PromptPrefix = Tuple[Tuple[str, str], ...]
+
 
-    # 캐시된 프로젝트 메타데이터 가져오기 (첫 호출 시에만 Jira API 호출)
+async def _request_intent_parse(prefix: PromptPrefix, user_message: str, pending: bool = False) -> str:
+    """
+    의도/슬롯 파싱 LLM 호출 (응답 JSON 문자열 반환)
+
+    pending=True면 중단된 작업 계속 여부(decision)와 새 작업 파싱을 한 번에 받습니다
+    (PendingIntentParse). "new_task"면 같은 응답의 intent/slots를 그대로 쓰므로 두 번째 호출이 없습니다.
+    """
+    cache_key = (prefix, user_message, pending)
+    content = _INTENT_PARSE_CACHE.get(cache_key)
+    if content is not None:
+        return content
+
+    response = await aopenai_client.chat.completions.create(
+        model=CHAT_MODEL,
+        messages=[
+            *({"role": role, "content": text} for role, text in prefix),
+            {"role": "user", "content": user_message}
+        ],
+        temperature=0.1,
+        response_format=PENDING_INTENT_PARSE_FORMAT if pending else INTENT_PARSE_FORMAT
+    )
+    content = response.choices[0].message.content
+    _INTENT_PARSE_CACHE.set(cache_key, content)
+    return content
+
+
+# 이슈 키 존재 여부를 미리 확인할 의미가 있는 의도 (curd_check에서 조회)
+LOOKUP_INTENTS = ("update", "delete")
+
+
+def _lookup_intent(content: str, state: AgentState, pending: bool) -> Optional[str]:
+    """파싱 응답 기준으로 이번 턴에 curd_check까지 갈 의도 (계속이면 기존 작업 의도)"""
     try:
-        project_keys, project_issue_types = get_project_metadata()
+        parsed = loads_json(content)
+    except ValueError:
+        return None
+    if pending and parsed.get("decision") != "new_task":
+        return state.get("intent")
+    return parsed.get("intent")
+
 
-        project_list = ", ".join(project_keys) if project_keys else "프로젝트 키가 없음"
+async def _request_with_lookup(state: AgentState, prefix: PromptPrefix, user_message: str,
+                               meta: ProjectMeta, pending: bool = False) -> str:
+    """
+    의도 파싱 LLM 호출과 입력에 들어 있는 이슈 키의 존재 확인을 동시에 실행
 
-        # 프로젝트별 이슈 타입을 문자열로 포맷팅
-        issue_types_str = ""
-        for proj, types in project_issue_types.items():
-            issue_types_str += f"\n      • {proj}: {', '.join(types)}"
+    수정/삭제라면 curd_check에서 어차피 Milvus/Jira를 조회하므로,
+    LLM 응답을 기다리는 동안 미리 확인해서 state["issue_lookup"]에 남겨둡니다.
+    - 파싱 결과가 캐시에 있으면 조회 없이 바로 반환 (curd_check에서 조회)
+    - 키 앞부분이 실제 프로젝트 키일 때만 조회 ("gpt-4", "utf-8" 같은 단어 제외)
+    - 파싱 결과가 수정/삭제가 아니면 조회를 기다리지 않고 취소
+    """
+    match = ISSUE_KEY_IN_TEXT.search(state["user_input"])
+    issue_key = match.group(0).upper() if match else None
+    if (
+        issue_key is None
+        or issue_key.split("-", 1)[0] not in meta.keys_by_upper
+        or _INTENT_PARSE_CACHE.get((prefix, user_message, pending)) is not None
+    ):
+        return await _request_intent_parse(prefix, user_message, pending)
+
+    lookup = asyncio.ensure_future(_issue_exists(issue_key))
+    try:
+        content = await _request_intent_parse(prefix, user_message, pending)
+    except BaseException:
+        lookup.cancel()
+        raise
 
-        if not issue_types_str:
-            issue_types_str = "\n      (이슈 타입 정보 없음)"
+    if _lookup_intent(content, state, pending) not in LOOKUP_INTENTS:
+        lookup.cancel()
+        return content
 
+    try:
+        state["issue_lookup"] = {issue_key: await lookup}
     except Exception as e:
-        print(f"[WARN] 메타데이터 조회 실패: {e}")
-        project_list = "연결 되지 않음"
-        issue_types_str = "\n      (이슈 타입 정보 없음)"
-        project_keys = []
+        # 조회 실패는 무시 (curd_check에서 다시 조회)
+        print(f"[NODE: parse_intent] 이슈 키 사전 조회 실패: {e}")
+    return content
 
-    # 대화 이력 구성
-    context = ""
-    if history:
-        context = "\n\n**최근 대화 이력:**\n"
-        for i, h in enumerate(history[-4:], 1): # 최대 4개
-            context += f"{i}. 사용자: {h.get('user', '')}\n"
-            context += f"   응답: {h.get('response', '')}\n"
 
-    system_prompt = f"""당신은 Jira 이슈 관리 어시스턴트입니다.
+@lru_cache(maxsize=8)
+def _intent_prompt_head(
+    project_keys: Tuple[str, ...],
+    project_issue_types: Tuple[Tuple[str, Tuple[str, ...]], ...]
+) -> str:
+    """
+    의도/슬롯 파싱 시스템 프롬프트 (프로젝트 메타데이터가 같으면 한 번만 생성)
+
+    요청마다 바뀌는 대화 이력/사용자 입력은 user 메시지로 보내므로
+    시스템 프롬프트가 항상 같은 prefix가 되어 OpenAI 프롬프트 캐시가 적중합니다.
+    """
+    example_key = project_keys[0] if project_keys else "KAN"
+
+    # 프로젝트 키 → 이슈 타입 목록을 JSON 한 줄로 (bullet 나열보다 토큰이 적고 모델이 읽기 쉬움)
+    issue_types = dict(project_issue_types)
+    projects_json = dumps_json({"projects": {key: list(issue_types.get(key, ())) for key in project_keys}})
+
+    return f"""당신은 Jira 이슈 관리 어시스턴트입니다.
     사용자의 요청을 분석하여 다음을 JSON 형식으로 반환하세요:
 
     1. intent: 작업 의도
@@ -154,75 +213,321 @@ def parse_intent_node(state: AgentState) -> AgentState:
        - explain: Jira 사용법/기능 설명 요청 (예: "지라 사용법 알려줘", "이슈 생성 방법은?")
        - unknown: 파악 불가
 
+    사용 가능한 프로젝트와 프로젝트별 이슈 타입: {projects_json}
+
     2. slots: 추출된 정보
-       - project_key: 프로젝트 키 (사용 가능: {project_list})
+       - project_key: 프로젝트 키 (위 projects의 키만)
        - summary: 이슈 제목
        - description: 이슈 설명
        - assignee: 담당자 이름
        - status: 이슈 상태 (해야 할 일, 진행 중, 완료)
        - priority: 중요도 (High, Medium, Low)
        - duedate: 마감일 (YYYY-MM-DD)
-       - issuetype: 이슈 유형 (프로젝트별 사용 가능한 이슈 타입:{issue_types_str})
+       - issuetype: 이슈 유형 (해당 프로젝트의 이슈 타입)
        - keyword: 검색 키워드
-       - issue_key: 이슈 키 (예: {project_keys[0] if project_keys else 'KAN'}-1)
+       - issue_key: 이슈 키 (예: {example_key}-1)
        - limit: 검색 결과 개수 (예: "3개" -> 3, "5개" -> 5)
        - explain_topic: 설명이 필요한 주제 (예: "이슈 생성", "검색 방법", "전반적인 사용법")
 
     3. confidence: 확신도 (0-1)
     4. missing_fields: 필수 필드 중 누락된 것
 
-    **Intent 분류 예시:**
+    **예시:**
     - "지라 사용법 알려줘" -> intent: "explain", slots: {{"explain_topic": "전반적인 사용법"}}
-    - "이슈 생성하는 방법은?" -> intent: "explain", slots: {{"explain_topic": "이슈 생성 방법"}}
-    - "KAN 프로젝트에서 버그 찾아줘" -> intent: "search", slots: {{"project_key": "KAN", "keyword": "버그"}}
-    - "테스트 이슈 만들어줘" -> intent: "create", slots: {{"summary": "테스트 이슈"}}
+    - "{example_key}에서 버그 찾아줘" -> intent: "search", slots: {{"project_key": "{example_key}", "keyword": "버그"}}
 
-    **중요: project_key 설정 규칙**
-    - "{project_list[0] if project_keys else 'KAN'} 프로젝트에서 찾아줘" -> project_key: "{project_list[0] if project_keys else 'KAN'}" 설정
-    - "담당자 최민석인 이슈 찾아줘" -> project_key 설정 안 함 (전체 프로젝트 검색)
-    - "{project_list[0] if project_keys else 'KAN'}에서 버그 찾아줘" -> project_key: "{project_list[0] if project_keys else 'KAN'}" 설정
+    **project_key 설정 규칙:** 사용자가 프로젝트를 언급했을 때만 설정 (언급이 없으면 전체 프로젝트 검색)
 
     **생성(create)의 필수 필드:**
     - project_key, summary, issuetype
 
-    **자연어 슬롯 파싱 예시:**
-    - "KAN, 테스트 이슈, 작업" -> {{"project_key": "KAN", "summary": "테스트 이슈", "issuetype": "작업"}}
-    - "TEST 프로젝트에 버그 리포트를 버그로 만들어줘" -> {{"project_key": "TEST", "summary": "버그 리포트", "issuetype": "버그"}}
-    - "담당자 최민석인 이슈 3개 찾아줘" -> {{"assignee": "최민석", "limit": 3}}
-
-    **응답 형식 (JSON만):**
-    {{
-        "intent": "search",
-        "slots": {{}},
-        "confidence": 0.9,
-        "missing_fields": []
-    }}
-    {context}
+    요청마다 바뀌는 정보(대기 중인 작업, 최근 대화 이력)는 사용자 메시지에 함께 전달됩니다.
     """
 
-    try:
-        response = openai_client.chat.completions.create(
-            model=CHAT_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"사용자 요청: {user_input}"}
-            ],
-            temperature=0.1,
-            response_format={"type": "json_object"}
+
+# 중단된 작업이 있을 때 시스템 프롬프트 뒤에 붙이는 계속/새 작업 판단 규칙 (고정)
+PENDING_DECISION_RULES = """
+**decision 판단 (사용자 메시지의 "대기 중인 작업" 기준):**
+1. 사용자가 이전 작업을 계속하려는 것인가?
+   - int_candidate 단계: 숫자 입력(예: "1", "2") 또는 이슈 키(예: "KAN-1")
+   - approve 단계: 승인 의사(예: "yes", "확인", "승인", "ok") 또는 거부(예: "no", "취소")
+   - clarify 단계: 요청된 정보 제공(예: 프로젝트 키, 이슈 타입 등)
+   - check_slots 단계: clarify에서 정보를 업데이트한 직후, 자동으로 슬롯 재검증 진행 중 (항상 continue)
+   → "continue"
+
+2. 아니면 완전히 새로운 Jira 작업을 시작하려는 것인가?
+   - 명시적 취소/재시작 요청(예: "취소", "다시 처음부터", "새로 시작")
+   - 전혀 다른 프로젝트/작업 언급(예: "다른 프로젝트에서 검색해줘")
+   → "new_task"
+
+reason에는 판단 근거를 적고, intent/slots/confidence/missing_fields는 decision과 관계없이
+사용자 입력을 새 작업으로 봤을 때의 파싱 결과로 채우세요.
+"""
+
+
+# few-shot 예시: (사용자 요청, intent, slots, missing_fields), "{key}"는 첫 번째 프로젝트 키로 치환
+INTENT_FEW_SHOTS = (
+    ("이슈 생성하는 방법은?", "explain", {"explain_topic": "이슈 생성 방법"}, []),
+    ("테스트 이슈 만들어줘", "create", {"summary": "테스트 이슈"}, ["project_key", "issuetype"]),
+    ("담당자 최민석인 이슈 3개 찾아줘", "search", {"assignee": "최민석", "limit": 3}, []),
+    ("{key}, 테스트 이슈, 작업", "create", {"project_key": "{key}", "summary": "테스트 이슈", "issuetype": "작업"}, []),
+    ("{key} 프로젝트에 버그 리포트를 버그로 만들어줘", "create",
+     {"project_key": "{key}", "summary": "버그 리포트", "issuetype": "버그"}, []),
+)
+
+
+@lru_cache(maxsize=8)
+def _intent_few_shots(example_key: str) -> PromptPrefix:
+    """few-shot user/assistant 메시지 (assistant는 실제 응답과 같은 IntentParse JSON)"""
+    messages = []
+    for text, intent, slots, missing in INTENT_FEW_SHOTS:
+        slots = {k: v.format(key=example_key) if isinstance(v, str) else v for k, v in slots.items()}
+        parsed = IntentParse(intent=intent, slots=Slots(**slots), confidence=0.9, missing_fields=missing)
+        messages.append(("user", f"사용자 요청: {text.format(key=example_key)}"))
+        messages.append(("assistant", parsed.model_dump_json(exclude_none=True)))
+    return tuple(messages)
+
+
+def _build_intent_prompt(meta: ProjectMeta, pending: bool = False) -> PromptPrefix:
+    """
+    의도/슬롯 파싱 메시지 prefix (시스템 프롬프트 + few-shot)
+
+    pending이면 계속/새 작업 판단 규칙을 붙이고 few-shot은 생략합니다
+    (few-shot 응답은 IntentParse 형식이라 PendingIntentParse 응답과 맞지 않음).
+    """
+    # 프롬프트 캐시 키는 메타데이터 캐시를 채울 때 한 번만 계산됨
+    head = _intent_prompt_head(*meta.prompt_key)
+    if pending:
+        return (("system", head + PENDING_DECISION_RULES),)
+    example_key = meta.project_keys[0] if meta.project_keys else "KAN"
+    return (("system", head),) + _intent_few_shots(example_key)
+
+
+def _build_user_message(user_input: str, history: List[Dict[str, str]], state: Optional[AgentState] = None) -> str:
+    """
+    요청마다 바뀌는 정보 + 사용자 입력 (user 메시지)
+
+    Args:
+        user_input: 사용자 입력
+        history: 대화 이력 (최근 HISTORY_PROMPT_TURNS개만 사용)
+        state: 중단된 작업이 있으면 현재 상태 (대기 중인 작업 정보 포함)
+    """
+    parts = []
+
+    if state is not None:
+        current_stage = state.get("stage")
+        candidate_issues = state.get("candidate_issues", [])
+        missing_fields = state.get("missing_fields", [])
+
+        # 컨텍스트 정보 구성
+        context_info = ""
+        if current_stage == "int_candidate":
+            context_info = f"후보 이슈 {len(candidate_issues)}개 중 선택 대기"
+        elif current_stage == "approve":
+            context_info = f"{state.get('intent', '')} 작업 승인 대기"
+        elif current_stage == "clarify":
+            context_info = f"누락된 정보 입력 대기: {', '.join(missing_fields)}"
+        elif current_stage == "check_slots":
+            context_info = f"{state.get('intent', '')} 작업의 슬롯 검증 진행 중"
+
+        parts.append(
+            "**현재 상황 (대기 중인 작업이 있음):**\n"
+            f"- 대기 중인 작업: {current_stage}\n"
+            f"- 작업 컨텍스트: {context_info}\n"
+            f"- 현재 슬롯: {dumps_json(state.get('slots', {}))}\n"
         )
 
-        parsed = json.loads(response.choices[0].message.content)
+    # 대화 이력 구성
+    if history:
+        context = ["**최근 대화 이력:**"]
+        for i, h in enumerate(history[-HISTORY_PROMPT_TURNS:], 1):
+            context.append(f"{i}. 사용자: {h.get('user', '')}")
+            context.append(f"   응답: {h.get('response', '')}")
+        parts.append("\n".join(context) + "\n")
 
-        # 기존 슬롯과 병합 (clarify에서 돌아온 경우)
-        existing_slots = state.get("slots", {})
-        merged_slots = {**existing_slots, **parsed.get("slots", {})}
+    parts.append(f"사용자 요청: {user_input}")
+    return "\n".join(parts)
 
-        state["intent"] = parsed.get("intent", "explain_method")
-        state["slots"] = merged_slots
-        state["confidence"] = parsed.get("confidence", 0.0)
-        state["missing_fields"] = parsed.get("missing_fields", [])
 
-        print(f"[NODE: parse_intent] 의도: {state['intent']}, 슬롯: {merged_slots}")
+def _requested_fields(missing: List[str]) -> frozenset:
+    """clarify가 요청한 슬롯 이름 ("update_fields"는 수정 가능한 필드 전체)"""
+    requested = frozenset(missing)
+    return requested | UPDATE_FIELDS if "update_fields" in requested else requested
+
+
+def _is_filled(field: str, slots: Dict[str, Any]) -> bool:
+    """clarify가 요청한 필드가 채워졌는지 ("update_fields"는 수정 필드 1개 이상)"""
+    if field == "update_fields":
+        return _has_any_slot(slots, UPDATE_FIELDS)
+    return bool(slots.get(field))
+
+
+def _prefill_clarify_slots(state: AgentState, parsed: IntentParse) -> None:
+    """
+    clarify 대기 중 "continue"로 판단된 경우, 판단 호출에서 함께 받은 슬롯 중
+    clarify가 요청한 필드 값만 미리 채움 (clarify에서 같은 입력을 다시 LLM으로 파싱하지 않도록)
+    """
+    requested = _requested_fields(state.get("missing_fields", []))
+    values = {
+        field: value
+        for field, value in parsed.slots.model_dump(exclude_none=True).items()
+        if field in requested and value
+    }
+    if values:
+        state["slots"] = {**state.get("slots", {}), **values}
+        print(f"[NODE: parse_intent] clarify 슬롯 미리 채움: {values}")
+
+
+def _apply_intent_parse(state: AgentState, parsed: IntentParse) -> None:
+    """파싱 결과를 상태에 반영 (기존 슬롯과 병합)"""
+    # 기존 슬롯과 병합 (clarify에서 돌아온 경우, null 슬롯은 덮어쓰지 않음)
+    existing_slots = state.get("slots", {})
+    merged_slots = {**existing_slots, **parsed.slots.model_dump(exclude_none=True)}
+    if "limit" in merged_slots:
+        # 검색 개수는 여기서 한 번만 int로 변환 (execute_search는 int만 받음)
+        merged_slots["limit"] = parse_limit(merged_slots["limit"])
+
+    state["intent"] = parsed.intent
+    state["slots"] = merged_slots
+    state["confidence"] = parsed.confidence
+    state["missing_fields"] = parsed.missing_fields
+
+    print(f"[NODE: parse_intent] 의도: {state['intent']}, 슬롯: {merged_slots}")
+
+
+def _found_in_milvus(issue_key: str) -> bool:
+    """Milvus에 issue_key가 정확히 일치하는 이슈가 있는지 (기본 키 조회, 임베딩 없음)"""
+    return get_milvus_client().search_by_key(issue_key) is not None
+
+
+def _found_in_jira(issue_key: str) -> bool:
+    """Jira API로 이슈 존재 확인 (Milvus에 아직 동기화되지 않은 최신 이슈)"""
+    return bool(jira_client.search_issues(jql=ISSUE_KEY_JQL.format(issue_key), max_results=1))
+
+
+async def _issue_exists(issue_key: str) -> bool:
+    """
+    Milvus와 Jira를 동시에 조회해서 먼저 찾은 쪽 결과 사용
+
+    Milvus를 먼저 보고 없을 때 Jira를 보면 지연 시간이 두 조회의 합이 되므로,
+    둘 다 보내고 하나라도 찾으면 바로 반환합니다 (나머지는 취소).
+    두 조회가 모두 실패하면 마지막 예외를 그대로 전파합니다.
+    """
+    tasks = {
+        asyncio.ensure_future(asyncio.to_thread(_found_in_milvus, issue_key)): "Milvus",
+        asyncio.ensure_future(asyncio.to_thread(_found_in_jira, issue_key)): "Jira",
+    }
+    error = None
+    failed = 0
+    pending = set(tasks)
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    found = task.result()
+                except Exception as e:
+                    print(f"[NODE: curd_check] {tasks[task]} 조회 오류: {e}")
+                    error = e
+                    failed += 1
+                    continue
+
+                if found:
+                    print(f"[NODE: curd_check] 이슈 '{issue_key}' {tasks[task]}에서 발견")
+                    return True
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if failed == len(tasks):
+        raise error
+    return False
+
+
+# ─────────────────────────────────────────────────────────
+# 노드 함수들
+# ─────────────────────────────────────────────────────────
+
+async def parse_intent_node(state: AgentState) -> AgentState:
+    """
+    사용자 입력 파싱 노드
+
+    LLM을 사용해 사용자 의도와 슬롯 추출
+    중단된 작업이 있으면 계속할지 새 작업인지 판단
+    (규칙으로 판단할 수 없으면 판단 + 새 작업 파싱을 LLM 호출 한 번으로 처리)
+    """
+    # 앞뒤 공백만 다른 입력은 같은 입력으로 취급 (LLM 캐시 적중률 ↑)
+    user_input = state["user_input"].strip()
+    history = state.get("history", [])
+    current_stage = state.get("stage")
+
+    print(f"\n[NODE: parse_intent] 입력: {user_input}, 현재 stage: {current_stage}")
+
+    parsed: Optional[IntentParse] = None
+    # 이전 턴에서 확인한 존재 여부는 버림 (그 사이 이슈가 삭제/생성됐을 수 있음)
+    state["issue_lookup"] = {}
+
+    # ─────────────────────────────────────────────────────────
+    # 1. 중단된 작업이 있는 경우 - 계속할지 새 작업인지 판단
+    # ─────────────────────────────────────────────────────────
+    if current_stage in PENDING_STAGES:
+        decision = _classify_pending_input(current_stage, user_input)
+        if decision is not None:
+            print(f"[NODE: parse_intent] 규칙 판단: {decision}")
+        else:
+            try:
+                meta = await aget_project_meta()
+                pending = PendingIntentParse.model_validate_json(await _request_with_lookup(
+                    state,
+                    _build_intent_prompt(meta, pending=True),
+                    _build_user_message(user_input, history, state),
+                    meta,
+                    pending=True
+                ))
+                decision = pending.decision
+                print(f"[NODE: parse_intent] 판단: {decision} - {pending.reason}")
+                parsed = IntentParse(
+                    intent=pending.intent,
+                    slots=pending.slots,
+                    confidence=pending.confidence,
+                    missing_fields=pending.missing_fields
+                )
+            except Exception as e:
+                print(f"[NODE: parse_intent] 판단 오류: {e}, 기본적으로 계속으로 처리")
+                # 오류 시 안전하게 계속으로 처리
+                return state
+
+        if decision != "new_task":
+            # 기존 작업 계속 - stage 유지하고 리턴
+            # clarify 대기 중이면 함께 받은 슬롯 중 요청한 필드만 사용 (나머지 파싱 결과는 버림)
+            if current_stage == "clarify" and parsed is not None:
+                _prefill_clarify_slots(state, parsed)
+            print(f"[NODE: parse_intent] 기존 작업 계속: {current_stage}")
+            return state
+
+        # 상태 초기화하고 새 작업으로 파싱
+        print("[NODE: parse_intent] 상태 초기화 후 새 작업 시작")
+        state["stage"] = None
+        state["candidate_issues"] = []
+        state["slots"] = {}
+        state["missing_fields"] = []
+
+    # ─────────────────────────────────────────────────────────
+    # 2. 새 작업 의도 파싱 (판단 호출에서 이미 받았으면 재사용)
+    # ─────────────────────────────────────────────────────────
+    try:
+        if parsed is None:
+            print(f"[NODE: parse_intent] 새 작업 파싱 시작")
+            meta = await aget_project_meta()
+            parsed = IntentParse.model_validate_json(await _request_with_lookup(
+                state,
+                _build_intent_prompt(meta),
+                _build_user_message(user_input, history),
+                meta
+            ))
+
+        _apply_intent_parse(state, parsed)
 
     except Exception as e:
         print(f"[NODE: parse_intent] 오류: {e}")
@@ -232,7 +537,37 @@ def parse_intent_node(state: AgentState) -> AgentState:
     return state
 
 
-def explain_method_node(state: AgentState) -> AgentState:
+EXPLAIN_SYSTEM_PROMPT = """당신은 Jira 이슈 관리 전문가입니다.
+    사용자가 요청한 Jira 기능에 대해 친절하고 명확하게 설명해주세요.
+
+    설명 시 포함할 내용:
+    1. 해당 기능의 목적과 사용 시기
+    2. 구체적인 사용 방법 (단계별)
+    3. 실제 사용 예시
+    4. 주의사항이나 팁
+
+    간결하고 이해하기 쉽게 작성하되, 너무 길지 않게 (5-10문장) 설명해주세요.
+    마크다운 형식을 사용해도 좋습니다.
+    """
+
+
+async def explain_method_node_stream(explain_topic: str) -> AsyncIterator[str]:
+    """Jira 기능 설명을 LLM 스트리밍 응답의 토큰 단위로 yield"""
+    response = await aopenai_client.chat.completions.create(
+        model=CHAT_MODEL,
+        messages=[
+            {"role": "system", "content": EXPLAIN_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Jira에서 '{explain_topic}'에 대해 설명해주세요."}
+        ],
+        temperature=0.7,
+        stream=True
+    )
+    async for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def explain_method_node(state: AgentState) -> AgentState:
     """
     기능 설명 노드
 
@@ -264,35 +599,22 @@ def explain_method_node(state: AgentState) -> AgentState:
         print(f"[NODE: explain_method] unknown 의도 -> 기본 안내 메시지")
         return state
 
-    # explain 의도일 때는 LLM으로 설명 생성
-    system_prompt = """당신은 Jira 이슈 관리 전문가입니다.
-    사용자가 요청한 Jira 기능에 대해 친절하고 명확하게 설명해주세요.
-
-    설명 시 포함할 내용:
-    1. 해당 기능의 목적과 사용 시기
-    2. 구체적인 사용 방법 (단계별)
-    3. 실제 사용 예시
-    4. 주의사항이나 팁
-
-    간결하고 이해하기 쉽게 작성하되, 너무 길지 않게 (5-10문장) 설명해주세요.
-    마크다운 형식을 사용해도 좋습니다.
-    """
-
-    user_prompt = f"Jira에서 '{explain_topic}'에 대해 설명해주세요."
+    # explain 의도일 때는 LLM으로 설명 생성 (토큰 단위로 스트리밍하면서 누적)
+    # /chat/stream(stream_mode="custom")이면 토큰이 바로 클라이언트로 전달되고,
+    # /chat(ainvoke)이면 writer가 아무것도 하지 않아 기존처럼 전체 응답만 반환됨
+    writer = get_stream_writer()
+    header = f"📚 **{explain_topic}**\n\n"
+    footer = "\n\n궁금한 점이 더 있으시면 말씀해주세요!"
 
     try:
-        response = openai_client.chat.completions.create(
-            model=CHAT_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7
-        )
-
-        explanation = response.choices[0].message.content
-
-        state["response"] = f"📚 **{explain_topic}**\n\n{explanation}\n\n궁금한 점이 더 있으시면 말씀해주세요!"
+        writer({"token": header})
+        parts = []
+        async for token in explain_method_node_stream(explain_topic):
+            parts.append(token)
+            writer({"token": token})
+        writer({"token": footer})
+
+        state["response"] = header + "".join(parts) + footer
         state["message"] = state["response"]
         state["stage"] = "done"
 
@@ -333,13 +655,7 @@ def check_slots_node(state: AgentState) -> AgentState:
     elif intent == "update":
         if not slots.get("issue_key"):
             # issue_key가 없지만 다른 검색 조건이 있으면 find_candidates로
-            has_search_criteria = any([
-                slots.get("project_key"),
-                slots.get("keyword"),
-                slots.get("assignee"),
-                slots.get("priority"),
-                slots.get("issue_type")
-            ])
+            has_search_criteria = _has_any_slot(slots, SEARCH_CRITERIA)
 
             if has_search_criteria:
                 # 후보군 찾기로 이동
@@ -353,8 +669,7 @@ def check_slots_node(state: AgentState) -> AgentState:
 
         # issue_key는 있는데 수정할 필드가 하나도 없으면
         if not missing:  # issue_key는 있음
-            update_fields = ["summary", "description", "assignee", "priority", "status", "duedate"]
-            has_update_field = any([slots.get(f) for f in update_fields])
+            has_update_field = _has_any_slot(slots, UPDATE_FIELDS)
 
             if not has_update_field:
                 # 수정할 내용이 없음
@@ -365,13 +680,7 @@ def check_slots_node(state: AgentState) -> AgentState:
     elif intent == "delete":
         if not slots.get("issue_key"):
             # issue_key가 없지만 다른 검색 조건이 있으면 find_candidates로
-            has_search_criteria = any([
-                slots.get("project_key"),
-                slots.get("keyword"),
-                slots.get("assignee"),
-                slots.get("priority"),
-                slots.get("issue_type")
-            ])
+            has_search_criteria = _has_any_slot(slots, SEARCH_CRITERIA)
 
             if has_search_criteria:
                 # 후보군 찾기로 이동
@@ -401,13 +710,156 @@ def check_slots_node(state: AgentState) -> AgentState:
     return state
 
 
-def clarify_node(state: AgentState) -> AgentState:
+# ─────────────────────────────────────────────────────────
+# clarify 단일 필드 파서 (형식이 정해진 필드는 LLM 없이 파싱, 실패하면 None → LLM)
+# ─────────────────────────────────────────────────────────
+
+_DUEDATE_FULLMATCH = re.compile(r"\d{4}-\d{2}-\d{2}")
+# 소문자 입력 → Jira 값
+_PRIORITY_VALUES = {"high": "High", "medium": "Medium", "low": "Low"}
+_STATUS_VALUES = {"해야 할 일": "해야 할 일", "진행 중": "진행 중", "완료": "완료"}
+
+
+def _parse_issue_key(value: str) -> Optional[str]:
+    """이슈 키 (예: kan-1 → KAN-1)"""
+    value = value.upper()
+    return value if ISSUE_KEY_RE.fullmatch(value) else None
+
+
+def _parse_duedate(value: str) -> Optional[str]:
+    """마감일 (YYYY-MM-DD, 실제로 있는 날짜만)"""
+    if not _DUEDATE_FULLMATCH.fullmatch(value):
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        return None
+
+
+def _parse_priority(value: str) -> Optional[str]:
+    """중요도 (대소문자 무시)"""
+    return _PRIORITY_VALUES.get(value.lower())
+
+
+def _parse_status(value: str) -> Optional[str]:
+    """상태 (공백 차이 무시)"""
+    return _STATUS_VALUES.get(" ".join(value.split()))
+
+
+def _parse_project_key(value: str, meta: ProjectMeta) -> Optional[str]:
+    """프로젝트 키 (캐시된 프로젝트 목록에 있는 키만, 대소문자 무시)"""
+    return meta.keys_by_upper.get(value.upper())
+
+
+# (입력, 프로젝트 메타데이터) → 슬롯 값 (메타데이터는 clarify_node가 이미 가져온 것을 전달)
+FIELD_PARSERS: Dict[str, Callable[[str, ProjectMeta], Optional[str]]] = {
+    "issue_key": lambda value, meta: _parse_issue_key(value),
+    "project_key": _parse_project_key,
+    "duedate": lambda value, meta: _parse_duedate(value),
+    "priority": lambda value, meta: _parse_priority(value),
+    "status": lambda value, meta: _parse_status(value),
+}
+
+
+def _parse_single_field(missing: List[str], user_input: str, meta: ProjectMeta) -> Optional[Dict[str, str]]:
+    """누락 필드가 하나이고 FIELD_PARSERS로 파싱되면 {필드: 값}, 아니면 None (LLM 파싱)"""
+    if len(missing) != 1 or missing[0] not in FIELD_PARSERS:
+        return None
+    value = FIELD_PARSERS[missing[0]](user_input.strip(), meta)
+    return {missing[0]: value} if value is not None else None
+
+
+# ─────────────────────────────────────────────────────────
+# clarify 필드 안내 템플릿 (LLM 파싱 프롬프트용 / 사용자 메시지용)
+# 프로젝트에 따라 바뀌는 부분만 메타데이터(ProjectMeta)에서 채움
+# ─────────────────────────────────────────────────────────
+
+FieldTemplate = Callable[[Dict[str, Any], ProjectMeta], str]
+
+
+def _example_issue_key(meta: ProjectMeta) -> str:
+    """이슈 키 예시 (첫 번째 프로젝트 기준)"""
+    return f"{meta.project_keys[0]}-1" if meta.project_keys else "KAN-1"
+
+
+def _slot_issue_types(slots: Dict[str, Any], meta: ProjectMeta) -> Optional[Tuple[str, str]]:
+    """슬롯의 project_key와 그 프로젝트의 이슈 유형 목록 (project_key를 모르면 None)"""
+    project_key = slots.get("project_key")
+    if project_key and project_key in meta.project_issue_types:
+        return project_key, ", ".join(meta.project_issue_types[project_key])
+    return None
+
+
+def _prompt_issuetype(slots: Dict[str, Any], meta: ProjectMeta) -> str:
+    found = _slot_issue_types(slots, meta)
+    return f"- issuetype: 이슈 유형 ({found[0]}: {found[1]})" if found else "- issuetype: 이슈 유형"
+
+
+def _message_issuetype(slots: Dict[str, Any], meta: ProjectMeta) -> str:
+    # 이미 project_key가 있으면 해당 프로젝트의 이슈 타입만 표시
+    found = _slot_issue_types(slots, meta)
+    return f"  • 이슈 유형 ({found[0]} 프로젝트: {found[1]})" if found else "  • 이슈 유형 (프로젝트를 먼저 지정해주세요)"
+
+
+FIELD_PROMPT_TMPL: Dict[str, FieldTemplate] = {
+    "project_key": lambda slots, meta: f"- project_key: 프로젝트 키 (사용 가능: {meta.project_list or '없습니다.'})",
+    "issuetype": _prompt_issuetype,
+    "issue_key": lambda slots, meta: f"- issue_key: 이슈 키 (예: {_example_issue_key(meta)})",
+    "summary": lambda slots, meta: "- summary: 이슈 제목",
+    "description": lambda slots, meta: "- description: 이슈 설명",
+    "assignee": lambda slots, meta: "- assignee: 담당자 이름",
+    "priority": lambda slots, meta: "- priority: 중요도 (High, Medium, Low)",
+    "duedate": lambda slots, meta: "- duedate: 마감일 (YYYY-MM-DD)",
+}
+
+FIELD_MESSAGE_TMPL: Dict[str, FieldTemplate] = {
+    "project_key": lambda slots, meta: f"  • 프로젝트 키 (사용 가능: {meta.project_list or '없습니다.'})",
+    "issuetype": _message_issuetype,
+    "issue_key": lambda slots, meta: f"  • 이슈 키 (예: {_example_issue_key(meta)})",
+    # update 작업에서 수정할 필드 요청
+    "update_fields": lambda slots, meta: (
+        "  • 수정할 내용 (예: 담당자를 홍길동으로, 상태를 완료로, 제목을 새 제목으로)\n"
+        "    - 가능한 필드: 제목(summary), 설명(description), 담당자(assignee), 상태(status), 우선순위(priority), 마감일(duedate)"
+    ),
+    "summary": lambda slots, meta: "  • 이슈 제목",
+    "description": lambda slots, meta: "  • 이슈 설명",
+    "assignee": lambda slots, meta: "  • 담당자 이름",
+    "priority": lambda slots, meta: "  • 중요도 (High, Medium, Low)",
+    "duedate": lambda slots, meta: "  • 마감일 (YYYY-MM-DD)",
+}
+
+
+def _render_fields(
+    templates: Dict[str, FieldTemplate],
+    fallback: str,
+    fields: List[str],
+    slots: Dict[str, Any],
+    meta: ProjectMeta
+) -> List[str]:
+    """필드별 안내 줄 목록 (템플릿이 없는 필드는 fallback.format(필드 이름))"""
+    return [
+        templates[field](slots, meta) if field in templates else fallback.format(field)
+        for field in fields
+    ]
+
+
+# clarify 파싱 지시 (고정 system 메시지, 작업/슬롯/입력은 user 메시지로)
+CLARIFY_SYSTEM_PROMPT = """사용자가 누락된 정보를 제공했습니다.
+
+사용자 입력에서 누락된 필드 값을 추출하세요.
+- 여러 개 입력되었으면 모두 추출
+- 입력되지 않은 필드는 null로
+- status는 해야 할 일/진행 중/완료 중 하나
+"""
+
+
+async def clarify_node(state: AgentState) -> AgentState:
     """
     정보 요청 및 파싱 노드
 
     두 가지 모드로 동작:
     1. 첫 호출 (missing_fields 있음): 메시지 생성하고 END
-    2. 두 번째 호출 (user_input 있음): LLM으로 파싱해서 슬롯 채우기
+    2. 두 번째 호출 (user_input 있음): 규칙 파서 → parse_intent가 채운 슬롯 → LLM 순으로 슬롯 채우기
     """
     intent = state.get("intent")
     slots = state.get("slots", {})
@@ -416,14 +868,8 @@ def clarify_node(state: AgentState) -> AgentState:
 
     print(f"\n[NODE: clarify] 의도: {intent}, 누락 필드: {missing}, 입력: {user_input}")
 
-    # 캐시된 프로젝트 메타데이터 가져오기
-    try:
-        project_keys, project_issue_types = get_project_metadata()
-        project_list = ", ".join(project_keys)
-    except:
-        project_keys = []
-        project_issue_types = {}
-        project_list = "없습니다."
+    # 캐시된 프로젝트 메타데이터 가져오기 (만료 시 Jira 조회는 스레드에서)
+    meta = await aget_project_meta()
 
     # ─────────────────────────────────────────────────────────
     # Case 1: 사용자 입력이 있고, 이미 응답이 생성되었으면 LLM으로 파싱
@@ -431,77 +877,47 @@ def clarify_node(state: AgentState) -> AgentState:
     # ─────────────────────────────────────────────────────────
     existing_response = state.get("response", "")
     if user_input and missing and existing_response:
-        print(f"[NODE: clarify] LLM 파싱 시작: {user_input}")
-
-        # 누락된 필드 설명
-        field_descriptions = []
-        for field in missing:
-            if field == "project_key":
-                field_descriptions.append(f"- project_key: 프로젝트 키 (사용 가능: {project_list})")
-            elif field == "issuetype":
-                project_key = slots.get("project_key")
-                if project_key and project_key in project_issue_types:
-                    types = ", ".join(project_issue_types[project_key])
-                    field_descriptions.append(f"- issuetype: 이슈 유형 ({project_key}: {types})")
-                else:
-                    field_descriptions.append(f"- issuetype: 이슈 유형")
-            elif field == "issue_key":
-                example = f"{project_keys[0]}-1" if project_keys else "KAN-1"
-                field_descriptions.append(f"- issue_key: 이슈 키 (예: {example})")
-            elif field == "summary":
-                field_descriptions.append(f"- summary: 이슈 제목")
-            elif field == "description":
-                field_descriptions.append(f"- description: 이슈 설명")
-            elif field == "assignee":
-                field_descriptions.append(f"- assignee: 담당자 이름")
-            elif field == "priority":
-                field_descriptions.append(f"- priority: 중요도 (High, Medium, Low)")
-            elif field == "duedate":
-                field_descriptions.append(f"- duedate: 마감일 (YYYY-MM-DD)")
-            else:
-                field_descriptions.append(f"- {field}")
+        # 누락 필드가 하나뿐이고 형식이 정해진 필드면 LLM 없이 규칙으로 파싱
+        updates = _parse_single_field(missing, user_input, meta)
+        if updates is not None:
+            print(f"[NODE: clarify] 규칙 파싱: {updates}")
+        elif all(_is_filled(field, slots) for field in missing):
+            # parse_intent의 판단 호출에서 이미 채움 → LLM 재호출 없음
+            updates = {}
+            print(f"[NODE: clarify] parse_intent에서 채운 슬롯 사용")
+        else:
+            print(f"[NODE: clarify] LLM 파싱 시작: {user_input}")
 
-        parse_prompt = f"""사용자가 누락된 정보를 제공했습니다.
+            # 누락된 필드 설명
+            field_descriptions = _render_fields(FIELD_PROMPT_TMPL, "- {}", missing, slots, meta)
 
-현재 작업: {intent}
-기존 슬롯: {json.dumps(slots, ensure_ascii=False)}
+            parse_message = f"""현재 작업: {intent}
+기존 슬롯: {dumps_json(slots)}
 누락된 필드:
 {chr(10).join(field_descriptions)}
 
 사용자 입력: "{user_input}"
-
-사용자 입력에서 누락된 필드 값을 추출하세요.
-- 여러 개 입력되었으면 모두 추출
-- 입력되지 않은 필드는 null로
-
-JSON 형식으로 답변:
-{{
-    "project_key": "추출된 값 or null",
-    "issuetype": "추출된 값 or null",
-    "issue_key": "추출된 값 or null",
-    "summary": "추출된 값 or null",
-    "description": "추출된 값 or null",
-    "assignee": "추출된 값 or null",
-    "status": "추출된 값 or null (해야 할 일/진행 중/완료)",
-    "priority": "추출된 값 or null",
-    "duedate": "추출된 값 or null"
-}}
 """
 
         try:
-            response = openai_client.chat.completions.create(
-                model=CHAT_MODEL,
-                messages=[{"role": "user", "content": parse_prompt}],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
-
-            parsed = json.loads(response.choices[0].message.content)
-            print(f"[NODE: clarify] 파싱 결과: {parsed}")
+            if updates is None:
+                response = await aopenai_client.chat.completions.create(
+                    model=CHAT_MODEL,
+                    messages=[
+                        {"role": "system", "content": CLARIFY_SYSTEM_PROMPT},
+                        {"role": "user", "content": parse_message}
+                    ],
+                    temperature=0.1,
+                    response_format=CLARIFY_PARSE_FORMAT
+                )
+
+                parsed = ClarifyParse.model_validate_json(response.choices[0].message.content)
+                print(f"[NODE: clarify] 파싱 결과: {parsed}")
+                updates = parsed.model_dump(exclude_none=True)
 
             # 슬롯 업데이트 (null이 아닌 값만)
-            for field, value in parsed.items():
-                if value and value != "null":
+            for field, value in updates.items():
+                if value:
                     slots[field] = value
                     print(f"[NODE: clarify] 슬롯 업데이트: {field} = {value}")
 
@@ -521,8 +937,7 @@ JSON 형식으로 답변:
                     new_missing.append("issue_key")
                 else:
                     # issue_key는 있는데 수정할 필드 체크
-                    update_fields = ["summary", "description", "assignee", "priority", "status", "duedate"]
-                    has_update_field = any([slots.get(f) for f in update_fields])
+                    has_update_field = _has_any_slot(slots, UPDATE_FIELDS)
                     if not has_update_field:
                         new_missing.append("update_fields")
 
@@ -562,49 +977,12 @@ JSON 형식으로 답변:
     # ─────────────────────────────────────────────────────────
     # Case 2: 첫 호출 - 메시지 생성하고 END
     # ─────────────────────────────────────────────────────────
-    response = f"💬 **{intent}** 작업을 위해 다음 정보가 필요합니다:\n\n"
-
-    for field in missing:
-        if field == "project_key":
-            response += f"  • 프로젝트 키 (사용 가능: {project_list})\n"
-
-        elif field == "issuetype":
-            # 이미 project_key가 있으면 해당 프로젝트의 이슈 타입만 표시
-            project_key = slots.get("project_key")
-            if project_key and project_key in project_issue_types:
-                types = ", ".join(project_issue_types[project_key])
-                response += f"  • 이슈 유형 ({project_key} 프로젝트: {types})\n"
-            else:
-                response += f"  • 이슈 유형 (프로젝트를 먼저 지정해주세요)\n"
-
-        elif field == "issue_key":
-            example = f"{project_keys[0]}-1" if project_keys else "KAN-1"
-            response += f"  • 이슈 키 (예: {example})\n"
-
-        elif field == "update_fields":
-            # update 작업에서 수정할 필드 요청
-            response += f"  • 수정할 내용 (예: 담당자를 홍길동으로, 상태를 완료로, 제목을 새 제목으로)\n"
-            response += f"    - 가능한 필드: 제목(summary), 설명(description), 담당자(assignee), 상태(status), 우선순위(priority), 마감일(duedate)\n"
-
-        elif field == "summary":
-            response += f"  • 이슈 제목\n"
-
-        elif field == "description":
-            response += f"  • 이슈 설명\n"
-
-        elif field == "assignee":
-            response += f"  • 담당자 이름\n"
-
-        elif field == "priority":
-            response += f"  • 중요도 (High, Medium, Low)\n"
+    # 줄 단위로 모아서 한 번에 join (문자열 += 반복 복사 방지)
+    lines = [f"💬 **{intent}** 작업을 위해 다음 정보가 필요합니다:", ""]
 
-        elif field == "duedate":
-            response += f"  • 마감일 (YYYY-MM-DD)\n"
-
-        else:
-            response += f"  • {field}\n"
-
-    response += "\n입력해주세요:"
+    lines += _render_fields(FIELD_MESSAGE_TMPL, "  • {}", missing, slots, meta)
+    lines += ["", "입력해주세요:"]
+    response = "\n".join(lines)
 
     state["response"] = response
     state["message"] = response
@@ -613,6 +991,18 @@ JSON 형식으로 답변:
     return state
 
 
+def _format_candidate_rows(results: List[Dict[str, Any]]) -> str:
+    """후보 이슈 목록 문자열 (항목마다 빈 줄로 구분)"""
+    rows = []
+    for i, result in enumerate(results, 1):
+        rows.append(f"[{i}] {result['key']}: {result['summary']}")
+        rows.append(f"    - 프로젝트: {result['project']}, 상태: {result['status']}")
+        if result.get('assignee'):
+            rows.append(f"    - 담당자: {result['assignee']}")
+        rows.append("")
+    return "\n".join(rows) + "\n" if rows else ""
+
+
 def find_candidates_node(state: AgentState) -> AgentState:
     """
     후보 이슈 찾기 노드
@@ -635,11 +1025,16 @@ def find_candidates_node(state: AgentState) -> AgentState:
     print(f"[NODE: find_candidates] Milvus 검색: keyword='{keyword}', filter={filter_expr}")
 
     try:
-        results = milvus_client.search(
-            query_text=keyword if keyword else "이슈",
-            filter_expr=filter_expr,
-            limit=10  # 최대 10개 후보
-        )
+        # 키워드가 없으면 필터 조회 (임베딩/벡터 검색 생략), 최대 10개 후보
+        if keyword:
+            results = get_milvus_client().search(
+                query_text=keyword,
+                filter_expr=filter_expr,
+                limit=10,
+                latency_budget=state.get("latency_budget")
+            )
+        else:
+            results = get_milvus_client().query(filter_expr, limit=10)
 
         if not results or len(results) == 0:
             # 후보가 없음 -> issue_key 직접 입력 요청
@@ -668,18 +1063,12 @@ def find_candidates_node(state: AgentState) -> AgentState:
             # 후보가 여러 개 -> 사용자 선택 요청 (int_candidate로 이동)
             print(f"[NODE: find_candidates] 후보 {len(results)}개 발견 -> int_candidate로 이동")
 
-            response = f"🔍 {len(results)}개의 이슈를 찾았습니다. 어떤 이슈를 "
-            response += "수정" if intent == "update" else "삭제"
-            response += "하시겠습니까?\n\n"
-
-            for i, result in enumerate(results, 1):
-                response += f"[{i}] {result['key']}: {result['summary']}\n"
-                response += f"    - 프로젝트: {result['project']}, 상태: {result['status']}\n"
-                if result.get('assignee'):
-                    response += f"    - 담당자: {result['assignee']}\n"
-                response += "\n"
-
-            response += "번호를 입력하거나, 이슈 키를 직접 입력해주세요:"
+            action = "수정" if intent == "update" else "삭제"
+            response = "".join((
+                f"🔍 {len(results)}개의 이슈를 찾았습니다. 어떤 이슈를 {action}하시겠습니까?\n\n",
+                _format_candidate_rows(results),
+                "번호를 입력하거나, 이슈 키를 직접 입력해주세요:",
+            ))
 
             state["response"] = response
             state["message"] = response
@@ -723,46 +1112,43 @@ def int_candidate_node(state: AgentState) -> AgentState:
 
     user_choice = user_input.strip()
 
-    # 숫자인 경우 (1, 2, 3, ...)
-    if user_choice.isdigit():
+    # 숫자인 경우 (1, 2, 3, ...) - 변환 실패(ValueError)면 이슈 키로 처리
+    try:
         idx = int(user_choice) - 1
-        if 0 <= idx < len(candidate_issues):
-            selected = candidate_issues[idx]
-            issue_key = selected.get("key")
-            print(f"[NODE: int_candidate] 번호 선택: {issue_key}")
-
-            # 선택된 issue_key를 슬롯에 저장
-            state["slots"]["issue_key"] = issue_key
-            state["candidate_issues"] = []
-
-            # check_slots로 이동 (다음 요청 시 실행됨)
-            state["stage"] = "check_slots"
-            state["response"] = f"✅ {issue_key} 선택되었습니다."
+    except ValueError:
+        # issue_key 직접 입력 (예: KAN-1, 소문자도 허용)
+        issue_key = _parse_issue_key(user_choice)
+        if issue_key is None:
+            # 번호도 이슈 키도 아님 - 다시 입력 대기 (END)
+            print(f"[NODE: int_candidate] 잘못된 입력: {user_choice}")
+            state["stage"] = "int_candidate"
+            state["response"] = f"❌ 번호(1-{len(candidate_issues)}) 또는 이슈 키(예: KAN-1)를 입력해주세요."
             state["message"] = state["response"]
-            print(f"[NODE: int_candidate] check_slots로 설정 (다음 요청에서 실행)")
             return state
-        else:
+        print(f"[NODE: int_candidate] 직접 입력: {issue_key}")
+    else:
+        if not 0 <= idx < len(candidate_issues):
             # 잘못된 번호 - 다시 입력 대기 (END)
             state["stage"] = "int_candidate"
             state["response"] = f"❌ 잘못된 번호입니다. 1-{len(candidate_issues)} 사이의 숫자를 입력해주세요."
             state["message"] = state["response"]
             return state
-    else:
-        # issue_key 직접 입력 (예: KAN-1)
-        print(f"[NODE: int_candidate] 직접 입력: {user_choice}")
-
-        state["slots"]["issue_key"] = user_choice
-        state["candidate_issues"] = []
-
-        # check_slots로 이동 (다음 요청 시 실행됨)
-        state["stage"] = "check_slots"
-        state["response"] = f"✅ {user_choice} 선택되었습니다."
-        state["message"] = state["response"]
-        print(f"[NODE: int_candidate] check_slots로 설정 (다음 요청에서 실행)")
-        return state
+        issue_key = candidate_issues[idx].get("key")
+        print(f"[NODE: int_candidate] 번호 선택: {issue_key}")
+
+    # 선택된 issue_key를 슬롯에 저장
+    state["slots"]["issue_key"] = issue_key
+    state["candidate_issues"] = []
+
+    # check_slots로 이동 (다음 요청 시 실행됨)
+    state["stage"] = "check_slots"
+    state["response"] = f"✅ {issue_key} 선택되었습니다."
+    state["message"] = state["response"]
+    print(f"[NODE: int_candidate] check_slots로 설정 (다음 요청에서 실행)")
+    return state
 
 
-def curd_check_node(state: AgentState) -> AgentState:
+async def curd_check_node(state: AgentState) -> AgentState:
     """
     CURD 데이터 검증 노드
 
@@ -778,12 +1164,8 @@ def curd_check_node(state: AgentState) -> AgentState:
 
     print(f"\n[NODE: curd_check] 의도: {intent}, 슬롯: {slots}")
 
-    # 캐시된 프로젝트 메타데이터 가져오기
-    try:
-        project_keys, _ = get_project_metadata()
-    except Exception as e:
-        print(f"[NODE: curd_check] 메타데이터 조회 실패: {e}")
-        project_keys = []
+    # 캐시된 프로젝트 메타데이터 가져오기 (만료 시 Jira 조회는 스레드에서)
+    meta = await aget_project_meta()
 
     # 1. 생성/검색: project_key 검증
     if intent in ["create", "search"]:
@@ -797,11 +1179,11 @@ def curd_check_node(state: AgentState) -> AgentState:
 
         # project_key가 있는 경우 검증
         if project_key:
-            if project_key not in project_keys:
+            if project_key not in meta.key_set:
                 # 존재하지 않는 프로젝트
                 print(f"[NODE: curd_check] 프로젝트 '{project_key}' 존재하지 않음 -> clarify")
 
-                project_list = ", ".join(project_keys) if project_keys else "사용 가능한 프로젝트가 없습니다"
+                project_list = meta.project_list or "사용 가능한 프로젝트가 없습니다"
                 state["response"] = f"❌ 프로젝트 '{project_key}'가 존재하지 않습니다.\n\n사용 가능한 프로젝트: {project_list}\n\n다시 입력해주세요:"
                 state["message"] = state["response"]
                 state["stage"] = "clarify"
@@ -833,32 +1215,30 @@ def curd_check_node(state: AgentState) -> AgentState:
             state["missing_fields"] = ["issue_key"]
             return state
 
-        # Milvus에서 먼저 검색 (빠름)
-        try:
-            print(f"[NODE: curd_check] Milvus에서 '{issue_key}' 검색 중...")
-            milvus_results = milvus_client.search(
-                query_text=issue_key,
-                filter_expr=f"issue_key == '{issue_key}'",
-                limit=1
-            )
-
-            # Milvus에서 찾으면 바로 승인으로
-            if milvus_results and len(milvus_results) > 0:
-                # issue_key가 정확히 일치하는지 확인
-                found = any(r.get("issue_key") == issue_key for r in milvus_results)
-
-                if found:
-                    print(f"[NODE: curd_check] 이슈 '{issue_key}' Milvus에서 발견 -> approve")
-                    state["stage"] = "approve"
-                    return state
+        # 형식이 잘못된 키는 조회하지 않음 (필터/JQL에 그대로 들어가므로 여기서 차단)
+        issue_key = str(issue_key).strip().upper()
+        if not ISSUE_KEY_RE.fullmatch(issue_key):
+            print(f"[NODE: curd_check] 이슈 키 형식 오류: {issue_key} -> clarify")
+            state["response"] = f"❌ '{issue_key}'는 올바른 이슈 키 형식이 아닙니다. (예: KAN-1)\n\n이슈 키를 다시 입력해주세요:"
+            state["message"] = state["response"]
+            state["stage"] = "clarify"
+            state["missing_fields"] = ["issue_key"]
+            slots.pop("issue_key", None)
+            state["slots"] = slots
+            return state
+        slots["issue_key"] = issue_key
 
-            # Milvus에서 못 찾으면 Jira API로 확인 (최신 이슈일 수도 있음)
-            print(f"[NODE: curd_check] Milvus에서 없음, Jira API로 확인 중...")
-            jql = f"key = {issue_key}"
-            jira_results = jira_client.search_issues(jql=jql, max_results=1)
+        # Milvus(빠름)와 Jira API(최신 이슈)를 동시에 확인 (parse_intent에서 이미 확인했으면 재사용)
+        try:
+            found = (state.get("issue_lookup") or {}).get(issue_key)
+            if found is None:
+                print(f"[NODE: curd_check] Milvus/Jira에서 '{issue_key}' 확인 중...")
+                found = await _issue_exists(issue_key)
+            else:
+                print(f"[NODE: curd_check] 미리 확인한 결과 사용: '{issue_key}' = {found}")
 
-            if jira_results and len(jira_results) > 0:
-                print(f"[NODE: curd_check] 이슈 '{issue_key}' Jira에서 발견 -> approve")
+            if found:
+                print(f"[NODE: curd_check] 이슈 '{issue_key}' 확인 -> approve")
                 state["stage"] = "approve"
             else:
                 # 이슈가 존재하지 않음
@@ -893,6 +1273,80 @@ def curd_check_node(state: AgentState) -> AgentState:
     return state
 
 
+# ─────────────────────────────────────────────────────────
+# 승인 메시지 빌더 (intent별)
+# ─────────────────────────────────────────────────────────
+
+# 승인 메시지에 표시할 필드 라벨 (표시 순서대로)
+CREATE_OPTIONAL_FIELD_LABELS = (
+    ("description", "설명"),
+    ("assignee", "담당자"),
+    ("priority", "중요도"),
+    ("duedate", "마감일"),
+)
+UPDATE_FIELD_LABELS = (
+    ("summary", "제목"),
+    ("description", "설명"),
+    ("assignee", "담당자"),
+    ("priority", "중요도"),
+)
+APPROVAL_FOOTER = "✅ 승인: yes | ❌ 취소: no"
+
+
+def _build_create_approval(slots: Dict[str, Any]) -> str:
+    """생성 승인 메시지"""
+    lines = [
+        "⚠️ 이슈 생성을 승인해주세요:\n",
+        f"  • 프로젝트: {slots.get('project_key')}",
+        f"  • 제목: {slots.get('summary')}",
+        f"  • 유형: {slots.get('issuetype')}",
+    ]
+    lines.extend(
+        f"  • {label}: {slots[field]}"
+        for field, label in CREATE_OPTIONAL_FIELD_LABELS if slots.get(field)
+    )
+    lines.append(f"\n{APPROVAL_FOOTER}")
+    return "\n".join(lines)
+
+
+def _build_update_approval(slots: Dict[str, Any]) -> str:
+    """수정 승인 메시지"""
+    issue_key = slots.get("issue_key")
+    changes = [
+        f"  • {label}: {slots[field]}"
+        for field, label in UPDATE_FIELD_LABELS if slots.get(field)
+    ]
+
+    parts = [f"⚠️ {issue_key} 이슈를 수정하시겠습니까?\n\n"]
+    if changes:
+        parts.append("변경 내용:\n" + "\n".join(changes))
+    parts.append(f"\n\n{APPROVAL_FOOTER}")
+    return "".join(parts)
+
+
+def _build_delete_approval(slots: Dict[str, Any]) -> str:
+    """삭제 승인 메시지"""
+    issue_key = slots.get("issue_key")
+    return f"⚠️ {issue_key} 이슈를 삭제하시겠습니까?\n⚠️ 이 작업은 되돌릴 수 없습니다!\n\n{APPROVAL_FOOTER}"
+
+
+def _build_default_approval(slots: Dict[str, Any]) -> str:
+    """알 수 없는 intent용 승인 메시지"""
+    return f"⚠️ 작업을 승인해주세요.\n\n{APPROVAL_FOOTER}"
+
+
+APPROVAL_BUILDERS = {
+    "create": _build_create_approval,
+    "update": _build_update_approval,
+    "delete": _build_delete_approval,
+}
+
+
+# 승인/거부 응답 단어 (호출마다 리스트를 만들지 않고 O(1) 조회)
+APPROVE_WORDS = frozenset({"yes", "y", "예", "네", "승인"})
+REJECT_WORDS = frozenset({"no", "n", "아니오", "취소"})
+
+
 def approve_node(state: AgentState) -> AgentState:
     """
     승인 요청 노드
@@ -915,11 +1369,11 @@ def approve_node(state: AgentState) -> AgentState:
     # (기존 response에 "승인"이라는 단어가 포함되어 있으면 이미 승인 메시지를 표시한 것)
     # ─────────────────────────────────────────────────────────
     if user_input and existing_response and "승인" in existing_response:
-        if user_input in ["yes", "y", "예", "네", "승인"]:
+        if user_input in APPROVE_WORDS:
             print(f"[NODE: approve] 승인됨 -> execute")
             state["stage"] = "execute"
             return state
-        elif user_input in ["no", "n", "아니오", "취소"]:
+        elif user_input in REJECT_WORDS:
             print(f"[NODE: approve] 거부됨 -> done")
             state["stage"] = "done"
             state["response"] = "❌ 작업이 취소되었습니다."
@@ -935,48 +1389,8 @@ def approve_node(state: AgentState) -> AgentState:
     # ─────────────────────────────────────────────────────────
     # Case 2: 첫 호출 - 승인 메시지 생성
     # ─────────────────────────────────────────────────────────
-
-    if intent == "create":
-        response = "⚠️ 이슈 생성을 승인해주세요:\n\n"
-        response += f"  • 프로젝트: {slots.get('project_key')}\n"
-        response += f"  • 제목: {slots.get('summary')}\n"
-        response += f"  • 유형: {slots.get('issuetype')}\n"
-
-        if slots.get("description"):
-            response += f"  • 설명: {slots.get('description')}\n"
-        if slots.get("assignee"):
-            response += f"  • 담당자: {slots.get('assignee')}\n"
-        if slots.get("priority"):
-            response += f"  • 중요도: {slots.get('priority')}\n"
-        if slots.get("duedate"):
-            response += f"  • 마감일: {slots.get('duedate')}\n"
-
-        response += "\n✅ 승인: yes | ❌ 취소: no"
-
-    elif intent == "update":
-        issue_key = slots.get("issue_key")
-        response = f"⚠️ {issue_key} 이슈를 수정하시겠습니까?\n\n"
-
-        changes = []
-        if slots.get("summary"):
-            changes.append(f"  • 제목: {slots.get('summary')}")
-        if slots.get("description"):
-            changes.append(f"  • 설명: {slots.get('description')}")
-        if slots.get("assignee"):
-            changes.append(f"  • 담당자: {slots.get('assignee')}")
-        if slots.get("priority"):
-            changes.append(f"  • 중요도: {slots.get('priority')}")
-
-        if changes:
-            response += "변경 내용:\n" + "\n".join(changes)
-
-        response += "\n\n✅ 승인: yes | ❌ 취소: no"
-
-    elif intent == "delete":
-        issue_key = slots.get("issue_key")
-        response = f"⚠️ {issue_key} 이슈를 삭제하시겠습니까?\n"
-        response += "⚠️ 이 작업은 되돌릴 수 없습니다!\n\n"
-        response += "✅ 승인: yes | ❌ 취소: no"
+    builder = APPROVAL_BUILDERS.get(intent, _build_default_approval)
+    response = builder(slots)
 
     state["response"] = response
     state["message"] = response
@@ -1000,7 +1414,7 @@ def execute_node(state: AgentState) -> AgentState:
 
     try:
         if intent == "search":
-            result = execute_search(slots)
+            result = execute_search(slots, latency_budget=state.get("latency_budget"))
         elif intent == "create":
             result = execute_create(slots)
         elif intent == "update":
@@ -1021,7 +1435,6 @@ def execute_node(state: AgentState) -> AgentState:
 
     except Exception as e:
         print(f"[NODE: execute] 오류 발생: {e}")
-        import traceback
         traceback.print_exc()
 
         error_msg = f"❌ 작업 실행 중 오류가 발생했습니다: {str(e)}"
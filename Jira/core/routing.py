@@ -6,9 +6,12 @@ Jira Agent - Routing and Graph
 라우팅 함수와 LangGraph 워크플로 구성
 """
 
+import logging
+from functools import lru_cache
+
 from langgraph.graph import StateGraph, END
 
-from core.agent_utils import AgentState
+from core.agent_utils import AgentState, PENDING_STAGES, CRUD_INTENTS
 from core.nodes import (
     parse_intent_node,
     explain_method_node,
@@ -21,6 +24,8 @@ from core.nodes import (
     execute_node
 )
 
+logger = logging.getLogger(__name__)
+
 
 # ─────────────────────────────────────────────────────────
 # 라우팅 함수들
@@ -31,21 +36,18 @@ def route_after_parse(state: AgentState) -> str:
     stage = state.get("stage")
 
     # 중단된 작업이 있으면 해당 노드로 복귀
-    if stage in ["int_candidate", "approve", "clarify", "check_slots"]:
-        print(f"[ROUTE] 중단된 작업 복귀: {stage}")
+    if stage in PENDING_STAGES:
+        logger.debug("[ROUTE] 중단된 작업 복귀: %s", stage)
         return stage
 
     # 새 작업이면 intent 기반 라우팅
     intent = state.get("intent", "unknown")
 
-    # unknown이나 explain 의도는 모두 explain_method로 (안내 메시지 표시)
-    if intent in ["unknown", "explain"]:
-        return "explain_method"
-    elif intent in ["search", "create", "update", "delete"]:
+    if intent in CRUD_INTENTS:
         return "check_slots"
-    else:
-        # 기타 예외 상황도 explain_method로 (안내 메시지)
-        return "explain_method"
+
+    # unknown/explain 및 기타 예외 상황은 모두 explain_method로 (안내 메시지 표시)
+    return "explain_method"
 
 
 def route_after_check(state: AgentState) -> str:
@@ -151,8 +153,13 @@ def route_after_approve(state: AgentState) -> str:
 # 그래프 구성
 # ─────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=1)
 def build_graph() -> StateGraph:
-    """LangGraph 워크플로 구성"""
+    """
+    LangGraph 워크플로 구성
+
+    그래프 구조는 고정이므로 한 번만 구성하고 이후 호출은 캐시된 객체를 반환
+    """
 
     # 워크플로 생성
     workflow = StateGraph(AgentState)
@@ -1,7 +1,62 @@
 """
 공통 유틸
 """
-from typing import Dict, Any
+import json
+import re
+from typing import Dict, Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 stdlib json 사용
+    orjson = None
+
+
+# 검색 개수 문자열에서 숫자 추출 (예: "3개" -> 3)
+_LIMIT_RE = re.compile(r"\d+")
+
+DEFAULT_SEARCH_LIMIT = 10
+
+
+def parse_limit(value: Any, default: int = DEFAULT_SEARCH_LIMIT) -> int:
+    """검색 개수 슬롯을 int로 변환 (예: 3, "3", "3개" -> 3, 해석 불가 -> default)"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if value > 0 else default
+    if isinstance(value, float):
+        return int(value) if value >= 1 else default
+    if isinstance(value, str):
+        match = _LIMIT_RE.search(value)
+        if match and int(match.group()) > 0:
+            return int(match.group())
+    return default
+
+
+def dumps_json(obj: Any) -> str:
+    """
+    JSON 문자열 변환 (한글 그대로, 직렬화 불가 값은 str)
+
+    orjson이 있으면 orjson으로 처리 (stdlib json보다 수 배 빠름)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, default=str)
+
+
+def dumps_json_bytes(obj: Any) -> bytes:
+    """JSON UTF-8 바이트 변환 (HTTP 요청 본문용, orjson이면 중간 str 변환 없음)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """
+    JSON 파싱 (orjson이 있으면 orjson)
+
+    orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스라 예외 처리는 동일합니다.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def remove_empty_fields(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -12,20 +12,42 @@ Jira → Milvus 전체 동기화 스크립트
     python sync_jira_to_milvus.py
     python sync_jira_to_milvus.py --project KAN  # 특정 프로젝트만
     python sync_jira_to_milvus.py --max 100      # 최대 100개만
+    python sync_jira_to_milvus.py --concurrency 8 --batch 64  # 동시 조회 8개, 64개씩 저장
+    python sync_jira_to_milvus.py --recreate     # 컬렉션을 새 스키마로 다시 만든 뒤 동기화
 """
 
 import argparse
-from core.jira import jira_client
-from core.milvus_client import milvus_client
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from core.jira import jira_client, ISSUE_FIELDS_FULL
+from core.milvus_client import get_milvus_client
 
 
-def sync_all_issues(project_key=None, max_results=None):
+def fetch_project_issues(proj_key, max_results=None):
+    """프로젝트 하나의 이슈 조회"""
+    # JQL 쿼리 생성
+    jql = f"project = {proj_key} ORDER BY created DESC"
+
+    return jira_client.search_issues(
+        jql=jql,
+        max_results=max_results or 1000,  # 기본 1000개
+        fields=ISSUE_FIELDS_FULL  # Milvus 임베딩에 description 필요
+    )
+
+
+def sync_all_issues(project_key=None, max_results=None, concurrency=8, batch=64, verbose=False):
     """
     Jira의 모든 이슈를 Milvus에 동기화
 
+    프로젝트별 이슈 조회는 concurrency개씩 동시에 실행하고,
+    조회된 이슈는 batch개씩 모아서 Milvus에 저장합니다.
+
     Args:
         project_key: 특정 프로젝트만 동기화 (None이면 전체)
         max_results: 최대 이슈 개수 (None이면 전체)
+        concurrency: 동시에 조회할 프로젝트 수
+        batch: Milvus 저장 한 번에 넣을 이슈 수
+        verbose: 오류 시 전체 traceback 출력 여부
     """
     print("=" * 60)
     print("🔄 Jira → Milvus 동기화 시작")
@@ -46,37 +68,44 @@ def sync_all_issues(project_key=None, max_results=None):
             for p in projects:
                 print(f"   • {p['key']}: {p['name']}")
 
-        # 2. 각 프로젝트별로 이슈 가져오기
+        # 2. 프로젝트별 이슈를 동시에 가져오기
         total_synced = 0
-
-        for project in projects:
-            proj_key = project['key']
-            print(f"\n📥 [{proj_key}] 이슈 가져오는 중...")
-
-            # JQL 쿼리 생성
-            jql = f"project = {proj_key} ORDER BY created DESC"
-
-            # 이슈 검색
-            issues = jira_client.search_issues(
-                jql=jql,
-                max_results=max_results or 1000  # 기본 1000개
-            )
-
-            if not issues:
-                print(f"   ⚠️  이슈가 없습니다.")
-                continue
-
-            print(f"   ✅ {len(issues)}개 이슈 발견")
-
-            # 3. Milvus에 저장
-            print(f"   💾 Milvus에 저장 중...")
-            success = milvus_client.upsert_issues(issues)
-
-            if success:
-                total_synced += len(issues)
-                print(f"   ✅ {len(issues)}개 이슈 동기화 완료")
-            else:
-                print(f"   ❌ 동기화 실패")
+        pending = []
+        batch = max(1, batch)
+
+        def flush(issues):
+            """모인 이슈를 Milvus에 저장하고 성공 개수 반환"""
+            print(f"   💾 Milvus에 {len(issues)}개 저장 중...")
+            if get_milvus_client().upsert_issues(issues):
+                return len(issues)
+            print(f"   ❌ 동기화 실패: {[issue.get('key') for issue in issues]}")
+            return 0
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {
+                pool.submit(fetch_project_issues, project['key'], max_results): project['key']
+                for project in projects
+            }
+            print(f"\n📥 {len(futures)}개 프로젝트 이슈 가져오는 중... (동시 {concurrency}개)")
+
+            for future in as_completed(futures):
+                proj_key = futures[future]
+                issues = future.result()
+
+                if not issues:
+                    print(f"   ⚠️  [{proj_key}] 이슈가 없습니다.")
+                    continue
+
+                print(f"   ✅ [{proj_key}] {len(issues)}개 이슈 발견")
+                pending.extend(issues)
+
+                # 3. batch개씩 모아서 Milvus에 저장
+                while len(pending) >= batch:
+                    total_synced += flush(pending[:batch])
+                    pending = pending[batch:]
+
+        if pending:
+            total_synced += flush(pending)
 
         # 4. 완료 메시지
         print("\n" + "=" * 60)
@@ -84,16 +113,16 @@ def sync_all_issues(project_key=None, max_results=None):
         print("=" * 60)
 
         # 5. Milvus 통계 출력
-        stats = milvus_client.get_stats()
+        stats = get_milvus_client().get_stats()
         if stats:
             print(f"\n📊 Milvus 통계:")
             print(f"   • 컬렉션: {stats.get('name')}")
             print(f"   • 총 이슈 수: {stats.get('count')}")
 
     except Exception as e:
-        print(f"\n❌ 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"\n❌ 오류 발생: {type(e).__name__}: {e}")
+        if verbose:
+            traceback.print_exc()
 
 
 def main():
@@ -111,15 +140,52 @@ def main():
         type=int,
         help="프로젝트당 최대 이슈 개수 (생략하면 전체)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="동시에 조회할 프로젝트 수 (기본 8)"
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=64,
+        help="Milvus 저장 한 번에 넣을 이슈 수 (기본 64)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="오류 발생 시 전체 traceback 출력"
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="동기화 후 현재 이슈 수에 맞게 벡터 인덱스 재생성 (nlist=√N, 100만 건 초과 시 HNSW)"
+    )
+
+    parser.add_argument(
+        "--recreate",
+        action="store_true",
+        help="기존 컬렉션을 삭제하고 새 스키마(issue_key 기본 키)로 다시 만든 뒤 동기화"
+    )
 
     args = parser.parse_args()
 
+    if args.recreate:
+        get_milvus_client().create_collection(drop_existing=True)
+
     # 동기화 실행
     sync_all_issues(
         project_key=args.project,
-        max_results=args.max
+        max_results=args.max,
+        concurrency=args.concurrency,
+        batch=args.batch,
+        verbose=args.verbose
     )
 
+    if args.rebuild_index:
+        get_milvus_client().rebuild_index()
+
 
 if __name__ == "__main__":
     main()
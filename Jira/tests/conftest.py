@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+테스트 공용 설정
+
+core/__init__.py가 Jira/OpenAI/Milvus 클라이언트를 함께 import하므로,
+의존성이 적은 모듈은 core/ 디렉터리를 경로에 넣고 직접 import합니다.
+(agent_v2.py의 직접 실행용 import와 같은 방식)
+"""
+
+import sys
+from pathlib import Path
+
+CORE_DIR = Path(__file__).resolve().parent.parent / "core"
+if str(CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(CORE_DIR))
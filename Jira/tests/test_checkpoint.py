@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+DeferredMemorySaver 테스트
+
+flush()는 MemorySaver의 aput/aput_writes가 put/put_writes로 위임하는 것과
+채널 버전(channel_versions) 처리 방식에 의존하므로, langgraph 업그레이드 시 이 테스트로 확인합니다.
+"""
+
+import asyncio
+from typing import TypedDict
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+from langgraph.graph import StateGraph, START, END
+
+from checkpoint import DeferredMemorySaver
+
+
+class TurnState(TypedDict, total=False):
+    user_input: str
+    first: str
+    second: str
+
+
+def _build_app(saver: DeferredMemorySaver):
+    """first → second 두 노드 그래프 (second는 first가 쓴 채널을 건드리지 않음)"""
+    workflow = StateGraph(TurnState)
+    workflow.add_node("first", lambda state: {"first": f"first:{state['user_input']}"})
+    workflow.add_node("second", lambda state: {"second": f"second:{state['user_input']}"})
+    workflow.add_edge(START, "first")
+    workflow.add_edge("first", "second")
+    workflow.add_edge("second", END)
+    return workflow.compile(checkpointer=saver)
+
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def _saved_values(saver: DeferredMemorySaver, thread_id: str) -> dict:
+    checkpoint_tuple = saver.get_tuple(_config(thread_id))
+    assert checkpoint_tuple is not None
+    return checkpoint_tuple.checkpoint["channel_values"]
+
+
+def test_checkpoints_are_buffered_until_flush():
+    saver = DeferredMemorySaver()
+    app = _build_app(saver)
+
+    app.invoke({"user_input": "a"}, config=_config("s1"))
+    assert saver.get_tuple(_config("s1")) is None
+
+    saver.flush("s1")
+    assert saver.get_tuple(_config("s1")) is not None
+
+
+def test_flush_keeps_channels_written_in_earlier_steps():
+    saver = DeferredMemorySaver()
+    app = _build_app(saver)
+
+    app.invoke({"user_input": "a"}, config=_config("s1"))
+    saver.flush("s1")
+
+    values = _saved_values(saver, "s1")
+    assert values["user_input"] == "a"
+    assert values["first"] == "first:a"
+    assert values["second"] == "second:a"
+
+
+def test_async_run_goes_through_buffer():
+    saver = DeferredMemorySaver()
+    app = _build_app(saver)
+
+    asyncio.run(app.ainvoke({"user_input": "a"}, config=_config("s1")))
+    assert saver.get_tuple(_config("s1")) is None
+
+    saver.flush("s1")
+    values = _saved_values(saver, "s1")
+    assert values["first"] == "first:a"
+    assert values["second"] == "second:a"
+
+
+def test_next_turn_starts_from_flushed_state():
+    saver = DeferredMemorySaver()
+    app = _build_app(saver)
+
+    app.invoke({"user_input": "a"}, config=_config("s1"))
+    saver.flush("s1")
+    first_turn_id = saver.get_tuple(_config("s1")).config["configurable"]["checkpoint_id"]
+
+    app.invoke({"user_input": "b"}, config=_config("s1"))
+    saver.flush("s1")
+
+    checkpoint_tuple = saver.get_tuple(_config("s1"))
+    assert checkpoint_tuple.parent_config["configurable"]["checkpoint_id"] == first_turn_id
+    assert checkpoint_tuple.checkpoint["channel_values"]["first"] == "first:b"
+    assert checkpoint_tuple.checkpoint["channel_values"]["second"] == "second:b"
+    # 턴마다 체크포인트 하나만 저장
+    assert len(list(saver.list(_config("s1")))) == 2
+
+
+def test_flush_only_touches_its_own_thread():
+    saver = DeferredMemorySaver()
+    app = _build_app(saver)
+
+    app.invoke({"user_input": "a"}, config=_config("s1"))
+    app.invoke({"user_input": "b"}, config=_config("s2"))
+    saver.flush("s1")
+
+    assert _saved_values(saver, "s1")["first"] == "first:a"
+    assert saver.get_tuple(_config("s2")) is None
+
+    saver.flush("s2")
+    assert _saved_values(saver, "s2")["first"] == "first:b"